@@ -1,155 +1,184 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import dashboard
+from koweps import BACKENDS, api, memory, metrics, profiling, timing, trace
+from views import PAGES
+
+# 이번 실행(rerun)의 구간 타이머
+rerun_timer = timing.begin()
+
 # 웹 페이지 타이틀
 st.set_page_config(
     layout="wide", page_title="한국복지패널 데이터 기반 인구통계학적 특성별 월급 차이 시각화", page_icon="📊"
 )
 
-# 한글 폰트 설정 (OS별 호환성 처리)
-import platform
-import matplotlib.font_manager as fm
 import os
 
-if platform.system() == 'Windows':
-    plt.rc("font", family="Malgun Gothic")
-else:
-    # Streamlit Cloud (Linux) 환경
-    # 폰트 경로를 직접 확인하거나 시스템 폰트에서 Nanum을 찾습니다.
-    nanum_path = '/usr/share/fonts/truetype/nanum/NanumGothic.ttf'
-    if os.path.exists(nanum_path):
-        fm.fontManager.addfont(nanum_path)
-        plt.rc("font", family="NanumGothic")
-    else:
-        # 시스템에 설치된 폰트 중 'Nanum'이 포함된 폰트를 찾아서 설정
-        nanum_fonts = [f.name for f in fm.fontManager.ttflist if 'Nanum' in f.name]
-        if nanum_fonts:
-            plt.rc("font", family=nanum_fonts[0])
-        else:
-            # 최종 예비: 폰트 이름만 지정
-            plt.rc("font", family="NanumGothic")
-
-# 마이너스 기호 깨짐 방지
-plt.rcParams["axes.unicode_minus"] = False
-
-
-# 데이터 로드 함수
-# 캐시
-@st.cache_data
-def load_welfare(sav_path: str):
-    raw_welfare = pd.read_csv(sav_path)
-    welfare = raw_welfare.copy()
-    welfare = welfare.rename(
-        columns={
-            "h10_g3": "sex",  #  성별
-            "h10_g4": "birth_year",  #  태어난 연도
-            "h10_g10": "marital_status",  #  혼인 상태
-            "h10_g11": "religion",  #  종교
-            "h10_eco9": "job_code",  #  직업 코드
-            "p1002_8aq1": "income",  #  월급
-            "h10_reg7": "region_code",
-        }
-    )  #  지역 코드
-
-    # 전처리
-    if "sex" in welfare.columns:
-        # sex가 숫자(1,2)이면 문자열로 변환, 이미 문자열이면 그대로 사용
-        if welfare["sex"].dtype != object:
-            welfare["sex"] = welfare["sex"].replace(9, np.nan)
-            welfare["sex"] = welfare["sex"].map({1: "male", 2: "female"})
-
-    if "income" in welfare.columns:
-        # income이 이미 정리된 경우를 대비해 0과 9999만 처리
-        welfare["income"] = welfare["income"].replace(9999, np.nan)
-        welfare["income"] = np.where(welfare["income"] == 0, np.nan, welfare["income"])
-
-    if "birth_year" in welfare.columns:
-        welfare["birth_year"] = welfare["birth_year"].replace(9999, np.nan)
-        welfare["age"] = 2015 - welfare["birth_year"] + 1
-
-        def age_group(age):
-            if pd.isnull(age):
-                return np.nan
-            elif age >= 60:
-                return "old"
-            elif age >= 30:
-                return "middle"
-            else:
-                return "young"
-
-        welfare["age_group"] = welfare["age"].apply(age_group)
-
-    if "job_code" in welfare.columns:
-        welfare["job_code"] = np.where(
-            welfare["job_code"] == 9999, np.nan, welfare["job_code"]
-        )
-        import os
-        codebook_path = "data/welfare_2015_codebook.xlsx"
-        if os.path.exists(codebook_path):
-            job_list = pd.read_excel(codebook_path, sheet_name="직종코드")
-            welfare = welfare.merge(job_list, how="left", on="job_code")
-        else:
-            # 코드북 파일이 없으면 job 컬럼을 job_code 문자열로 대체
-            welfare["job"] = welfare["job_code"].astype("Int64").astype("str").replace("<NA>", np.nan)
-
-    if "religion" in welfare.columns:
-        welfare['religion'] = np.where(welfare['religion'] == 9, np.nan, welfare['religion'])
-        welfare['religion'] = welfare['religion'].map({1:'yes', 2:'no'})
-
-    if "marital_status" in welfare.columns:
-        def divorce_yn(marital_status):
-            if marital_status == 1:
-                return 'marriage'
-            elif marital_status == 3:
-                return 'divorce'
-            else:
-                return np.nan
-
-        welfare['marriage'] = welfare['marital_status'].apply(divorce_yn)
-
-    if "region_code" in welfare.columns:
-        region_list = pd.DataFrame({'region_code' : [1, 2, 3, 4, 5, 6, 7],
-                            'region'      : ['서울',
-                                             '수도권(인천/경기)',
-                                             '부산/경남/울산',
-                                             '대구/경북',
-                                             '대전/충남',
-                                             '강원/충북',
-                                             '광주/전남/전북/제주도']})
-        welfare = welfare.merge(region_list, how = 'left', on = 'region_code')
-
-    return welfare
+# 실행별 구간 시간 기록 파일 (세션 ID와 필터 값이 들어가므로 경로를 줄 때만 기록)
+TIMING_LOG = os.environ.get("KOWEPS_TIMING_LOG")
+# 세션별 위젯 조작 기록 (재생용, 경로를 줄 때만 기록: benchmarks/replay.py)
+TRACE_FILE = os.environ.get("KOWEPS_TRACE_FILE")
+# Prometheus 지표: 포트를 주면 http://127.0.0.1:<포트>/metrics, 파일 경로를 주면 실행마다 갱신
+METRICS_PORT = os.environ.get("KOWEPS_METRICS_PORT")
+METRICS_FILE = os.environ.get("KOWEPS_METRICS_FILE")
+if METRICS_PORT:
+    metrics.serve(int(METRICS_PORT))
+# 섹션 집계표 JSON/Arrow API: 포트를 주면 http://127.0.0.1:<포트>/tables (KOWEPS_API_DATA: 데이터, 기본은 기본 경로)
+API_PORT = os.environ.get("KOWEPS_API_PORT")
+if API_PORT:
+    api.serve(int(API_PORT), os.environ.get("KOWEPS_API_DATA", dashboard.DEFAULT_DATA_PATH))
+# 프로파일링: "query"(기본)면 주소에 ?profile=1을 붙인 실행 1회만, "always"면 매 실행, "off"면 사용 안 함
+PROFILE_MODE = os.environ.get("KOWEPS_PROFILE", "query")
+PROFILE_DIR = os.environ.get("KOWEPS_PROFILE_DIR", "profiles")
+rerun_profiler = None
+if PROFILE_MODE == "always" or (PROFILE_MODE == "query" and st.query_params.get("profile")):
+    rerun_profiler = profiling.start(root_filename=__file__)
+
+
+def save_profile(timing_record):
+    # 실행마다 한 번만 멈추고 저장한다. 저장한 경로 (프로파일링 중이 아니면 None)
+    global rerun_profiler
+    if rerun_profiler is None:
+        return None
+    profiler, rerun_profiler = rerun_profiler, None
+    profile_path = profiler.stop().save(PROFILE_DIR, timing_record)
+    if "profile" in st.query_params:
+        del st.query_params["profile"]
+    return profile_path
+
+
+def stop_profile(**fields):
+    # st.stop()이나 페이지 예외로 일찍 끝나는 실행도 프로파일을 남긴다 (샘플러가 MAX_SECONDS까지 돌지 않게)
+    ctx = get_script_run_ctx()
+    session_id = ctx.session_id if ctx else None
+    save_profile(rerun_timer.record(session_id=session_id, engine=engine, data_path=data_path, **fields))
+
+
+def finish_rerun(filters, filter_widgets, page=None):
+    # 실행 기록/사용 기록/지표/프로파일 저장과 성능·메모리 진단 패널 (filter_widgets: [(종류, 라벨, 값)])
+    ctx = get_script_run_ctx()
+    timing_record = rerun_timer.record(
+        session_id=ctx.session_id if ctx else None,
+        engine=engine,
+        data_path=data_path,
+        chart_mode=chart_mode,
+        page=page,
+        filters=filters,
+    )
+    if TIMING_LOG:
+        timing.write_record(timing_record, TIMING_LOG)
+    if TRACE_FILE:
+        widget_states = [
+            ("text_input", "데이터 파일 경로", data_path),
+            ("selectbox", "연산 엔진", engine),
+            ("radio", "그래프 방식", chart_mode),
+            ("checkbox", "표본 근사 집계", approximate),
+            ("checkbox", "성능 진단 패널", show_timing),
+            ("checkbox", "메모리 진단", show_memory),
+        ] + filter_widgets
+        timing.write_record(trace.step(timing_record, widget_states), TRACE_FILE)
+    metrics.observe_rerun(timing_record, dashboard.section_of)
+    if METRICS_FILE:
+        metrics.write_textfile(METRICS_FILE)
+
+    profile_path = save_profile(timing_record)
+    if profile_path is not None:
+        st.sidebar.caption("프로파일 저장: {}.txt / .folded".format(profile_path))
+
+    if show_timing:
+        with st.sidebar.expander("성능 진단 (이번 실행)", expanded=True):
+            st.write("총 {:.1f} ms".format(timing_record["total_ms"]))
+            st.dataframe(timing_record["stages"], hide_index=True)
+
+    if show_memory:
+        with st.expander("메모리 진단", expanded=True):
+            welfare_usage = dashboard.welfare_memory(data_path, engine)
+            cache_rows = [
+                {"cache": cache, "key": " / ".join(map(str, key)), "bytes": nbytes}
+                for cache, entries in metrics.cached_entries().items()
+                for key, nbytes in entries.items()
+            ]
+            col1, col2, col3 = st.columns(3)
+            col1.metric("프로세스 전체 (RSS)", memory.format_bytes(memory.process_rss()))
+            col2.metric("캐시 합계", memory.format_bytes(sum(row["bytes"] for row in cache_rows)))
+            col3.metric(
+                "welfare 자료형 최적화 시 절감",
+                memory.format_bytes(welfare_usage["saved_bytes"].sum()),
+                "{:.0%}".format(welfare_usage["saved_bytes"].sum() / max(welfare_usage["bytes"].sum(), 1)),
+            )
+            st.markdown("welfare 컬럼별 사용량")
+            st.dataframe(welfare_usage, hide_index=True)
+            st.markdown("캐시 항목별 사용량 (집계표, 그래프 PNG, 큐브, 데이터)")
+            st.dataframe(sorted(cache_rows, key=lambda row: -row["bytes"]), hide_index=True)
 
 
 # 사이드바
 st.sidebar.title("데이터 로드")
-data_path = st.sidebar.text_input("데이터 파일 경로", value="data/welfare_2015.csv")
+data_path = st.sidebar.text_input("데이터 파일 경로", value=dashboard.DEFAULT_DATA_PATH)
+engine = st.sidebar.selectbox("연산 엔진", list(BACKENDS), index=0)
+# image: 서버에서 그린 그래프 이미지, plotly: 서버는 집계표와 plotly 명세만 보내고 그리기는 브라우저에서,
+# interactive: 큐브를 한 번 보내고 필터/재집계/그래프는 브라우저에서
+CHART_MODES = {
+    "image": "이미지 (서버)",
+    "plotly": "plotly (브라우저 그리기)",
+    "interactive": "브라우저 필터 (plotly)",
+}
+chart_mode = st.sidebar.radio("그래프 방식", list(CHART_MODES), format_func=CHART_MODES.get, key="chart_mode")
 
 if st.sidebar.button("데이터 로드"):
     st.rerun()
 
+# 층화 표본으로 먼저 그리고 표본을 늘려 가며 정확한 값까지 갱신 (미리 계산한 결과 폴더는 항상 정확한 값)
+approximate = st.sidebar.checkbox("표본 근사 집계", value=False)
+show_timing = st.sidebar.checkbox("성능 진단 패널", value=False)
+show_memory = st.sidebar.checkbox("메모리 진단", value=False)
+
 # 메인
 st.title("한국복지패널 데이터 기반 인구통계학적 특성별 월급 차이 시각화")
 st.markdown("데이터 출처: 복지패널 데이터 (로컬에 csv 파일 필요)")
 
 # 데이터 로드
 try:
-    welfare = load_welfare(data_path)
+    with timing.stage("load_welfare"):
+        welfare = dashboard.load_welfare(data_path, engine)
     st.success("데이터 로드 완료: {}행 {}열".format(welfare.shape[0], welfare.shape[1]))
 except Exception as e:
     st.error(f"데이터를 불러오는 데 실패했습니다. 경로와 파일을 확인하세요.\n에러: {e}")
+    stop_profile(error=str(e))
+    st.stop()
+
+if chart_mode == "interactive":
+    # 필터를 바꿔도 서버는 다시 실행하지 않는다 (사이드바 필터와 페이지 대신 화면 위쪽 필터 사용)
+    with timing.stage("cube"):
+        page = dashboard.cube_page(engine, data_path)
+    with timing.stage("cube render"):
+        st.iframe(page, height="content")
+    finish_rerun({}, [])
     st.stop()
 
+# 페이지 (섹션마다 한 페이지, 방문한 페이지의 집계와 그래프만 만든다)
+pages = {path: st.Page(path, title=title) for path, title in PAGES}
+current_page = st.navigation(list(pages.values()))
+
 # 대시보드 레이아웃
-# 필터
+# 필터 (모든 페이지에 공통)
+# 폼 안의 위젯은 바꿔도 바로 다시 실행하지 않고 "필터 적용"을 누를 때 한 번에 적용된다
 st.sidebar.header("필터")
+filter_form = st.sidebar.form("filters", border=False)
+
+
+def multi_filter(selected):
+    # 아무것도 고르지 않았거나 "All"을 고르면 필터 없음
+    if not selected or "All" in selected:
+        return "All"
+    return selected
+
 
 # 성별 필터
 if "sex" in welfare.columns:
     value_list = ["All"] + sorted(welfare["sex"].dropna().unique().tolist())
-    select_sex = st.sidebar.selectbox("성별", value_list, index=0)
+    select_sex = filter_form.selectbox("성별", value_list, index=0)
 else:
     select_sex = "All"
 
@@ -157,480 +186,117 @@ else:
 if "age" in welfare.columns:
     min_age = int(welfare["age"].dropna().min())
     max_age = int(welfare["age"].dropna().max())
-    slider_range = st.sidebar.slider(
+    slider_range = filter_form.slider(
         "연령 범위", min_value=min_age, max_value=max_age, value=(min_age, max_age)
     )
-    filter_button = st.sidebar.button("필터 적용")
+    age_filtered = slider_range != (min_age, max_age)
 else:
     slider_range = None
+    age_filtered = False
 
 # 연령대 필터
 # 여러 개 선택할 수 있는 multiselect
-value_list = ["All"] + sorted(welfare["age_group"].dropna().unique().tolist())
 if "age_group" in welfare.columns:
-    select_multi_age_group = st.sidebar.multiselect(
+    value_list = ["All"] + sorted(welfare["age_group"].dropna().unique().tolist())
+    age_group_choice = filter_form.multiselect(
         "확인하고 싶은 연령대를 선택하세요(복수 선택 가능)",
         value_list,
     )
 else:
-    select_multi_age_group = "All"
+    age_group_choice = []
+select_multi_age_group = multi_filter(age_group_choice)
 
 # 직업 필터
 # 여러 개 선택할 수 있는 multiselect
-value_list = ["All"] + sorted(welfare["job"].dropna().unique().tolist())
 if "job" in welfare.columns:
-    select_multi_job = st.sidebar.multiselect(
+    value_list = ["All"] + sorted(welfare["job"].dropna().unique().tolist())
+    job_choice = filter_form.multiselect(
         "확인하고 싶은 직업을 선택하세요(복수 선택 가능)",
         value_list,
     )
 else:
-    select_multi_job = "All"
+    job_choice = []
+select_multi_job = multi_filter(job_choice)
 
 # 종교 필터
 if "religion" in welfare.columns:
     value_list = ["All"] + sorted(welfare["religion"].dropna().unique().tolist())
-    select_religion = st.sidebar.selectbox("종교", value_list, index=0)
+    select_religion = filter_form.selectbox("종교", value_list, index=0)
 else:
     select_religion = "All"
 
 # 혼인 필터
 if "marriage" in welfare.columns:
     value_list = ["All"] + sorted(welfare["marriage"].dropna().unique().tolist())
-    select_marriage = st.sidebar.selectbox("혼인", value_list, index=0)
+    select_marriage = filter_form.selectbox("혼인", value_list, index=0)
 else:
     select_marriage = "All"
 
 # 지역 필터
 # 여러 개 선택할 수 있는 multiselect
-value_list = ["All"] + sorted(welfare["region"].dropna().unique().tolist())
 if "region" in welfare.columns:
-    select_multi_region = st.sidebar.multiselect(
+    value_list = ["All"] + sorted(welfare["region"].dropna().unique().tolist())
+    region_choice = filter_form.multiselect(
         "확인하고 싶은 지역을 선택하세요(복수 선택 가능)",
         value_list,
     )
 else:
-    select_multi_region = "All"
-
-# 성별에 따른 월급 차이 - '성별에 따라 월급이 다를까?'
-st.subheader("1. 성별에 따른 월급 차이 - '성별에 따라 월급이 다를까?'")
-
-if select_sex != "All" and "sex" in welfare.columns:
-    tmp_welfare = welfare[welfare["sex"] == select_sex]
-    st.write("필터로 선택한 데이터 첫 5행")
-    st.table(tmp_welfare.head())
-
-col1, col2 = st.columns([2, 1])
-with col1:
-    if "sex" in welfare.columns and "income" in welfare.columns:
-        sex_income = (
-            welfare.dropna(subset=["sex", "income"])
-            .groupby("sex", as_index=False)
-            .agg(mean_income=("income", "mean"))
-        )
-        # 시각화
-        fig1, ax1 = plt.subplots()
-        sns.barplot(x="sex", y="mean_income", data=sex_income, ax=ax1)
-        plt.title("성별에 따른 평균 월급 막대 그래프")
-        plt.xlabel("성별")
-        plt.ylabel("평균 월급")
-        for i, j in enumerate(sex_income["mean_income"]):
-            ax1.annotate(
-                round(j),
-                (i, j),
-                xytext=(0, 2),
-                textcoords="offset points",
-                fontsize=8,
-                ha="center",
-                color="black",
-            )
-        st.pyplot(fig1)
-    else:
-        st.info("성별/월급 변수가 없어 해당 그래프를 표시할 수 없습니다.")
-with col2:
-    st.markdown("테이블")
-    if "sex" in welfare.columns and "income" in welfare.columns:
-        st.write(sex_income)
-    else:
-        st.write("변수 없음")
-
-# 나이와 월급의 관계 - '몇 살 때 월급을 가장 많이 받을까?'
-st.subheader("2. 나이와 월급의 관계 - '몇 살 때 월급을 가장 많이 받을까?'")
-
-if filter_button:
-    tmp_welfare = welfare[
-        (welfare["age"] >= slider_range[0]) & (welfare["age"] <= slider_range[1])
-    ]
-    st.write("필터로 선택한 데이터 첫 5행")
-    st.table(tmp_welfare.head())
-
-col1, col2 = st.columns([2, 1])
-with col1:
-    if "age" in welfare.columns and "income" in welfare.columns:
-        age_income = (
-            welfare.dropna(subset=["age", "income"])
-            .groupby("age", as_index=False)
-            .agg(mean_income=("income", "mean"))
-        )
-        # 시각화
-        fig2, ax2 = plt.subplots()
-        sns.lineplot(x="age", y="mean_income", data=age_income, ax=ax2)
-        plt.title("나이에 따른 평균 월급 선 그래프")
-        plt.xlabel("나이")
-        plt.ylabel("평균 월급")
-        st.pyplot(fig2)
-    else:
-        st.info("나이/월급 변수가 없어 해당 그래프를 표시할 수 없습니다.")
-with col2:
-    st.markdown("테이블")
-    if "age" in welfare.columns and "income" in welfare.columns:
-        st.write(age_income)
-    else:
-        st.write("변수 없음")
-
-# 나머지 주제는 여러분들이 직접 만들어 보아요!
-# 연령대에 따른 월급 차이 - 어떤 연령대의 월급이 가장 많을까?
-st.subheader("3. 연령대에 따른 월급 차이 - 어떤 연령대의 월급이 가장 많을까?")
-
-if select_multi_age_group != "All" and "age_group" in welfare.columns:
-    tmp_welfare = welfare[welfare["age_group"].isin(select_multi_age_group)]
-    st.write("필터로 선택한 데이터 첫 5행")
-    st.table(tmp_welfare.head())
-
-col1, col2 = st.columns([2, 1])
-with col1:
-    if "age_group" in welfare.columns and "income" in welfare.columns:
-        age_group_income = (
-            welfare.dropna(subset=["age_group", "income"])
-            .groupby("age_group", as_index=False)
-            .agg(mean_income=("income", "mean"))
-        )
-        # 시각화
-        fig3, ax3 = plt.subplots()
-        sns.barplot(
-            x="age_group",
-            y="mean_income",
-            data=age_group_income,
-            ax=ax3,
-            order=["young", "middle", "old"],
-        )
-        plt.title("연령대에 따른 평균 월급 막대 그래프")
-        plt.xlabel("연령대")
-        plt.ylabel("평균 월급")
-        st.pyplot(fig3)
-    else:
-        st.info("연령대/월급 변수가 없어 해당 그래프를 표시할 수 없습니다.")
-with col2:
-    st.markdown("테이블")
-    if "age_group" in welfare.columns and "income" in welfare.columns:
-        st.write(age_group_income)
-    else:
-        st.write("변수 없음")
-
-# 연령대 및 성별 월급 차이 - 성별 월급 차이는 연령대별로 다를까?
-st.subheader("4. 연령대 및 성별 월급 차이 - 성별 월급 차이는 연령대별로 다를까?")
-
-if (
-    select_sex != "All"
-    and select_multi_age_group != "All"
-    and "sex" in welfare.columns
-    and "age_group" in welfare.columns
-):
-    tmp_welfare = welfare[
-        (welfare["sex"] == select_sex)
-        & (welfare["age_group"].isin(select_multi_age_group))
-    ]
-    st.write("필터로 선택한 데이터 첫 5행")
-    st.table(tmp_welfare.head())
-
-col1, col2 = st.columns([2, 1])
-with col1:
-    if (
-        "sex" in welfare.columns
-        and "age_group" in welfare.columns
-        and "income" in welfare.columns
-    ):
-        age_group_sex_income = (
-            welfare.dropna(subset=["age_group", "sex", "income"])
-            .groupby(["age_group", "sex"], as_index=False)
-            .agg(mean_income=("income", "mean"))
-        )
-        # 시각화
-        fig4, ax4 = plt.subplots()
-        sns.barplot(
-            x="age_group",
-            y="mean_income",
-            hue="sex",
-            data=age_group_sex_income,
-            order=["young", "middle", "old"],
-            ax=ax4,
-        )
-        plt.title("연령대 및 성별에 따른 평균 월급 막대 그래프")
-        plt.xlabel("연령대 및 성별")
-        plt.ylabel("평균 월급")
-        st.pyplot(fig4)
-    else:
-        st.info("연령대/성별/월급 변수가 없어 해당 그래프를 표시할 수 없습니다.")
-with col2:
-    st.markdown("테이블")
-    if (
-        "sex" in welfare.columns
-        and "age_group" in welfare.columns
-        and "income" in welfare.columns
-    ):
-        st.write(age_group_sex_income)
-    else:
-        st.write("변수 없음")
-
-# 직업별 월급 차이 - 어떤 직업이 월급을 가장 많이 받을까?
-st.subheader("5. 직업별 월급 차이 - 어떤 직업이 월급을 가장 많이 받을까?")
-
-if select_multi_job != "All" and "job" in welfare.columns:
-    tmp_welfare = welfare[welfare["job"].isin(select_multi_job)]
-    st.write("필터로 선택한 데이터 첫 5행")
-    st.table(tmp_welfare.head())
-
-col1, col2 = st.columns([2, 1])
-with col1:
-    if "job" in welfare.columns and "income" in welfare.columns:
-        job_income = (
-            welfare.dropna(subset=["job", "income"])
-            .groupby("job", as_index=False)
-            .agg(mean_income=("income", "mean"))
-        )
-        top10 = job_income.sort_values("mean_income", ascending=False).head(10)
-        # 시각화
-        fig5, ax5 = plt.subplots()
-        sns.barplot(y="job", x="mean_income", data=top10)
-        plt.title("직업에 따른 상위 10개 평균 월급 막대 그래프")
-        plt.xlabel("직업")
-        plt.ylabel("평균 월급")
-        st.pyplot(fig5)
-    else:
-        st.info("직업/월급 변수가 없어 해당 그래프를 표시할 수 없습니다.")
-with col2:
-    st.markdown("테이블")
-    if "job" in welfare.columns and "income" in welfare.columns:
-        st.write(top10)
-    else:
-        st.write("변수 없음")
-
-# 성별 직업 빈도 - 성별로 어떤 직업이 가장 많을까?
-st.subheader("6. 성별 직업 빈도 - 성별로 어떤 직업이 가장 많을까?")
-
-if (
-    select_sex != "All"
-    and select_multi_job != "All"
-    and "sex" in welfare.columns
-    and "job" in welfare.columns
-):
-    tmp_welfare = welfare[
-        (welfare["sex"] == select_sex)
-        & (welfare["job"].isin(select_multi_job))
-    ]
-    st.write("필터로 선택한 데이터 첫 5행")
-    st.table(tmp_welfare.head())
-
-col1, col2 = st.columns([2, 1])
-with col1:
-    if (
-        "sex" in welfare.columns
-        and "job" in welfare.columns
-    ):
-        job_male = welfare[welfare['sex'] == 'male'].dropna(subset = ['job']) \
-                                            .groupby('job', as_index = False) \
-                                            .agg(n = ('job', 'count')) \
-                                            .sort_values('n', ascending = False) \
-                                            .head(10)
-        # 시각화
-        fig61, ax61 = plt.subplots()
-        sns.barplot(y = 'job', x = 'n', data = job_male, ax=ax61)
-        plt.title("남성 직업 빈도 막대 그래프")
-        plt.xlabel("빈도")
-        plt.ylabel("직업")
-        st.pyplot(fig61)
-    else:
-        st.info("성별/직업 변수가 없어 해당 그래프를 표시할 수 없습니다.")
-with col2:
-    st.markdown("테이블")
-    if (
-        "sex" in welfare.columns
-        and "job" in welfare.columns
-    ):
-        st.write(job_male)
-    else:
-        st.write("변수 없음")
-
-col1, col2 = st.columns([2, 1])
-with col1:
-    if (
-        "sex" in welfare.columns
-        and "job" in welfare.columns
-    ):
-        job_female = welfare[welfare['sex'] == 'female'].dropna(subset = ['job']) \
-                                                .groupby('job', as_index = False) \
-                                                .agg(n = ('job', 'count')) \
-                                                .sort_values('n', ascending = False) \
-                                                .head(10)
-        # 시각화
-        fig62, ax62 = plt.subplots()
-        sns.barplot(y = 'job', x = 'n', data = job_female, ax=ax62)
-        plt.title("여성 직업 빈도 막대 그래프")
-        plt.xlabel("빈도")
-        plt.ylabel("직업")
-        st.pyplot(fig62)
-    else:
-        st.info("성별/직업 변수가 없어 해당 그래프를 표시할 수 없습니다.")
-with col2:
-    st.markdown("테이블")
-    if (
-        "sex" in welfare.columns
-        and "job" in welfare.columns
-    ):
-        st.write(job_female)
-    else:
-        st.write("변수 없음")
-
-# 종교 유무에 따른 이혼율 - 종교가 있으면 이혼을 덜 할까?
-st.subheader("7. 종교 유무에 따른 이혼율 - 종교가 있으면 이혼을 덜 할까?")
-
-if select_religion != "All" and "religion" in welfare.columns and select_marriage != "All" and "marriage" in welfare.columns:
-    tmp_welfare = welfare[(welfare["religion"] == select_religion) & (welfare["marriage"] == select_marriage)]
-    st.write("필터로 선택한 데이터 첫 5행")
-    st.table(tmp_welfare.head())
-
-col1, col2 = st.columns([2, 1])
-with col1:
-    if "religion" in welfare.columns and "marriage" in welfare.columns:
-        religion_div = welfare.dropna(subset = ['religion', 'marriage']) \
-                      .groupby('religion', as_index = False) \
-                      ['marriage'] \
-                      .value_counts(normalize = True)
-        religion_div = religion_div[religion_div['marriage'] == 'divorce'] \
-               .assign(proportion = religion_div['proportion'] * 100) \
-               .round(2)
-        # 시각화
-        fig71, ax71 = plt.subplots()
-        sns.barplot(x = "religion", y = 'proportion', data = religion_div, ax=ax71)
-        plt.title("종교에 따른 이혼율 막대 그래프")
-        plt.xlabel("종교")
-        plt.ylabel("이혼율")
-        st.pyplot(fig71)
-    else:
-        st.info("종교/혼인 변수가 없어 해당 그래프를 표시할 수 없습니다.")
-with col2:
-    st.markdown("테이블")
-    if "religion" in welfare.columns and "marriage" in welfare.columns:
-        st.write(religion_div)
-    else:
-        st.write("변수 없음")
-
-col1, col2 = st.columns([2, 1])
-with col1:
-    if "age_group" in welfare.columns and "religion" in welfare.columns:
-        # 비율 계산
-        age_group_div = welfare.dropna(subset = ['age_group', 'religion']) \
-                        .groupby('age_group', as_index = False) \
-                        ['marriage'] \
-                        .value_counts(normalize = True)
-        age_group_div = age_group_div[(age_group_div['marriage'] == 'divorce') & (age_group_div['age_group'] != 'young')] \
-                             .assign(proportion = age_group_div['proportion'] * 100) \
-                             .round(2)
-        # 시각화
-        fig72, ax72 = plt.subplots()
-        sns.barplot(x = "age_group", y = 'proportion', data = age_group_div, ax=ax72)
-        plt.title("연령대에 따른 이혼율 막대 그래프")
-        plt.xlabel("연령대")
-        plt.ylabel("이혼율")
-        st.pyplot(fig72)
-    else:
-        st.info("연령대/혼인 변수가 없어 해당 그래프를 표시할 수 없습니다.")
-with col2:
-    st.markdown("테이블")
-    if "religion" in welfare.columns and "marriage" in welfare.columns:
-        st.write(age_group_div)
-    else:
-        st.write("변수 없음")
-
-col1, col2 = st.columns([2, 1])
-with col1:
-    if "age_group" in welfare.columns and "religion" in welfare.columns and "marriage" in welfare.columns:
-        # 비율 계산
-        age_group_rel_div = welfare[welfare['age_group'] != 'young'] \
-                      .dropna(subset = ['age_group', 'religion', 'marriage']) \
-                      .groupby(['age_group', 'religion'], as_index = False) \
-                       ['marriage'] \
-                       .value_counts(normalize = True)
-        age_group_rel_div = age_group_rel_div[age_group_rel_div['marriage'] == 'divorce'] \
-                    .assign(proportion = age_group_rel_div['proportion'] * 100) \
-                    .round(2)
-        # 시각화
-        fig73, ax73 = plt.subplots()
-        sns.barplot(x = 'age_group', y = 'proportion', hue = 'religion', data = age_group_rel_div, ax=ax73)
-        plt.title("연령대 및 종교 유무에 따른 이혼율 막대 그래프")
-        plt.xlabel("연령대 및 종교 유무")
-        plt.ylabel("이혼율")
-        st.pyplot(fig73)
-    else:
-        st.info("연령대/종교/혼인 변수가 없어 해당 그래프를 표시할 수 없습니다.")
-with col2:
-    st.markdown("테이블")
-    if "religion" in welfare.columns and "marriage" in welfare.columns:
-        st.write(age_group_rel_div)
-    else:
-        st.write("변수 없음")
-
-# 지역별 연령대 비율 - 어느 지역에 노년층이 많을까?
-st.subheader("8. 지역별 연령대 비율 - 어느 지역에 노년층이 많을까?")
-
-if (
-    select_multi_region != "All"
-    and select_multi_age_group != "All"
-    and "region" in welfare.columns
-    and "age_group" in welfare.columns
-):
-    tmp_welfare = welfare[
-        (welfare["region"].isin(select_multi_region))
-        & (welfare["age_group"].isin(select_multi_age_group))
-    ]
-    st.write("필터로 선택한 데이터 첫 5행")
-    st.table(tmp_welfare.head())
-
-col1, col2 = st.columns([2, 1])
-with col1:
-    if (
-        "region" in welfare.columns
-        and "age_group" in welfare.columns
-    ):
-        region_age_group = welfare.dropna(subset = ['age_group']) \
-                     .groupby('region', as_index = False) \
-                     ['age_group'] \
-                     .value_counts(normalize = True)
-        region_age_group = region_age_group.assign(proportion = region_age_group['proportion'] * 100) \
-                                   .round(2)
-        pivot_region_age_group = region_age_group[['region', 'age_group', 'proportion']] \
-                          .pivot(index   = 'region',
-                          columns = 'age_group',
-                          values  = 'proportion')
-        reorder_pivot_region_age_group = pivot_region_age_group.sort_values('old')[['young', 'middle', 'old']]
-        # 시각화
-        fig8, ax8 = plt.subplots()
-        reorder_pivot_region_age_group.plot.barh(stacked = True, ax=ax8)
-        plt.legend(bbox_to_anchor=(1.0, 1.0))
-        plt.title("지역별 연령대 비율 그래프")
-        plt.xlabel("연령대 비율")
-        plt.ylabel("지역")
-        st.pyplot(fig8)
-    else:
-        st.info("지역/연령대 변수가 없어 해당 그래프를 표시할 수 없습니다.")
-with col2:
-    st.markdown("테이블")
-    if (
-        "region" in welfare.columns
-        and "age_group" in welfare.columns
-    ):
-        st.write(pivot_region_age_group.sort_values('old', ascending = False)[['young', 'middle', 'old']])
-    else:
-        st.write("변수 없음")
+    region_choice = []
+select_multi_region = multi_filter(region_choice)
+
+filter_button = filter_form.form_submit_button("필터 적용")
+
+# 페이지에 넘기는 이번 실행의 데이터와 필터 (페이지가 위젯을 더하면 widgets/filters에 추가한다)
+context = {
+    "engine": engine,
+    "data_path": data_path,
+    "chart_mode": chart_mode,
+    "approximate": approximate and not dashboard.artifacts.is_artifact(data_path),
+    "welfare": welfare,
+    "filters": {
+        "sex": select_sex,
+        "age_range": list(slider_range) if slider_range else None,
+        "age_range_applied": age_filtered,
+        "submitted": bool(filter_button),
+        "age_group": select_multi_age_group,
+        "job": select_multi_job,
+        "religion": select_religion,
+        "marriage": select_marriage,
+        "region": select_multi_region,
+    },
+    # 월급 분포처럼 미리 만든 집계표 대신 필터 상태로 다시 계산하는 섹션용
+    "filter_state": {
+        "sex": select_sex,
+        "age_range": tuple(slider_range) if age_filtered else None,
+        "age_group": select_multi_age_group,
+        "job": select_multi_job,
+        "religion": select_religion,
+        "marriage": select_marriage,
+        "region": select_multi_region,
+    },
+    "widgets": [
+        ("selectbox", "성별", select_sex),
+        ("slider", "연령 범위", list(slider_range) if slider_range else None),
+        ("multiselect", "확인하고 싶은 연령대를 선택하세요(복수 선택 가능)", age_group_choice),
+        ("multiselect", "확인하고 싶은 직업을 선택하세요(복수 선택 가능)", job_choice),
+        ("selectbox", "종교", select_religion),
+        ("selectbox", "혼인", select_marriage),
+        ("multiselect", "확인하고 싶은 지역을 선택하세요(복수 선택 가능)", region_choice),
+        ("button", "필터 적용", bool(filter_button)),
+    ],
+}
+dashboard.begin(context)
+
+page_path = next(path for path, page in pages.items() if page.url_path == current_page.url_path)
+try:
+    current_page.run()
+except BaseException as e:
+    # st.stop()/st.rerun()도 예외로 빠져나온다
+    stop_profile(page=page_path, filters=context["filters"], stopped=type(e).__name__)
+    raise
+
+# 성능 진단
+finish_rerun(context["filters"], context["widgets"], page=page_path)
 
 # 끝
 
@@ -639,5 +305,3 @@ with col2:
 # 1. 주제에서 사용하는 변수 전처리 추가
 # 2. 사이드바에 주제에서 사용하는 변수 필터 추가
 # 3. 컬럼 레이아웃으로 주제별 시각화와 집계표(테이블) 나타내기
-
-
@@ -0,0 +1,60 @@
+# 연산 엔진 벤치마크 (pandas / duckdb / polars)
+# python -m benchmarks.bench_engines --scales 1 10 100 1000 2000
+#   load: 전처리까지 끝난 전체 welfare 데이터프레임 만들기
+#   sections: 8개 섹션 집계표 전부 계산 (엔진 생성 포함)
+import argparse
+import json
+import time
+
+from benchmarks.scale import scaled_csv
+from koweps import sections
+from koweps.backends import BACKENDS, open_backend
+
+
+def run_sections(backend):
+    for n in sorted({section for section, _ in sections.TABLES.values()}):
+        backend.section(n)
+
+
+def bench(path, engine, repeat=1):
+    timings = {"load": [], "sections": []}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        open_backend(engine, path).load()
+        timings["load"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        run_sections(open_backend(engine, path))
+        timings["sections"].append(time.perf_counter() - start)
+    return {stage: min(values) for stage, values in timings.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--engines", nargs="+", default=list(BACKENDS))
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일")
+    args = parser.parse_args()
+
+    results = []
+    print("{:>6} {:>12} {:>8} {:>10} {:>10}".format("scale", "rows", "engine", "load(s)", "sections(s)"))
+    for factor in args.scales:
+        path = scaled_csv(factor)
+        with open(path, encoding="utf-8") as f:
+            rows = sum(1 for _ in f) - 1
+        for engine in args.engines:
+            result = {"scale": factor, "rows": rows, "engine": engine, **bench(path, engine, args.repeat)}
+            results.append(result)
+            print(
+                "{scale:>6} {rows:>12} {engine:>8} {load:>10.3f} {sections:>10.3f}".format(**result),
+                flush=True,
+            )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
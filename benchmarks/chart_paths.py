@@ -0,0 +1,110 @@
+# 그래프 방식별 서버 CPU 시간과 전송량 비교 (이미지 / plotly / 브라우저 필터)
+# python -m benchmarks.chart_paths --repeat 5
+# 섹션 페이지를 모두 한 번씩 여는 것을 한 바퀴로 잰다 (브라우저 필터 방식은 한 화면을 한 번)
+#   cold_cpu_ms: 캐시가 빈 세션 첫 바퀴의 서버 CPU 시간 (데이터 로드 포함, 방식 간 차이는 그래프 만들기)
+#   warm_cpu_ms: 캐시된 뒤 한 바퀴 서버 CPU 시간 (repeat회 중앙값)
+#   chart_bytes: 한 바퀴에 브라우저로 보내는 그래프 데이터 (1~8번 섹션)
+#     image: PNG 이미지, plotly: plotly 명세 JSON, interactive: 큐브 페이지 (세션당 한 번, 필터 변경 시 0)
+# 실행은 AppTest로 하고, 전송량은 앱이 캐시하는 것과 같은 함수로 만든 결과의 크기를 잰다.
+import argparse
+import json
+import os
+import statistics
+import time
+
+os.environ.setdefault("KOWEPS_TIMING_LOG", "")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import streamlit as st  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from benchmarks.load_test import APP_PATH, RUN_TIMEOUT  # noqa: E402
+from koweps import charts, cube, plotly_charts  # noqa: E402
+from koweps.backends import PandasBackend  # noqa: E402
+from views import PAGES  # noqa: E402
+
+DATA_PATH = "data/welfare_2015.csv"
+MODES = ["image", "plotly", "interactive"]
+
+
+def chart_bytes(path):
+    backend = PandasBackend.from_path(path)
+    sizes = {"image": 0, "plotly": 0}
+    for name, (_, table_name) in charts.FIGURES.items():
+        table = backend.table(table_name)
+        sizes["image"] += len(charts.to_png(charts.build(name, table)))
+        sizes["plotly"] += len(plotly_charts.to_json(plotly_charts.build(name, table)))
+    sizes["interactive"] = len(cube.to_html(cube.build(backend.load())).encode("utf-8"))
+    return sizes
+
+
+def cpu_run(at):
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    at.run(timeout=RUN_TIMEOUT)
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return (time.process_time() - cpu) * 1000, (time.perf_counter() - wall) * 1000
+
+
+def visit_pages(at, mode):
+    # 섹션 페이지를 모두 한 번씩 연다 (브라우저 필터 방식은 한 화면). (CPU ms, 경과 ms) 합계
+    cpu, wall = cpu_run(at)
+    if mode != "interactive":
+        for path, _ in PAGES[1:] + PAGES[:1]:
+            at.switch_page(path)
+            page_cpu, page_wall = cpu_run(at)
+            cpu += page_cpu
+            wall += page_wall
+    return cpu, wall
+
+
+def bench_mode(mode, repeat):
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    plt.close("all")
+    at = AppTest.from_file(APP_PATH, default_timeout=RUN_TIMEOUT)
+    at.session_state["chart_mode"] = mode
+    cold_cpu, cold_wall = visit_pages(at, mode)
+    warm = [visit_pages(at, mode) for _ in range(repeat)]
+    return {
+        "mode": mode,
+        "cold_cpu_ms": cold_cpu,
+        "cold_wall_ms": cold_wall,
+        "warm_cpu_ms": statistics.median(cpu for cpu, _ in warm),
+        "warm_wall_ms": statistics.median(wall for _, wall in warm),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--modes", nargs="+", default=MODES, choices=MODES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일")
+    args = parser.parse_args()
+
+    sizes = chart_bytes(DATA_PATH)
+    results = []
+    print(
+        "{:>12} {:>12} {:>12} {:>12} {:>12}".format(
+            "mode", "cold cpu ms", "warm cpu ms", "warm wall ms", "chart KB"
+        )
+    )
+    for mode in args.modes:
+        result = bench_mode(mode, args.repeat)
+        result["chart_bytes"] = sizes[mode]
+        results.append(result)
+        print(
+            "{mode:>12} {cold_cpu_ms:>12.1f} {warm_cpu_ms:>12.1f} {warm_wall_ms:>12.1f} {kb:>12.1f}".format(
+                kb=result["chart_bytes"] / 1024, **result
+            ),
+            flush=True,
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+# 벤치마크 결과 비교
+# python -m benchmarks.diff bench_results/old.json bench_results/new.json
+import argparse
+import json
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        run = json.load(f)
+    return run, {(r["scale"], r["stage"], r["name"]): r for r in run["results"]}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.1, help="이 비율 이상 변한 항목만 표시")
+    args = parser.parse_args()
+
+    old_run, old = load(args.old)
+    new_run, new = load(args.new)
+    print("{} -> {}".format(old_run.get("commit"), new_run.get("commit")))
+    print("{:>6} {:<7} {:<28} {:>10} {:>10} {:>8}".format("scale", "stage", "name", "old(s)", "new(s)", "ratio"))
+    for key in sorted(old.keys() & new.keys(), key=lambda k: (k[0], k[1], k[2])):
+        before, after = old[key]["seconds"], new[key]["seconds"]
+        ratio = after / before if before else float("inf")
+        if abs(ratio - 1) < args.threshold:
+            continue
+        print("{:>6} {:<7} {:<28} {:>10.4f} {:>10.4f} {:>7.2f}x".format(*key, before, after, ratio))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+# 동시 세션 부하 테스트
+# python -m benchmarks.load_test --sessions 1 2 4 8 16 --steps 20
+# Streamlit 서버처럼 한 프로세스 안에서 세션마다 스레드 하나로 app.py를 실행한다(AppTest).
+# 캐시(st.cache_data/st.cache_resource)는 프로세스 전역이라 실제 서버와 같이 세션 간에 공유된다.
+# 각 세션은 분석가가 페이지를 옮기고 사이드바를 만지는 순서(성별 선택, 연령 범위, 직업/연령대/지역 선택 등)를
+# 무작위로 따라 한다.
+# 필터는 폼으로 묶여 있으므로 한 단계 = 필터 1~3개 변경 + "필터 적용" 클릭 = rerun 1회이고, 그 시간을 잰다.
+#   latency p50/p95/p99: 세션 수별 rerun 1회 시간
+#   throughput: 초당 rerun 수 (모든 세션 합계)
+#   rss: 단계가 끝난 뒤 / 단계 중 최대 프로세스 상주 메모리
+import argparse
+import json
+import os
+import random
+import threading
+import time
+
+import numpy as np
+
+# 부하 테스트 중 실행 기록 파일을 쓰지 않도록 (app.py를 읽기 전에 설정)
+os.environ.setdefault("KOWEPS_TIMING_LOG", "")
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from koweps.memory import format_bytes, process_rss  # noqa: E402
+from views import PAGES  # noqa: E402
+
+# AppTest는 상대 경로를 이 파일 기준으로 찾으므로 절대 경로로 (다른 벤치마크처럼 저장소 루트에서 실행)
+APP_PATH = os.path.abspath("app.py")
+RUN_TIMEOUT = 600
+
+SEX_LABEL = "성별"
+AGE_RANGE_LABEL = "연령 범위"
+APPLY_LABEL = "필터 적용"
+AGE_GROUP_LABEL = "확인하고 싶은 연령대를 선택하세요(복수 선택 가능)"
+JOB_LABEL = "확인하고 싶은 직업을 선택하세요(복수 선택 가능)"
+RELIGION_LABEL = "종교"
+MARRIAGE_LABEL = "혼인"
+REGION_LABEL = "확인하고 싶은 지역을 선택하세요(복수 선택 가능)"
+
+
+def widget(at, kind, label):
+    # 사이드바와 페이지 본문에서 찾는다
+    for element in getattr(at, kind):
+        if element.label == label:
+            return element
+    raise LookupError("{} '{}' not found".format(kind, label))
+
+
+def _pick(rng, options, most=3):
+    options = [option for option in options if option != "All"]
+    return rng.sample(options, rng.randint(1, min(most, len(options))))
+
+
+# 위젯 조작 1회 (적용과 rerun은 호출하는 쪽에서)
+def select_sex(at, rng):
+    box = widget(at, "selectbox", SEX_LABEL)
+    value = rng.choice(box.options)
+    box.select(value)
+
+
+def select_age_range(at, rng):
+    slider = widget(at, "slider", AGE_RANGE_LABEL)
+    low = rng.randint(slider.min, slider.max)
+    high = rng.randint(low, slider.max)
+    slider.set_range(low, high)
+
+
+def select_age_group(at, rng):
+    box = widget(at, "multiselect", AGE_GROUP_LABEL)
+    value = _pick(rng, box.options)
+    box.set_value(value)
+
+
+def select_job(at, rng):
+    box = widget(at, "multiselect", JOB_LABEL)
+    value = _pick(rng, box.options)
+    box.set_value(value)
+
+
+def select_religion_marriage(at, rng):
+    religion = widget(at, "selectbox", RELIGION_LABEL)
+    religion.select(rng.choice(religion.options))
+    marriage = widget(at, "selectbox", MARRIAGE_LABEL)
+    marriage.select(rng.choice(marriage.options))
+
+
+def select_region(at, rng):
+    box = widget(at, "multiselect", REGION_LABEL)
+    value = _pick(rng, box.options)
+    box.set_value(value)
+
+
+def select_page(at, rng):
+    # 다른 섹션 페이지로 이동 (필터 값은 세션에 남는다)
+    path, _ = rng.choice(PAGES)
+    at.switch_page(path)
+
+
+# (조작, 가중치)
+ACTIONS = [
+    (select_page, 3),
+    (select_sex, 3),
+    (select_age_range, 3),
+    (select_age_group, 2),
+    (select_job, 2),
+    (select_religion_marriage, 1),
+    (select_region, 1),
+]
+
+
+def run_session(seed, steps, data_path, engine, latencies, errors, timeout):
+    try:
+        _run_session(seed, steps, data_path, engine, latencies, errors, timeout)
+    except Exception as e:
+        errors.append(e)
+        raise
+
+
+def healthy(at):
+    # 동시 세션에서 AppTest가 가끔 예외 없이 빈 화면을 돌려주므로 사이드바와 필터 폼이 그려졌는지 본다
+    try:
+        widget(at, "text_input", "데이터 파일 경로")
+        widget(at, "button", APPLY_LABEL)
+    except LookupError:
+        return False
+    return True
+
+
+def _run_session(seed, steps, data_path, engine, latencies, errors, timeout):
+    rng = random.Random(seed)
+    actions, weights = zip(*ACTIONS)
+
+    def rerun(at, record=True):
+        # 정상 실행이면 True. 정상 실행의 시간만 남긴다 (예외나 빈 화면은 오류로 세고 시간은 버린다)
+        start = time.perf_counter()
+        try:
+            at.run(timeout=timeout)
+        except Exception as e:
+            errors.append(e)
+            return False
+        elapsed = time.perf_counter() - start
+        if at.exception:
+            errors.append(at.exception[0].value)
+            return False
+        if not healthy(at):
+            errors.append("empty element tree")
+            return False
+        if record:
+            latencies.append(elapsed)
+        return True
+
+    def open_session(record=True):
+        # 새 세션 (데이터 경로와 엔진을 고른 상태까지)
+        at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        if rerun(at, record) and (data_path or engine):
+            if data_path:
+                widget(at, "text_input", "데이터 파일 경로").input(data_path)
+            if engine:
+                widget(at, "selectbox", "연산 엔진").select(engine)
+            rerun(at, record)
+        return at
+
+    at = open_session()
+    for _ in range(steps):
+        try:
+            for action in rng.choices(actions, weights, k=rng.randint(1, 3)):
+                action(at, rng)
+            widget(at, "button", APPLY_LABEL).click()
+        except Exception as e:
+            errors.append(e)
+            ok = False
+        else:
+            ok = rerun(at)
+        if not ok:
+            # 빈 화면 뒤의 AppTest는 위젯 상태가 깨져 있으므로 이 단계는 버리고 새 세션으로 이어 간다
+            at = open_session(record=False)
+
+
+def _rss_watcher(stop, peak, interval=0.05):
+    while not stop.wait(interval):
+        rss = process_rss()
+        if rss is not None:
+            peak[0] = max(peak[0], rss)
+
+
+def run_level(sessions, steps, data_path=None, engine=None, seed=0, timeout=RUN_TIMEOUT):
+    latencies = []
+    errors = []
+    peak = [process_rss() or 0]
+    stop = threading.Event()
+    watcher = threading.Thread(target=_rss_watcher, args=(stop, peak), daemon=True)
+    threads = [
+        threading.Thread(
+            target=run_session,
+            args=(seed * 1000 + i, steps, data_path, engine, latencies, errors, timeout),
+            name="session-{}".format(i),
+        )
+        for i in range(sessions)
+    ]
+    watcher.start()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+    stop.set()
+    watcher.join()
+
+    if not latencies:
+        raise RuntimeError("no rerun finished: {}".format(errors[:1]))
+    return {
+        "sessions": sessions,
+        "reruns": len(latencies),
+        "errors": len(errors),
+        "wall_seconds": wall,
+        "throughput": len(latencies) / wall,
+        **latency_summary(latencies),
+        "rss": process_rss(),
+        "peak_rss": peak[0],
+    }
+
+
+def latency_summary(latencies):
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {"p50": p50, "p95": p95, "p99": p99, "max": max(latencies)}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--steps", type=int, default=20, help="세션당 위젯 조작 횟수")
+    parser.add_argument("--data-path", help="데이터 파일 경로 (기본: 앱 기본값)")
+    parser.add_argument("--engine", help="연산 엔진 (기본: 앱 기본값)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-warmup", action="store_true", help="캐시가 빈 상태에서 시작")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일")
+    args = parser.parse_args()
+
+    if not args.no_warmup:
+        # 데이터 로드/집계표/그래프 캐시 채우기 (세션 수별 결과가 첫 로드 시간에 좌우되지 않도록)
+        run_level(1, 0, args.data_path, args.engine, args.seed)
+
+    results = []
+    print(
+        "{:>8} {:>7} {:>9} {:>9} {:>9} {:>9} {:>10} {:>10}".format(
+            "sessions", "reruns", "p50(ms)", "p95(ms)", "p99(ms)", "rerun/s", "rss", "peak rss"
+        )
+    )
+    for sessions in args.sessions:
+        result = run_level(sessions, args.steps, args.data_path, args.engine, args.seed)
+        results.append(result)
+        print(
+            "{:>8} {:>7} {:>9.1f} {:>9.1f} {:>9.1f} {:>9.2f} {:>10} {:>10}".format(
+                sessions,
+                result["reruns"],
+                result["p50"] * 1000,
+                result["p95"] * 1000,
+                result["p99"] * 1000,
+                result["throughput"],
+                format_bytes(result["rss"]),
+                format_bytes(result["peak_rss"]),
+            )
+            + ("  errors: {}".format(result["errors"]) if result["errors"] else ""),
+            flush=True,
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+# 기록한 세션 재생
+# KOWEPS_TRACE_FILE=logs/trace.jsonl streamlit run app.py 로 모은 실제 사용 기록을 AppTest로 재생한다.
+# python -m benchmarks.replay logs/trace.jsonl --speed 10
+#   세션마다 스레드 하나로 같은 순서의 위젯 조작을 재현한다 (load_test와 같은 방식).
+#   --speed: 세션 시작 간격과 조작 사이 대기 시간을 몇 배 빠르게 재현할지 (0이면 기다리지 않음)
+#   결과: 재생한 rerun 시간 p50/p95/p99(기록 당시 값과 비교), 캐시별 적중률(기록 당시 / 재생)
+import argparse
+import datetime
+import json
+import os
+import threading
+import time
+
+# 재생하는 실행이 다시 기록되지 않도록 (app.py를 읽기 전에 설정)
+os.environ["KOWEPS_TRACE_FILE"] = ""
+os.environ.setdefault("KOWEPS_TIMING_LOG", "")
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from benchmarks.load_test import APP_PATH, RUN_TIMEOUT, latency_summary, widget  # noqa: E402
+from koweps import metrics, trace  # noqa: E402
+from views import PAGES  # noqa: E402
+
+
+def _seconds(started_at):
+    return datetime.datetime.fromisoformat(started_at).timestamp()
+
+
+def apply_page(at, page, current):
+    # 기록된 페이지로 이동. 이동했으면 True
+    if page is None or page == current:
+        return False
+    at.switch_page(page)
+    return True
+
+
+def apply_widgets(at, widgets):
+    # 기록된 값과 다른 위젯만 바꾼다. 바꾼 것이 있으면 True
+    changed = False
+    for state in widgets:
+        if state["value"] is None:
+            continue
+        try:
+            element = widget(at, state["kind"], state["label"])
+        except LookupError:
+            continue
+        if state["kind"] == "button":
+            if state["value"]:
+                element.click()
+                changed = True
+            continue
+        value = tuple(state["value"]) if state["kind"] == "slider" else state["value"]
+        current = tuple(element.value) if state["kind"] == "slider" else element.value
+        if current != value:
+            element.set_value(value)
+            changed = True
+    return changed
+
+
+def replay_session(steps, speed, delay, latencies, errors, timeout=RUN_TIMEOUT):
+    try:
+        if speed and delay > 0:
+            time.sleep(delay / speed)
+        at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        page = None
+        for i, entry in enumerate(steps):
+            if i == 0:
+                # 첫 기록 = 첫 실행. 페이지나 위젯이 기본값이 아니면 (주소 공유 등) 한 번 더 실행
+                at.run(timeout=timeout)
+                moved = apply_page(at, entry.get("page"), PAGES[0][0])
+                if not apply_widgets(at, entry["widgets"]) and not moved:
+                    page = entry.get("page")
+                    continue
+            else:
+                if speed:
+                    previous = steps[i - 1]
+                    think = _seconds(entry["started_at"]) - _seconds(previous["started_at"])
+                    time.sleep(max(think - previous["total_ms"] / 1000, 0) / speed)
+                apply_page(at, entry.get("page"), page)
+                apply_widgets(at, entry["widgets"])
+            page = entry.get("page")
+            start = time.perf_counter()
+            at.run(timeout=timeout)
+            latencies.append((time.perf_counter() - start, entry["total_ms"] / 1000))
+            if at.exception:
+                errors.append(at.exception[0].value)
+    except Exception as e:
+        errors.append(e)
+        raise
+
+
+def replay(path, speed=0.0, sequential=False):
+    sessions = trace.read_sessions(path)
+    first = min(_seconds(steps[0]["started_at"]) for steps in sessions.values())
+    latencies = []
+    errors = []
+    threads = [
+        threading.Thread(
+            target=replay_session,
+            args=(steps, speed, _seconds(steps[0]["started_at"]) - first, latencies, errors),
+            name="replay-{}".format(i),
+        )
+        for i, steps in enumerate(sessions.values())
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+        if sequential:
+            thread.join()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    recorded_cache = {}
+    for steps in sessions.values():
+        for entry in steps:
+            for cache, counts in entry["cache"].items():
+                total = recorded_cache.setdefault(cache, {"hit": 0, "miss": 0})
+                total["hit"] += counts["hit"]
+                total["miss"] += counts["miss"]
+    cache = {}
+    for name, recorded in recorded_cache.items():
+        replayed = {
+            result: metrics.REGISTRY.get("koweps_cache_requests_total", cache=name, result=result)
+            for result in ("hit", "miss")
+        }
+        cache[name] = {
+            "recorded_hit_ratio": recorded["hit"] / max(recorded["hit"] + recorded["miss"], 1),
+            "replayed_hit_ratio": replayed["hit"] / max(replayed["hit"] + replayed["miss"], 1),
+        }
+
+    if not latencies:
+        raise RuntimeError("no rerun finished: {}".format(errors[:1]))
+    return {
+        "sessions": len(sessions),
+        "reruns": len(latencies),
+        "errors": len(errors),
+        "wall_seconds": wall,
+        "replayed": latency_summary([replayed for replayed, _ in latencies]),
+        "recorded": latency_summary([recorded for _, recorded in latencies]),
+        "cache": cache,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("trace", help="KOWEPS_TRACE_FILE로 기록한 파일")
+    parser.add_argument("--speed", type=float, default=0.0, help="대기 시간 배속 (0: 기다리지 않음)")
+    parser.add_argument("--sequential", action="store_true", help="세션을 동시에 말고 하나씩 재생")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일")
+    args = parser.parse_args()
+
+    result = replay(args.trace, args.speed, args.sequential)
+    print("sessions {sessions}  reruns {reruns}  errors {errors}  wall {wall_seconds:.1f} s".format(**result))
+    print("{:>10} {:>9} {:>9} {:>9} {:>9}".format("", "p50(ms)", "p95(ms)", "p99(ms)", "max(ms)"))
+    for name in ("recorded", "replayed"):
+        print(
+            "{:>10} {p50:>9.1f} {p95:>9.1f} {p99:>9.1f} {max:>9.1f}".format(
+                name, **{key: value * 1000 for key, value in result[name].items()}
+            )
+        )
+    for name, ratios in result["cache"].items():
+        print(
+            "cache {:<14} hit ratio recorded {:.1%}  replayed {:.1%}".format(
+                name, ratios["recorded_hit_ratio"], ratios["replayed_hit_ratio"]
+            )
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
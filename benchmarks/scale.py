@@ -0,0 +1,27 @@
+# 벤치마크용 확대 데이터
+# data/welfare_2015.csv의 행을 factor배로 반복해서 CSV로 저장 (한 번 만든 파일은 재사용)
+import os
+
+SOURCE_PATH = "data/welfare_2015.csv"
+OUTPUT_DIR = "bench_data"
+
+
+def scaled_csv(factor, src=SOURCE_PATH, out_dir=OUTPUT_DIR):
+    if factor == 1:
+        return src
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, "welfare_x{}.csv".format(factor))
+    if os.path.exists(path):
+        return path
+    with open(src, encoding="utf-8") as f:
+        header = f.readline()
+        body = f.read()
+    if not body.endswith("\n"):
+        body += "\n"
+    # 쓰다가 중단되면 다음 실행에서 다시 만들도록 임시 파일에 쓴 뒤 이름 변경
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        f.write(header)
+        for _ in range(factor):
+            f.write(body)
+    os.replace(path + ".tmp", path)
+    return path
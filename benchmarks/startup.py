@@ -0,0 +1,103 @@
+# 시작 시간: 그리기 라이브러리 가져오기와 한글 폰트 찾기를 미룬 효과
+# python -m benchmarks.startup --repeat 5
+# 새 파이썬 프로세스에서 단계별로 잰다 (repeat회 중앙값).
+#   entry imports: 모든 실행에 필요한 가져오기 (streamlit, dashboard, koweps)
+#   matplotlib/seaborn imports, font: 예전에는 프로세스 시작마다, 지금은 matplotlib 그래프를 처음 그릴 때 한 번
+#   plotly imports: plotly 방식으로 처음 그릴 때 한 번
+#   font (cached): 폰트 찾기 결과를 파일에서 읽을 때 (재시작, 다른 워커)
+# 가져오기 시간 상세는 python -X importtime 결과를 최상위 패키지별로 묶어 보여 준다 (그리기 라이브러리는 entry 다음에 더 드는 시간).
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+STEPS = [
+    ("entry imports", "import streamlit, dashboard"),
+    ("matplotlib/seaborn imports", "import koweps.charts"),
+    ("font", "koweps.fonts.apply()"),
+    ("plotly imports", "import koweps.plotly_charts"),
+]
+
+_PROBE = """
+import json, sys, time
+times = {}
+for name, code in json.loads(sys.argv[1]):
+    start = time.perf_counter()
+    exec(code)
+    times[name] = (time.perf_counter() - start) * 1000
+print(json.dumps(times))
+"""
+
+
+def run_steps(font_cache):
+    env = dict(os.environ, KOWEPS_FONT_CACHE=font_cache)
+    output = subprocess.check_output(
+        [sys.executable, "-c", _PROBE, json.dumps(STEPS)], env=env, text=True, stderr=subprocess.DEVNULL
+    )
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def import_breakdown(code, setup="", top=12):
+    # 최상위 패키지 -> 가져오기 시간(ms, 모듈별 self 시간 합계라 겹치지 않는다). setup에서 가져온 모듈은 빼고 잰다
+    marker = "koweps-startup-marker"
+    script = "{}\nimport sys; print({!r}, file=sys.stderr)\n{}".format(setup, marker, code)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script], capture_output=True, text=True, check=True
+    )
+    lines = result.stderr.splitlines()
+    if setup:
+        lines = lines[lines.index(marker) + 1:]
+    totals = {}
+    for line in lines:
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        totals[package] = totals.get(package, 0.0) + int(self_us) / 1000
+    return sorted(totals.items(), key=lambda item: -item[1])[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cold = []
+        warm = []
+        for i in range(args.repeat):
+            font_cache = os.path.join(tmp, "font_{}.json".format(i))
+            cold.append(run_steps(font_cache))
+            warm.append(run_steps(font_cache))
+    steps = {name: statistics.median(run[name] for run in cold) for name, _ in STEPS}
+    steps["font (cached)"] = statistics.median(run["font"] for run in warm)
+    deferred = steps["matplotlib/seaborn imports"] + steps["font"]
+
+    print("{:<28} {:>10}".format("step", "ms"))
+    for name, ms in steps.items():
+        print("{:<28} {:>10.1f}".format(name, ms))
+    print(
+        "process start before: {:.0f} ms  now: {:.0f} ms  (saved {:.0f} ms, paid on the first matplotlib chart)"
+        .format(steps["entry imports"] + deferred, steps["entry imports"], deferred)
+    )
+
+    breakdown = {
+        "entry imports": import_breakdown(STEPS[0][1]),
+        "matplotlib/seaborn imports": import_breakdown(STEPS[1][1], setup=STEPS[0][1]),
+    }
+    for name, packages in breakdown.items():
+        print("\n-X importtime: {}".format(name))
+        for package, ms in packages:
+            print("  {:<24} {:>9.1f} ms".format(package, ms))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"steps": steps, "saved_ms": deferred, "breakdown": breakdown}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# 단계별 벤치마크: 로드(CSV 파싱/코드북 결합/파생 변수), 섹션 집계표, 그래프 생성/PNG 인코딩
+# python -m benchmarks.suite --scales 1 10 100 1000
+# 결과는 bench_results/에 JSON으로 저장 (커밋 간 비교: python -m benchmarks.diff old.json new.json)
+#   seconds: repeat회 중 최소 시간
+#   peak_bytes: tracemalloc 기준 단계 중 최대 할당량 (Python/numpy 메모리, --no-memory면 생략)
+#   rss: 해당 배율까지 실행한 뒤의 프로세스 상주 메모리
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+
+import matplotlib.pyplot as plt
+import pandas as pd
+
+from benchmarks.scale import scaled_csv
+from koweps import charts, sections, timing
+from koweps.backends import PandasBackend, open_backend
+from koweps.loader import read_welfare
+from koweps.memory import process_rss
+
+RESULTS_DIR = "bench_results"
+
+
+def measure(fn, repeat=1, memory=True):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            fn()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result, best, peak
+
+
+def load_stages(path):
+    # 로더 내부 구간(load parse / load codebook / load derive)별 합계
+    timer = timing.begin()
+    read_welfare(path)
+    totals = {}
+    for name, _, seconds in timer.stages:
+        totals[name] = totals.get(name, 0.0) + seconds
+    return totals
+
+
+def bench_scale(path, factor, engine, repeat, memory):
+    results = []
+
+    def add(stage, name, seconds, peak=None):
+        results.append(
+            {"scale": factor, "stage": stage, "name": name, "seconds": seconds, "peak_bytes": peak}
+        )
+
+    welfare, seconds, peak = measure(lambda: read_welfare(path), repeat, memory)
+    rows = len(welfare)
+    add("load", "load_welfare", seconds, peak)
+    stage_times = [load_stages(path) for _ in range(repeat)]
+    for name in stage_times[0]:
+        add("load", name, min(times[name] for times in stage_times))
+
+    backend = PandasBackend(welfare) if engine == PandasBackend.name else open_backend(engine, path)
+    tables = {}
+    for name in sections.TABLES:
+        tables[name], seconds, peak = measure(lambda name=name: backend.table(name), repeat, memory)
+        add("table", name, seconds, peak)
+    del welfare
+
+    for name, (_, table_name) in charts.FIGURES.items():
+        table = tables[table_name]
+        _, seconds, peak = measure(lambda: plt.close(charts.build(name, table)), repeat, memory)
+        add("figure", name, seconds, peak)
+        _, seconds, peak = measure(lambda: charts.to_png(charts.build(name, table)), repeat, memory)
+        # 인코딩 시간 = (생성 + 인코딩) - 생성
+        add("encode", name, max(seconds - results[-1]["seconds"], 0.0), peak)
+
+    for result in results:
+        result["rows"] = rows
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--engine", default=PandasBackend.name, help="집계표 연산 엔진")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc 측정 생략 (빠름)")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: bench_results/suite_<시각>_<커밋>.json)")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    run = {
+        "commit": commit,
+        "started_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "engine": args.engine,
+        "repeat": args.repeat,
+        "results": [],
+        "rss": {},
+    }
+    for factor in args.scales:
+        path = scaled_csv(factor)
+        results = bench_scale(path, factor, args.engine, args.repeat, not args.no_memory)
+        run["results"].extend(results)
+        run["rss"][factor] = process_rss()
+        print("scale x{} ({} rows)".format(factor, results[0]["rows"]))
+        for result in results:
+            peak = "" if result["peak_bytes"] is None else "{:>10.1f} MB".format(result["peak_bytes"] / 2**20)
+            print("  {stage:<7} {name:<28} {seconds:>9.4f} s".format(**result) + peak, flush=True)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR,
+        "suite_{}_{}.json".format(datetime.datetime.now().strftime("%Y%m%dT%H%M%S"), commit or "nogit"),
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(run, f, ensure_ascii=False, indent=2)
+    print("saved", output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,424 @@
+# 여러 페이지가 함께 쓰는 캐시와 화면 조각
+# app.py(진입점)가 데이터와 필터를 준비해 begin()으로 넘기면 views/의 각 페이지가 current()로 받아 자기 섹션만 그린다.
+# 그리기 라이브러리(matplotlib/seaborn, plotly)는 그래프를 실제로 만들 때 가져온다.
+import os
+
+import streamlit as st
+
+from koweps import (
+    PandasBackend,
+    artifacts,
+    core,
+    distribution,
+    fonts,
+    memory,
+    metrics,
+    open_backend,
+    partitions,
+    sampling,
+    sections,
+    slices,
+    timing,
+)
+
+# 변수 -> 화면 이름 (변수가 없을 때 안내 문구)
+COLUMN_LABELS = {
+    "sex": "성별",
+    "age": "나이",
+    "age_group": "연령대",
+    "income": "월급",
+    "job": "직업",
+    "religion": "종교",
+    "marriage": "혼인",
+    "region": "지역",
+}
+
+DEFAULT_DATA_PATH = "data/welfare_2015.csv"
+# 필터를 하나도 고르지 않은 상태 (app.py의 filter_state 기본값과 같아야 미리 데운 월급 분포를 쓴다)
+DEFAULT_FILTER_STATE = {
+    "sex": "All",
+    "age_range": None,
+    "age_group": "All",
+    "job": "All",
+    "religion": "All",
+    "marriage": "All",
+    "region": "All",
+}
+
+# 지역별로 나눈 데이터(koweps.partitions)에서 이 워커가 읽을 지역 (쉼표로 구분, 비우면 전부, 없는 지역이면 로드 오류)
+WORKER_REGIONS = [region for region in os.environ.get("KOWEPS_REGIONS", "").split(",") if region] or None
+
+# 필터 상태별 월급 분포 캐시 항목 수 (상태 하나당 수 KB)
+DISTRIBUTION_CACHE_ENTRIES = int(os.environ.get("KOWEPS_DISTRIBUTION_CACHE_ENTRIES", "256"))
+DISTRIBUTION_SECTION = 9
+DISTRIBUTION_FIGURES = ("income_hist", "age_income")
+
+# 표본 근사 모드에서 더 큰 표본의 결과를 확인하는 간격
+SAMPLE_REFRESH = os.environ.get("KOWEPS_SAMPLE_REFRESH", "1s")
+
+_CONTEXT_KEY = "dashboard_context"
+
+
+def begin(context):
+    # 이번 실행의 데이터/필터 (engine, data_path, chart_mode, welfare, filters, filter_state, widgets)
+    st.session_state[_CONTEXT_KEY] = context
+
+
+def current():
+    return st.session_state[_CONTEXT_KEY]
+
+
+# 데이터 로드 함수
+# 캐시
+@st.cache_data
+def load_welfare(sav_path: str, engine: str = PandasBackend.name):
+    # 캐시 미스일 때만 실행되는 구간
+    with timing.stage("load_welfare (miss)"):
+        if partitions.is_partitioned(sav_path):
+            # 맡은 지역의 조각 파일만 읽는다 (엔진과 관계없이 pandas로 집계)
+            welfare = core.load(sav_path, regions=WORKER_REGIONS)
+        elif engine == PandasBackend.name:
+            welfare = core.load(sav_path)
+        else:
+            welfare = get_backend(engine, sav_path).load()
+    metrics.cache_stored("load_welfare", (sav_path, engine), welfare.memory_usage(deep=True).sum())
+    return welfare
+
+
+# 연산 엔진 (세션 간 공유)
+@st.cache_resource
+def get_backend(engine: str, sav_path: str):
+    # 결과 폴더(koweps.artifacts)면 엔진과 관계없이 저장된 집계표를 읽는다
+    # 지역별로 나눈 데이터면 이 워커가 읽은 지역으로 pandas 집계
+    in_memory = engine == PandasBackend.name and not artifacts.is_artifact(sav_path)
+    if in_memory or partitions.is_partitioned(sav_path):
+        return PandasBackend(load_welfare(sav_path, engine))
+    return open_backend(engine, sav_path)
+
+
+# 섹션 집계표 (필터와 무관하므로 데이터 경로/엔진별로 캐시)
+@st.cache_data
+def section_table(engine: str, sav_path: str, name: str):
+    with timing.stage("table {} (miss)".format(name)):
+        table = get_backend(engine, sav_path).table(name)
+    metrics.cache_stored("table", (engine, sav_path, name), table.memory_usage(deep=True).sum())
+    return table
+
+
+# 그래프 PNG (집계표와 마찬가지로 필터와 무관하므로 캐시)
+@st.cache_data
+def figure_png(engine: str, sav_path: str, name: str):
+    with timing.stage("figure {} (miss)".format(name)):
+        from koweps import charts
+
+        fonts.apply()
+        png = charts.to_png(charts.build(name, section_table(engine, sav_path, sections.FIGURES[name])))
+    metrics.cache_stored("figure", (engine, sav_path, name), len(png))
+    return png
+
+
+# plotly 그래프 (세션 간 공유. 매 실행마다 복사본을 만들지 않도록 cache_resource, 수정하지 않고 읽기만 한다)
+@st.cache_resource
+def figure_spec(engine: str, sav_path: str, name: str):
+    with timing.stage("figure {} (miss)".format(name)):
+        from koweps import plotly_charts
+
+        fig = plotly_charts.build(name, section_table(engine, sav_path, sections.FIGURES[name]))
+    metrics.cache_stored("figure", (engine, sav_path, name, "plotly"), len(plotly_charts.to_json(fig)))
+    return fig
+
+
+# 표본 근사 집계 (데이터 경로/엔진마다 백그라운드 계산 하나, 세션 간 공유)
+@st.cache_resource
+def progressive(engine: str, sav_path: str):
+    welfare = load_welfare(sav_path, engine)
+    columns = set(welfare.columns)
+    names = [name for name, (_, required) in sections.TABLES.items() if columns.issuperset(required)]
+    return sampling.Progressive(welfare, names).start()
+
+
+# 표본 크기별 그래프 PNG
+@st.cache_data
+def sample_figure_png(engine: str, sav_path: str, name: str, rows: int):
+    with timing.stage("figure {} (miss)".format(name)):
+        from koweps import charts
+
+        fonts.apply()
+        table = progressive(engine, sav_path).result(sections.FIGURES[name], rows)["table"]
+        png = charts.to_png(charts.build(name, table))
+    metrics.cache_stored("figure", (engine, sav_path, name, rows), len(png))
+    return png
+
+
+# 표본 크기별 plotly 그래프 (figure_spec처럼 읽기만 한다)
+@st.cache_resource
+def sample_figure_spec(engine: str, sav_path: str, name: str, rows: int):
+    with timing.stage("figure {} (miss)".format(name)):
+        from koweps import plotly_charts
+
+        table = progressive(engine, sav_path).result(sections.FIGURES[name], rows)["table"]
+        fig = plotly_charts.build(name, table)
+    metrics.cache_stored("figure", (engine, sav_path, name, rows, "plotly"), len(plotly_charts.to_json(fig)))
+    return fig
+
+
+# 데이터 키 (필터 결과 메모 koweps.slices용). 엔진마다 행 순서가 다를 수 있어 엔진도 넣는다
+# 지문을 자르지 않고 그대로 쓴다 (원자료는 원본 + 코드북 지문, 결과 폴더/지역별 데이터는 버전/목록 지문 전체)
+@st.cache_data
+def dataset_key(engine: str, sav_path: str):
+    return "{}:{}".format(engine, artifacts.source_fingerprint(sav_path))
+
+
+# 월급 분포 구간 경계 (전체 데이터 기준, 필터와 무관)
+@st.cache_data
+def distribution_edges(engine: str, sav_path: str):
+    welfare = load_welfare(sav_path, engine)
+    return distribution.income_edges(welfare["income"]), distribution.age_edges(welfare["age"])
+
+
+# 월급 분포 구간 빈도 (정규화한 필터 상태별로 캐시, 표 크기는 행 수와 무관)
+@st.cache_data(max_entries=DISTRIBUTION_CACHE_ENTRIES)
+def distribution_table(engine: str, sav_path: str, filter_key: tuple, segment: str):
+    # segment가 None이면 나이 x 월급 격자, 아니면 구분별 월급 히스토그램
+    name = "age_income" if segment is None else "income_hist"
+    with timing.stage("distribution {} (miss)".format(name)):
+        welfare = load_welfare(sav_path, engine)
+        incomes, ages = distribution_edges(engine, sav_path)
+        mask = slices.mask(welfare, dataset_key(engine, sav_path), filter_key)
+        if segment is None:
+            table = distribution.age_income_grid(welfare, ages, incomes, mask)
+        else:
+            table = distribution.income_histogram(welfare, segment, incomes, mask)
+    metrics.cache_stored(
+        "distribution",
+        (engine, sav_path, name, segment, filter_key),
+        table.memory_usage(deep=True).sum(),
+        max_entries=DISTRIBUTION_CACHE_ENTRIES,
+        group="distribution_table",
+    )
+    return table
+
+
+# 월급 분포 그래프 PNG (필터 상태별)
+@st.cache_data(max_entries=DISTRIBUTION_CACHE_ENTRIES)
+def distribution_png(engine: str, sav_path: str, filter_key: tuple, segment: str):
+    name = "age_income" if segment is None else "income_hist"
+    with timing.stage("figure {} (miss)".format(name)):
+        from koweps import charts
+
+        fonts.apply()
+        table = distribution_table(engine, sav_path, filter_key, segment)
+        if segment is None:
+            fig = charts.age_income_heatmap(table)
+        else:
+            fig = charts.income_histogram_step(table, segment, distribution.SEGMENTS[segment])
+        png = charts.to_png(fig)
+    metrics.cache_stored(
+        "figure",
+        (engine, sav_path, name, segment, filter_key),
+        len(png),
+        max_entries=DISTRIBUTION_CACHE_ENTRIES,
+        group="distribution_png",
+    )
+    return png
+
+
+# 브라우저 필터 모드 페이지 (집계 큐브 + plotly 화면, 데이터 경로/엔진별로 캐시)
+@st.cache_data
+def cube_page(engine: str, sav_path: str):
+    with timing.stage("cube (miss)"):
+        from koweps import cube
+
+        page = cube.to_html(cube.build(load_welfare(sav_path, engine)))
+    metrics.cache_stored("cube", (engine, sav_path), len(page))
+    return page
+
+
+# welfare 컬럼별 메모리 (메모리 진단용)
+@st.cache_data
+def welfare_memory(sav_path: str, engine: str):
+    return memory.column_usage(load_welfare(sav_path, engine))
+
+
+def warm_up(sav_path=DEFAULT_DATA_PATH, engine=PandasBackend.name, chart_modes=("image",)):
+    # 첫 접속 전에 데이터, 모든 집계표, 기본 화면의 그래프를 캐시에 채운다 (serve.py가 서버 시작 때 실행).
+    # 구간 시간 기록을 돌려준다
+    timer = timing.begin()
+    with timing.stage("load_welfare"):
+        welfare = load_welfare(sav_path, engine)
+    columns = set(welfare.columns)
+    for name, (_, required) in sections.TABLES.items():
+        if columns.issuperset(required):
+            with timing.stage("table " + name):
+                section_table(engine, sav_path, name)
+    for figure, name in sections.FIGURES.items():
+        if not columns.issuperset(sections.TABLES[name][1]):
+            continue
+        for mode in chart_modes:
+            with timing.stage("figure " + figure):
+                (figure_spec if mode == "plotly" else figure_png)(engine, sav_path, figure)
+    # 월급 분포 페이지의 첫 화면: 필터 없음, 첫 번째 구분
+    segment = next((name for name in distribution.SEGMENTS if name in columns), None)
+    if segment and columns.issuperset(("income", "age")):
+        filter_key = core.normalize(DEFAULT_FILTER_STATE)
+        for mode in chart_modes:
+            for name, value in zip(DISTRIBUTION_FIGURES, (segment, None)):
+                if mode == "plotly":
+                    with timing.stage("distribution " + name):
+                        distribution_table(engine, sav_path, filter_key, value)
+                else:
+                    with timing.stage("figure " + name):
+                        distribution_png(engine, sav_path, filter_key, value)
+    return timer.record(engine=engine, data_path=sav_path, chart_modes=list(chart_modes))
+
+
+def section_of(stage_name):
+    # 구간 이름 -> 섹션 번호 (지표용)
+    # 집계표 이름(table age_income = 2번)과 월급 분포 그래프 이름(figure age_income = 9번)이 겹치므로 종류부터 본다
+    kind, _, key = stage_name.partition(" ")
+    if kind == "distribution":
+        return DISTRIBUTION_SECTION
+    if kind in ("table", "sample"):
+        return sections.TABLES[key][0] if key in sections.TABLES else None
+    if kind in ("figure", "render"):
+        if key in sections.FIGURES:
+            return sections.TABLES[sections.FIGURES[key]][0]
+        if key in DISTRIBUTION_FIGURES:
+            return DISTRIBUTION_SECTION
+    return None
+
+
+def aggregate(name):
+    # 캐시 조회 포함 집계 시간
+    context = current()
+    with timing.stage("table " + name):
+        return section_table(context["engine"], context["data_path"], name)
+
+
+def show_figure(name):
+    context = current()
+    if context["chart_mode"] == "plotly":
+        with timing.stage("figure " + name):
+            fig = figure_spec(context["engine"], context["data_path"], name)
+        with timing.stage("render " + name):
+            st.plotly_chart(fig, width="stretch")
+        return
+    with timing.stage("figure " + name):
+        png = figure_png(context["engine"], context["data_path"], name)
+    with timing.stage("render " + name):
+        st.image(png, width="stretch")
+
+
+def show_distribution(filter_key, segment):
+    # 구간 빈도표는 캐시하고, plotly 모드에서는 작은 표로 명세만 만든다
+    context = current()
+    name = "age_income" if segment is None else "income_hist"
+    if context["chart_mode"] == "plotly":
+        from koweps import plotly_charts
+
+        with timing.stage("distribution " + name):
+            table = distribution_table(context["engine"], context["data_path"], filter_key, segment)
+        with timing.stage("render " + name):
+            if segment is None:
+                fig = plotly_charts.age_income_heatmap(table)
+            else:
+                fig = plotly_charts.income_histogram_step(table, segment, distribution.SEGMENTS[segment])
+            st.plotly_chart(fig, width="stretch")
+        return
+    with timing.stage("figure " + name):
+        png = distribution_png(context["engine"], context["data_path"], filter_key, segment)
+    with timing.stage("render " + name):
+        st.image(png, width="stretch")
+
+
+def filter_preview(*names):
+    # 고른 필터가 모두 적용 중일 때 그 필터만 적용한 데이터 첫 5행
+    context = current()
+    filters = {name: context["filter_state"][name] for name in names}
+    if not has_columns(*("age" if name == "age_range" else name for name in names)):
+        return
+    if any(value is None or value == "All" for value in filters.values()):
+        return
+    st.write("필터로 선택한 데이터 첫 5행")
+    welfare = context["welfare"]
+    mask = slices.mask(welfare, dataset_key(context["engine"], context["data_path"]), filters)
+    st.table(welfare.head() if mask is None else welfare[mask].head())
+
+
+def has_columns(*columns):
+    welfare = current()["welfare"]
+    return all(column in welfare.columns for column in columns)
+
+
+def figure_section(figure, view=None):
+    # 그래프(왼쪽)와 집계표(오른쪽). view: 집계표를 보여 주기 전에 바꾸는 함수
+    table_name = sections.FIGURES[figure]
+    required = sections.TABLES[table_name][1]
+    available = has_columns(*required)
+    context = current()
+    if available and context.get("approximate"):
+        progress = progressive(context["engine"], context["data_path"])
+        polling = not progress.done()
+        # 정확한 값이 나올 때까지 이 부분만 주기적으로 다시 그린다
+        st.fragment(sample_section, run_every=SAMPLE_REFRESH if polling else None)(figure, view, polling)
+        return
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        if available:
+            table = aggregate(table_name)
+            # 시각화
+            show_figure(figure)
+        else:
+            st.info(
+                "{} 변수가 없어 해당 그래프를 표시할 수 없습니다.".format(
+                    "/".join(COLUMN_LABELS[column] for column in required)
+                )
+            )
+    with col2:
+        st.markdown("테이블")
+        if available:
+            st.write(view(table) if view else table)
+        else:
+            st.write("변수 없음")
+
+
+def sample_section(figure, view=None, polling=False):
+    # 표본 근사 모드의 그래프와 집계표: 지금까지 가장 큰 표본의 결과와 95% 신뢰구간 반폭(±)
+    context = current()
+    engine, sav_path = context["engine"], context["data_path"]
+    table_name = sections.FIGURES[figure]
+    progress = progressive(engine, sav_path)
+    # 표 캐시 조회가 아니므로 table 구간(캐시 적중률)과 따로 센다
+    with timing.stage("sample " + table_name):
+        result = progress.latest(table_name)
+    if result is None:
+        st.warning("표본 집계에 실패해 정확한 값을 계산합니다. ({})".format(progress.error))
+        context["approximate"] = False
+        figure_section(figure, view)
+        return
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        with timing.stage("figure " + figure):
+            if context["chart_mode"] == "plotly":
+                fig = sample_figure_spec(engine, sav_path, figure, result["rows"])
+            else:
+                png = sample_figure_png(engine, sav_path, figure, result["rows"])
+        with timing.stage("render " + figure):
+            if context["chart_mode"] == "plotly":
+                st.plotly_chart(fig, width="stretch")
+            else:
+                st.image(png, width="stretch")
+    with col2:
+        st.markdown("테이블")
+        st.write(view(result["table"]) if view else result["table"])
+        if not result["exact"]:
+            st.caption(
+                "표본 {:,}행 / 전체 {:,}행 ({:.1%})으로 계산한 근사값입니다. "
+                "95% 신뢰구간 반폭(±, 빈칸은 응답이 하나뿐이라 알 수 없음):".format(
+                    result["rows"], result["total"], result["rows"] / result["total"]
+                )
+            )
+            st.write(result["ci"])
+    # 정확한 값까지 다 계산했으면 전체를 다시 실행해 주기적인 갱신을 멈춘다
+    if polling and progress.done():
+        st.rerun()
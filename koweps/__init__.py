@@ -0,0 +1,4 @@
+# 한국복지패널 데이터 로드/집계 모듈
+from koweps import timing
+from koweps.backends import BACKENDS, ArtifactBackend, Backend, DuckDBBackend, PandasBackend, open_backend
+from koweps.loader import read_welfare
@@ -0,0 +1,253 @@
+# 섹션 집계표 HTTP API (JSON / Arrow)
+# 단독 실행: python -m koweps.api --data data/welfare_2015.csv --port 8502
+# 앱과 함께: KOWEPS_API_PORT=8502 streamlit run app.py (KOWEPS_API_DATA로 데이터 지정)
+#   GET /tables: 집계표 목록과 데이터 지문
+#   GET /tables/<집계표>?sex=female&region=서울&region=부산/경남/울산&age_range=30,49&top=5&format=arrow
+#     같은 변수를 여러 번 주면 목록 필터, top은 상위 N개 표(job_income, job_male, job_female)에만 쓴다
+#     format=arrow 또는 Accept: application/vnd.apache.arrow.stream이면 Arrow IPC 스트림 (pyarrow 필요)
+# 응답은 프로세스 안 LRU에 캐시하고, ETag는 데이터 지문 + 요청(집계표/필터/top/형식)으로 정한다 (If-None-Match -> 304).
+# 필터별 행과 집계표는 koweps.slices 메모를 대시보드와 함께 쓴다.
+# 서버 없이 같은 처리를 부를 수 있다:
+#   status, headers, body = api.Api("data/welfare_2015.csv").get("/tables/sex_income?region=서울")
+import argparse
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from koweps import artifacts, core, metrics, sections, slices
+from koweps.loader import CODEBOOK_PATH
+
+CACHE_ENTRIES = 512
+JSON_TYPE = "application/json; charset=utf-8"
+ARROW_TYPE = "application/vnd.apache.arrow.stream"
+FILTERS = ("sex", "age_range", "age_group", "job", "religion", "marriage", "region")
+# 상위 N개 표: 집계표 이름 -> (frame, top) -> 표
+TOP_TABLES = {
+    "job_income": lambda frame, top: sections.job_income(frame, top),
+    "job_male": lambda frame, top: sections.job_count(frame, "male", top),
+    "job_female": lambda frame, top: sections.job_count(frame, "female", top),
+}
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def _count(table, result):
+    metrics.REGISTRY.inc("koweps_api_requests_total", "API table requests", table=table, result=result)
+
+
+def parse_filters(query):
+    # 쿼리 문자열 -> (필터, top, 형식). 잘못된 값이면 BadRequest
+    params = parse_qs(query, keep_blank_values=False)
+    unknown = set(params) - set(FILTERS) - {"top", "format"}
+    if unknown:
+        raise BadRequest("알 수 없는 매개변수: {}".format(", ".join(sorted(unknown))))
+    filters = {}
+    for name in FILTERS:
+        values = params.get(name)
+        if not values:
+            continue
+        if name == "age_range":
+            try:
+                low, high = (int(value) for value in values[0].split(","))
+            except ValueError:
+                raise BadRequest("age_range는 최소,최대 나이 (예: 30,49)")
+            filters[name] = (low, high)
+        else:
+            filters[name] = values[0] if len(values) == 1 else values
+    try:
+        top = int(params["top"][0]) if "top" in params else None
+    except ValueError:
+        raise BadRequest("top은 정수")
+    if top is not None and top < 1:
+        raise BadRequest("top은 1 이상의 정수")
+    fmt = params.get("format", [None])[0]
+    if fmt not in (None, "json", "arrow"):
+        raise BadRequest("format은 json 또는 arrow")
+    return filters, top, fmt
+
+
+def to_json(table, name, filters, fingerprint):
+    if table.index.name is not None:
+        table = table.reset_index()
+    body = {
+        "table": name,
+        "filters": dict(filters),
+        "fingerprint": fingerprint,
+        "columns": [str(column) for column in table.columns],
+        "rows": json.loads(table.to_json(orient="records", force_ascii=False)),
+    }
+    return json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+
+def to_arrow(table, name, filters, fingerprint):
+    import pyarrow as pa
+
+    # table은 세션이 함께 쓰는 캐시 항목이므로 고치지 않고 컬럼 이름만 바꾼 새 frame을 쓴다
+    if table.index.name is not None:
+        table = table.reset_index()
+    table = table.rename(columns=str)
+    arrow_table = pa.Table.from_pandas(table, preserve_index=False)
+    metadata = {
+        **(arrow_table.schema.metadata or {}),
+        "table": name,
+        "filters": json.dumps(dict(filters), ensure_ascii=False),
+        "fingerprint": fingerprint,
+    }
+    arrow_table = arrow_table.replace_schema_metadata(metadata)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, arrow_table.schema) as writer:
+        writer.write_table(arrow_table)
+    return sink.getvalue().to_pybytes()
+
+
+class Api:
+    def __init__(self, data_path, codebook_path=CODEBOOK_PATH, cache_entries=CACHE_ENTRIES):
+        self.data_path = data_path
+        self.codebook_path = codebook_path
+        self.cache_entries = cache_entries
+        self._frame = None
+        self._fingerprint = None
+        self._load_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+        # (집계표, 정규화한 필터, top, 형식) -> (ETag, Content-Type, 본문)
+        self._cache = OrderedDict()
+
+    def dataset(self):
+        # (데이터, 지문). 처음 요청할 때 한 번 읽는다 (데이터 파일을 바꾸면 다시 시작)
+        with self._load_lock:
+            if self._frame is None:
+                self._fingerprint = artifacts.source_fingerprint(self.data_path, self.codebook_path)
+                self._frame = core.load(self.data_path, self.codebook_path)
+            return self._frame, self._fingerprint
+
+    def get(self, target, headers=None):
+        # (상태 코드, 헤더, 본문). HTTP 서버와 테스트가 함께 쓴다
+        headers = {name.lower(): value for name, value in (headers or {}).items()}
+        url = urlsplit(target)
+        path = unquote(url.path).rstrip("/")
+        if path == "/tables":
+            return self._listing()
+        if not path.startswith("/tables/"):
+            return self._error(404, "없는 경로: {}".format(path))
+        name = path[len("/tables/"):]
+        if name not in sections.TABLES:
+            return self._error(404, "없는 집계표: {}".format(name))
+        try:
+            filters, top, fmt = parse_filters(url.query)
+        except BadRequest as e:
+            return self._error(400, str(e))
+        if fmt is None:
+            fmt = "arrow" if ARROW_TYPE in headers.get("accept", "") else "json"
+        if top is not None and name not in TOP_TABLES:
+            return self._error(400, "top은 {}에만 쓸 수 있습니다".format(", ".join(TOP_TABLES)))
+        return self._table(name, filters, top, fmt, headers.get("if-none-match"))
+
+    def _table(self, name, filters, top, fmt, if_none_match):
+        frame, fingerprint = self.dataset()
+        key = (name, core.normalize(filters), top, fmt)
+        etag = '"{}"'.format(hashlib.sha256(repr((fingerprint, key)).encode("utf-8")).hexdigest()[:32])
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+            _count(name, "not_modified")
+            return 304, {"ETag": etag}, b""
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+        if cached is not None:
+            _count(name, "hit")
+        else:
+            missing = [c for c in sections.TABLES[name][1] if c not in frame.columns]
+            if missing:
+                return self._error(404, "{} 변수가 없어 집계표를 만들 수 없습니다".format("/".join(missing)))
+            if top is None:
+                table = slices.table(frame, fingerprint, filters, name)
+            else:
+                label = "{}:top{}".format(name, top)
+                table = slices.table(frame, fingerprint, filters, label, lambda part: TOP_TABLES[name](part, top))
+            if fmt == "arrow":
+                try:
+                    cached = (etag, ARROW_TYPE, to_arrow(table, name, filters, fingerprint))
+                except ImportError:
+                    return self._error(406, "Arrow 형식에는 pyarrow가 필요합니다")
+            else:
+                cached = (etag, JSON_TYPE, to_json(table, name, filters, fingerprint))
+            with self._cache_lock:
+                self._cache[key] = cached
+                while len(self._cache) > self.cache_entries:
+                    self._cache.popitem(last=False)
+            _count(name, "miss")
+        etag, content_type, body = cached
+        return 200, {"Content-Type": content_type, "ETag": etag, "Cache-Control": "no-cache"}, body
+
+    def _listing(self):
+        frame, fingerprint = self.dataset()
+        tables = {
+            name: {
+                "section": n,
+                "available": all(column in frame.columns for column in required),
+                "top": name in TOP_TABLES,
+            }
+            for name, (n, required) in sections.TABLES.items()
+        }
+        body = {"fingerprint": fingerprint, "filters": FILTERS, "tables": tables}
+        return 200, {"Content-Type": JSON_TYPE}, json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+    def _error(self, status, message):
+        body = json.dumps({"error": message}, ensure_ascii=False).encode("utf-8")
+        return status, {"Content-Type": JSON_TYPE}, body
+
+
+class _ApiHandler(BaseHTTPRequestHandler):
+    api = None
+
+    def do_GET(self):
+        status, headers, body = self.api.get(self.path, dict(self.headers.items()))
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def serve(port, data_path, host="127.0.0.1", codebook_path=CODEBOOK_PATH):
+    # 프로세스당 한 번만 띄운다 (이미 떠 있으면 그대로 반환)
+    global _server
+    with _server_lock:
+        if _server is None:
+            handler = type("ApiHandler", (_ApiHandler,), {"api": Api(data_path, codebook_path)})
+            _server = ThreadingHTTPServer((host, port), handler)
+            threading.Thread(target=_server.serve_forever, name="koweps-api", daemon=True).start()
+        return _server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="섹션 집계표 HTTP API")
+    parser.add_argument("--data", default="data/welfare_2015.csv", help="원자료 또는 결과 폴더")
+    parser.add_argument("--codebook", default=CODEBOOK_PATH)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    args = parser.parse_args()
+
+    server = serve(args.port, args.data, args.host, args.codebook)
+    print("serving http://{}:{}/tables".format(args.host, args.port))
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
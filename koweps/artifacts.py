@@ -0,0 +1,167 @@
+# 미리 계산한 결과 폴더 (배치 작업에서 한 번 만들고, 서비스 프로세스는 읽기만 한다)
+# 만들기: python -m koweps.precompute
+# <out>/<원본 이름>-<버전>/
+#   manifest.json: 형식 버전, 원본/코드북 지문, 행 수, 컬럼, 집계표 목록
+#   welfare.parquet: 전처리를 마친 데이터 (코드북 결합 포함)
+#   tables/<집계표>.parquet: 섹션별 집계표 (sections.TABLES)
+#   labels.json: 숫자 코드 -> 값 사전 (성별, 종교, 혼인, 지역, 직종)
+# <out>/LATEST에 마지막으로 만든 폴더 이름을 남긴다. 대시보드 데이터 경로에 <out> 또는 버전 폴더를 넣으면 된다.
+import datetime
+import hashlib
+import json
+import os
+import shutil
+
+import pandas as pd
+
+from koweps import partitions, sections, sources
+from koweps.loader import (
+    CODEBOOK_PATH,
+    MARRIAGE_LABELS,
+    REGION_NAMES,
+    RELIGION_LABELS,
+    SEX_LABELS,
+    read_job_list,
+    read_welfare,
+)
+
+# 폴더 구성이나 집계 방식이 바뀌면 올린다 (버전에 들어가므로 예전 폴더는 다시 만든다)
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+LATEST = "LATEST"
+DATA_FILE = "welfare.parquet"
+LABELS_FILE = "labels.json"
+TABLES_DIR = "tables"
+
+
+def fingerprint(path, chunk_size=1 << 20):
+    # 파일 내용의 sha256 (없으면 None). 묶음에서 푼 코드북 같은 파일 객체도 받는다 (다 읽고 처음으로 되돌린다)
+    if hasattr(path, "read"):
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: path.read(chunk_size), b""):
+            digest.update(chunk)
+        path.seek(0)
+        return digest.hexdigest()
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return fingerprint(f, chunk_size)
+
+
+def source_fingerprint(path, codebook_path=CODEBOOK_PATH):
+    # 데이터 지문: 결과 폴더면 그 버전, 지역별로 나눈 데이터면 그 목록의 지문, 아니면 원본과 (실제로 쓰는) 코드북 내용 지문
+    if partitions.is_partitioned(path):
+        return partitions.read_manifest(path)["fingerprint"]
+    if is_artifact(path):
+        return read_manifest(path)["version"]
+    return "{}:{}".format(fingerprint(path), fingerprint(sources.codebook(path, codebook_path)))
+
+
+def resolve(path):
+    # 결과 폴더 경로 (<out>이면 LATEST가 가리키는 폴더). 결과 폴더가 아니면 None
+    path = str(path)
+    if os.path.isfile(os.path.join(path, MANIFEST)):
+        return path
+    latest = os.path.join(path, LATEST)
+    if os.path.isfile(latest):
+        with open(latest, encoding="utf-8") as f:
+            version_path = os.path.join(path, f.read().strip())
+        if os.path.isfile(os.path.join(version_path, MANIFEST)):
+            return version_path
+    return None
+
+
+def is_artifact(path):
+    return resolve(path) is not None
+
+
+def read_manifest(path):
+    with open(os.path.join(resolve(path), MANIFEST), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_data(path):
+    return pd.read_parquet(os.path.join(resolve(path), DATA_FILE))
+
+
+def read_table(path, name):
+    root = resolve(path)
+    with open(os.path.join(root, MANIFEST), encoding="utf-8") as f:
+        tables = json.load(f)["tables"]
+    if name not in tables:
+        raise KeyError("{}: 결과 폴더에 {} 집계표가 없습니다".format(root, name))
+    return pd.read_parquet(os.path.join(root, tables[name]))
+
+
+def read_labels(path):
+    with open(os.path.join(resolve(path), LABELS_FILE), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def labels(codebook_path=CODEBOOK_PATH):
+    # 변수 -> {숫자 코드: 값} (JSON 키는 문자열)
+    result = {
+        "sex": SEX_LABELS,
+        "religion": RELIGION_LABELS,
+        "marriage": MARRIAGE_LABELS,
+        "region": REGION_NAMES,
+    }
+    job_list = read_job_list(codebook_path)
+    if job_list is not None:
+        result["job"] = {int(code): job for code, job in zip(job_list["job_code"], job_list["job"])}
+    return {name: {str(code): value for code, value in values.items()} for name, values in result.items()}
+
+
+def version(source_hash, codebook_hash):
+    key = json.dumps({"format": FORMAT_VERSION, "source": source_hash, "codebook": codebook_hash})
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:12]
+
+
+def build(source_path, out_dir, codebook_path=CODEBOOK_PATH, force=False):
+    # 결과 폴더를 만들고 경로를 돌려준다. 같은 원본/코드북/형식으로 만든 폴더가 있으면 그대로 쓴다
+    source_hash = fingerprint(source_path)
+    # 실제로 쓰는 코드북 (묶음 안에 있으면 그것): 버전과 manifest에 같은 코드북을 남긴다
+    codebook = sources.codebook(source_path, codebook_path)
+    codebook_hash = fingerprint(codebook)
+    member = sources.bundled_codebook(source_path)
+    codebook_name = "{}!{}".format(source_path, member) if member else str(codebook_path)
+    stem = os.path.splitext(sources.data_name(source_path))[0]
+    name = "{}-{}".format(stem, version(source_hash, codebook_hash))
+    path = os.path.join(out_dir, name)
+    if force or not os.path.isfile(os.path.join(path, MANIFEST)):
+        # 다 만든 뒤 이름을 바꿔서 읽는 쪽이 반쯤 만든 폴더를 보지 않게 한다
+        tmp_path = "{}.{}.tmp".format(path, os.getpid())
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(os.path.join(tmp_path, TABLES_DIR))
+        welfare = read_welfare(source_path, codebook_path)
+        welfare.to_parquet(os.path.join(tmp_path, DATA_FILE), index=False)
+        tables = {}
+        for table_name, (_, required) in sections.TABLES.items():
+            if not set(required).issubset(welfare.columns):
+                continue
+            tables[table_name] = "{}/{}.parquet".format(TABLES_DIR, table_name)
+            getattr(sections, table_name)(welfare).to_parquet(os.path.join(tmp_path, tables[table_name]))
+        with open(os.path.join(tmp_path, LABELS_FILE), "w", encoding="utf-8") as f:
+            json.dump(labels(codebook), f, ensure_ascii=False, indent=2)
+        manifest = {
+            "format": FORMAT_VERSION,
+            "version": name,
+            "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "source": {"path": str(source_path), "sha256": source_hash},
+            "codebook": {"path": codebook_name, "sha256": codebook_hash},
+            "rows": len(welfare),
+            "columns": list(welfare.columns),
+            "data": DATA_FILE,
+            "labels": LABELS_FILE,
+            "tables": tables,
+        }
+        with open(os.path.join(tmp_path, MANIFEST), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+    latest_tmp = os.path.join(out_dir, "{}.{}.tmp".format(LATEST, os.getpid()))
+    with open(latest_tmp, "w", encoding="utf-8") as f:
+        f.write(name + "\n")
+    os.replace(latest_tmp, os.path.join(out_dir, LATEST))
+    return path
+
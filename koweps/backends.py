@@ -0,0 +1,258 @@
+# 섹션 집계 연산 엔진
+# pandas: 메모리에 올린 welfare 데이터프레임으로 집계 (기준 구현)
+# duckdb: CSV/Parquet 파일을 직접 질의해서 작은 결과표만 받아옴
+# polars: CSV/Parquet lazy 스캔 (koweps.polars_backend)
+# 미리 계산한 결과 폴더(koweps.artifacts)는 엔진과 관계없이 저장된 집계표를 읽기만 한다
+# 지역별로 나눈 데이터(koweps.partitions)는 엔진과 관계없이 pandas로 집계한다
+# 압축 CSV(.csv.gz/.csv.zst)는 duckdb/polars가 직접 읽고, 묶음(.zip)은 pandas로 풀면서 읽는다 (koweps.sources)
+from koweps import artifacts, partitions, sections, sources
+from koweps.loader import (
+    CODEBOOK_PATH,
+    RENAME_COLUMNS,
+    REGION_NAMES,
+    SURVEY_YEAR,
+    read_job_list,
+    read_welfare,
+)
+
+
+class Backend:
+    name = None
+
+    def load(self):
+        raise NotImplementedError
+
+    def table(self, name):
+        raise NotImplementedError
+
+    def section(self, n):
+        return {name: self.table(name) for name in sections.section_tables(n)}
+
+
+class PandasBackend(Backend):
+    name = "pandas"
+
+    def __init__(self, welfare):
+        self.welfare = welfare
+
+    @classmethod
+    def from_path(cls, path, codebook_path=CODEBOOK_PATH):
+        return cls(read_welfare(path, codebook_path))
+
+    @property
+    def columns(self):
+        return list(self.welfare.columns)
+
+    def load(self):
+        return self.welfare
+
+    def table(self, name):
+        return getattr(sections, name)(self.welfare)
+
+
+class ArtifactBackend(Backend):
+    name = "artifact"
+
+    def __init__(self, path):
+        self.path = artifacts.resolve(path)
+        self.columns = artifacts.read_manifest(self.path)["columns"]
+
+    def load(self):
+        return artifacts.read_data(self.path)
+
+    def table(self, name):
+        return artifacts.read_table(self.path, name)
+
+
+def _quote(value):
+    return "'{}'".format(str(value).replace("'", "''"))
+
+
+def _scan(path):
+    if str(path).endswith(".parquet"):
+        return "read_parquet({})".format(_quote(path))
+    return "read_csv({}, header = true)".format(_quote(path))
+
+
+class DuckDBBackend(Backend):
+    name = "duckdb"
+
+    def __init__(self, path, codebook_path=CODEBOOK_PATH, threads=None):
+        import duckdb
+
+        config = {"threads": threads} if threads else {}
+        self.con = duckdb.connect(":memory:", config=config)
+        self.path = path
+        self.columns = self._create_views(path, codebook_path)
+
+    def _create_views(self, path, codebook_path):
+        source = _scan(path)
+        types = {
+            row[0]: row[1]
+            for row in self.con.execute("DESCRIBE SELECT * FROM " + source).fetchall()
+        }
+        # 분석용 변수명 -> 파일의 실제 변수명
+        names = {}
+        for raw, name in RENAME_COLUMNS.items():
+            if raw in types:
+                names[name] = raw
+            elif name in types:
+                names[name] = name
+
+        # 1단계: 변수명 변경, 무응답 코드(9, 9999, 0) 처리
+        base = ['"{}"'.format(c) for c in types if c not in names.values()]
+        if "sex" in names:
+            sex = '"{}"'.format(names["sex"])
+            if types[names["sex"]] == "VARCHAR":
+                base.append(sex + " AS sex")
+            else:
+                base.append("CASE {} WHEN 1 THEN 'male' WHEN 2 THEN 'female' END AS sex".format(sex))
+        if "income" in names:
+            base.append('CAST(NULLIF(NULLIF("{}", 9999), 0) AS DOUBLE) AS income'.format(names["income"]))
+        if "birth_year" in names:
+            base.append('CAST(NULLIF("{}", 9999) AS DOUBLE) AS birth_year'.format(names["birth_year"]))
+        if "job_code" in names:
+            base.append('CAST(NULLIF("{}", 9999) AS DOUBLE) AS job_code'.format(names["job_code"]))
+        if "religion" in names:
+            base.append("CASE \"{}\" WHEN 1 THEN 'yes' WHEN 2 THEN 'no' END AS religion".format(names["religion"]))
+        if "marital_status" in names:
+            base.append('"{}" AS marital_status'.format(names["marital_status"]))
+        if "region_code" in names:
+            base.append('"{}" AS region_code'.format(names["region_code"]))
+        self.con.execute(
+            "CREATE VIEW welfare_base AS SELECT {} FROM {}".format(", ".join(base), source)
+        )
+
+        # 2단계: 파생 변수
+        derived = ["b.*"]
+        joins = ""
+        if "birth_year" in names:
+            age = "({} - b.birth_year + 1)".format(SURVEY_YEAR)
+            derived.append(age + " AS age")
+            derived.append(
+                "CASE WHEN {0} >= 60 THEN 'old' WHEN {0} >= 30 THEN 'middle' "
+                "WHEN {0} IS NOT NULL THEN 'young' END AS age_group".format(age)
+            )
+        if "job_code" in names:
+            job_list = read_job_list(codebook_path)
+            if job_list is not None:
+                self.con.register("job_list_df", job_list)
+                self.con.execute("CREATE TABLE job_list AS SELECT * FROM job_list_df")
+                self.con.unregister("job_list_df")
+                derived.append("j.job")
+                joins += " LEFT JOIN job_list j ON b.job_code = j.job_code"
+            else:
+                derived.append("CAST(CAST(b.job_code AS BIGINT) AS VARCHAR) AS job")
+        if "marital_status" in names:
+            derived.append(
+                "CASE b.marital_status WHEN 1 THEN 'marriage' WHEN 3 THEN 'divorce' END AS marriage"
+            )
+        if "region_code" in names:
+            cases = " ".join(
+                "WHEN {} THEN {}".format(code, _quote(region)) for code, region in REGION_NAMES.items()
+            )
+            derived.append("CASE b.region_code {} END AS region".format(cases))
+        self.con.execute(
+            "CREATE VIEW welfare AS SELECT {} FROM welfare_base b{}".format(", ".join(derived), joins)
+        )
+        return [row[0] for row in self.con.execute("DESCRIBE welfare").fetchall()]
+
+    def load(self):
+        return self.query("SELECT * FROM welfare")
+
+    def query(self, sql):
+        # cursor()는 같은 DB를 보는 새 연결 (세션 간 동시 사용 가능)
+        return self.con.cursor().execute(sql).df()
+
+    def _mean_income(self, by):
+        keys = ", ".join(by)
+        where = " AND ".join("{} IS NOT NULL".format(c) for c in by + ["income"])
+        return self.query(
+            "SELECT {0}, AVG(income) AS mean_income FROM welfare WHERE {1} "
+            "GROUP BY {0} ORDER BY {0}".format(keys, where)
+        )
+
+    def _share(self, by, value, where=""):
+        # by 그룹 안에서 value의 비율 (value_counts(normalize=True)와 같음)
+        keys = ", ".join(by)
+        cond = " AND ".join("{} IS NOT NULL".format(c) for c in by + [value])
+        return self.query(
+            "SELECT {0}, {1}, CAST(COUNT(*) AS DOUBLE) / SUM(COUNT(*)) OVER (PARTITION BY {0}) "
+            "AS proportion FROM welfare WHERE {2}{3} GROUP BY {0}, {1} "
+            "ORDER BY {0}, proportion DESC".format(keys, value, cond, where)
+        )
+
+    def sex_income(self):
+        return self._mean_income(["sex"])
+
+    def age_income(self):
+        return self._mean_income(["age"])
+
+    def age_group_income(self):
+        return self._mean_income(["age_group"])
+
+    def age_group_sex_income(self):
+        return self._mean_income(["age_group", "sex"])
+
+    def job_income(self, top=10):
+        return self.query(
+            "SELECT job, AVG(income) AS mean_income FROM welfare "
+            "WHERE job IS NOT NULL AND income IS NOT NULL "
+            "GROUP BY job ORDER BY mean_income DESC, job LIMIT {}".format(top)
+        )
+
+    def job_count(self, sex, top=10):
+        return self.query(
+            "SELECT job, COUNT(job) AS n FROM welfare "
+            "WHERE sex = {} AND job IS NOT NULL "
+            "GROUP BY job ORDER BY n DESC, job LIMIT {}".format(_quote(sex), top)
+        )
+
+    def job_male(self):
+        return self.job_count("male")
+
+    def job_female(self):
+        return self.job_count("female")
+
+    def religion_divorce(self):
+        return sections.divorce_rate(self._share(["religion"], "marriage"))
+
+    def age_group_divorce(self):
+        counts = self._share(["age_group"], "marriage", " AND religion IS NOT NULL")
+        return sections.divorce_rate(counts[counts["age_group"] != "young"])
+
+    def age_group_religion_divorce(self):
+        return sections.divorce_rate(
+            self._share(["age_group", "religion"], "marriage", " AND age_group <> 'young'")
+        )
+
+    def region_age_group(self):
+        return sections.age_group_share(self._share(["region"], "age_group"))
+
+    def table(self, name):
+        return getattr(self, name)()
+
+
+def _polars_backend(path, codebook_path=CODEBOOK_PATH):
+    from koweps.polars_backend import PolarsBackend
+
+    return PolarsBackend(path, codebook_path)
+
+
+BACKENDS = {
+    PandasBackend.name: PandasBackend.from_path,
+    DuckDBBackend.name: DuckDBBackend,
+    "polars": _polars_backend,
+}
+
+
+def open_backend(name, path, codebook_path=CODEBOOK_PATH):
+    if artifacts.is_artifact(path):
+        return ArtifactBackend(path)
+    # 지역별로 나눈 데이터는 전처리를 마친 행이므로 메모리에 올려 pandas로 집계한다
+    if partitions.is_partitioned(path):
+        return PandasBackend(partitions.load(path))
+    if sources.is_archive(path) or (sources.is_packed(path) and not sources.data_name(path).endswith(".csv")):
+        return PandasBackend.from_path(path, codebook_path)
+    return BACKENDS[name](path, codebook_path)
+
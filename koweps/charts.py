@@ -0,0 +1,156 @@
+# 섹션별 그래프 (seaborn/matplotlib)
+# 각 함수는 집계표를 받아 Figure를 만든다. pyplot 전역 상태 대신 ax에 직접 그려
+# 여러 세션이 동시에 그려도 서로 섞이지 않는다.
+import io
+
+import matplotlib.pyplot as plt
+import numpy as np
+import seaborn as sns
+
+from koweps.sections import AGE_GROUP_ORDER
+
+# st.pyplot과 같은 저장 옵션
+SAVEFIG_OPTIONS = {"format": "png", "bbox_inches": "tight", "dpi": 200}
+
+
+def _labels(ax, title, xlabel, ylabel):
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+
+
+def sex_income_bar(sex_income):
+    fig, ax = plt.subplots()
+    sns.barplot(x="sex", y="mean_income", data=sex_income, ax=ax)
+    _labels(ax, "성별에 따른 평균 월급 막대 그래프", "성별", "평균 월급")
+    for i, j in enumerate(sex_income["mean_income"]):
+        ax.annotate(
+            round(j),
+            (i, j),
+            xytext=(0, 2),
+            textcoords="offset points",
+            fontsize=8,
+            ha="center",
+            color="black",
+        )
+    return fig
+
+
+def age_income_line(age_income):
+    fig, ax = plt.subplots()
+    sns.lineplot(x="age", y="mean_income", data=age_income, ax=ax)
+    _labels(ax, "나이에 따른 평균 월급 선 그래프", "나이", "평균 월급")
+    return fig
+
+
+def age_group_income_bar(age_group_income):
+    fig, ax = plt.subplots()
+    sns.barplot(x="age_group", y="mean_income", data=age_group_income, ax=ax, order=AGE_GROUP_ORDER)
+    _labels(ax, "연령대에 따른 평균 월급 막대 그래프", "연령대", "평균 월급")
+    return fig
+
+
+def age_group_sex_income_bar(age_group_sex_income):
+    fig, ax = plt.subplots()
+    sns.barplot(
+        x="age_group",
+        y="mean_income",
+        hue="sex",
+        data=age_group_sex_income,
+        order=AGE_GROUP_ORDER,
+        ax=ax,
+    )
+    _labels(ax, "연령대 및 성별에 따른 평균 월급 막대 그래프", "연령대 및 성별", "평균 월급")
+    return fig
+
+
+def job_income_bar(top10):
+    fig, ax = plt.subplots()
+    sns.barplot(y="job", x="mean_income", data=top10, ax=ax)
+    _labels(ax, "직업에 따른 상위 10개 평균 월급 막대 그래프", "직업", "평균 월급")
+    return fig
+
+
+def job_count_bar(job_count, title):
+    fig, ax = plt.subplots()
+    sns.barplot(y="job", x="n", data=job_count, ax=ax)
+    _labels(ax, title, "빈도", "직업")
+    return fig
+
+
+def divorce_bar(divorce, x, title, xlabel, hue=None):
+    fig, ax = plt.subplots()
+    sns.barplot(x=x, y="proportion", hue=hue, data=divorce, ax=ax)
+    _labels(ax, title, xlabel, "이혼율")
+    return fig
+
+
+def region_age_group_barh(pivot_region_age_group):
+    fig, ax = plt.subplots()
+    pivot_region_age_group.sort_values("old")[AGE_GROUP_ORDER].plot.barh(stacked=True, ax=ax)
+    ax.legend(bbox_to_anchor=(1.0, 1.0))
+    _labels(ax, "지역별 연령대 비율 그래프", "연령대 비율", "지역")
+    return fig
+
+
+def _edges(starts):
+    # 구간 시작값 -> 경계 (등간격)
+    starts = np.asarray(starts, dtype="float64")
+    step = starts[1] - starts[0] if len(starts) > 1 else 1.0
+    return np.append(starts, starts[-1] + step)
+
+
+def income_histogram_step(histogram, segment, segment_label):
+    fig, ax = plt.subplots()
+    for label, part in histogram.groupby(segment, sort=True):
+        ax.stairs(part["n"], _edges(part["income_from"]), label=label)
+    ax.legend()
+    _labels(ax, "{}별 월급 분포".format(segment_label), "월급 (마지막 구간은 그 이상 포함)", "빈도")
+    return fig
+
+
+def age_income_heatmap(grid):
+    fig, ax = plt.subplots()
+    mesh = ax.pcolormesh(_edges(grid.columns), _edges(grid.index), grid.to_numpy(), cmap="viridis")
+    fig.colorbar(mesh, ax=ax, label="빈도")
+    _labels(ax, "나이와 월급의 분포", "나이", "월급")
+    return fig
+
+
+# 그래프 이름 -> (그리는 함수, 필요한 집계표)
+FIGURES = {
+    "fig1": (sex_income_bar, "sex_income"),
+    "fig2": (age_income_line, "age_income"),
+    "fig3": (age_group_income_bar, "age_group_income"),
+    "fig4": (age_group_sex_income_bar, "age_group_sex_income"),
+    "fig5": (job_income_bar, "job_income"),
+    "fig61": (lambda t: job_count_bar(t, "남성 직업 빈도 막대 그래프"), "job_male"),
+    "fig62": (lambda t: job_count_bar(t, "여성 직업 빈도 막대 그래프"), "job_female"),
+    "fig71": (
+        lambda t: divorce_bar(t, "religion", "종교에 따른 이혼율 막대 그래프", "종교"),
+        "religion_divorce",
+    ),
+    "fig72": (
+        lambda t: divorce_bar(t, "age_group", "연령대에 따른 이혼율 막대 그래프", "연령대"),
+        "age_group_divorce",
+    ),
+    "fig73": (
+        lambda t: divorce_bar(
+            t, "age_group", "연령대 및 종교 유무에 따른 이혼율 막대 그래프", "연령대 및 종교 유무", hue="religion"
+        ),
+        "age_group_religion_divorce",
+    ),
+    "fig8": (region_age_group_barh, "region_age_group"),
+}
+
+
+def build(name, table):
+    draw, _ = FIGURES[name]
+    return draw(table)
+
+
+def to_png(fig):
+    image = io.BytesIO()
+    fig.savefig(image, **SAVEFIG_OPTIONS)
+    plt.close(fig)
+    return image.getvalue()
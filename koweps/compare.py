@@ -0,0 +1,55 @@
+# 연산 엔진별 집계표 일치 확인
+# python -m koweps.compare [data/welfare_2015.csv]
+import sys
+
+import pandas as pd
+
+from koweps import sections
+from koweps.backends import BACKENDS, open_backend
+from koweps.loader import CODEBOOK_PATH
+
+
+def _normalize(table):
+    # 인덱스/자료형 차이는 무시하고 내용만 비교
+    if table.index.name is not None:
+        table = table.reset_index()
+    table = table.reset_index(drop=True)
+    table.columns = [str(c) for c in table.columns]
+    return table.astype({c: object for c in table.columns if not pd.api.types.is_numeric_dtype(table[c])})
+
+
+def compare(path, codebook_path=CODEBOOK_PATH, engines=None):
+    # 기준(pandas) 엔진과 섹션별 집계표가 같은지 확인
+    reference = open_backend("pandas", path, codebook_path)
+    others = [open_backend(name, path, codebook_path) for name in engines or BACKENDS if name != "pandas"]
+    failures = []
+    expected = _normalize(reference.load())
+    for backend in others:
+        try:
+            loaded = _normalize(backend.load())
+            pd.testing.assert_frame_equal(
+                expected.sort_values(list(expected.columns)).reset_index(drop=True),
+                loaded[expected.columns].sort_values(list(expected.columns)).reset_index(drop=True),
+                check_dtype=False,
+            )
+        except (AssertionError, KeyError) as e:
+            failures.append((backend.name, "load", str(e)))
+    for name in sections.TABLES:
+        expected = _normalize(reference.table(name))
+        for backend in others:
+            try:
+                pd.testing.assert_frame_equal(
+                    expected, _normalize(backend.table(name)), check_dtype=False, rtol=1e-9
+                )
+            except AssertionError as e:
+                failures.append((backend.name, name, str(e)))
+    return failures
+
+
+if __name__ == "__main__":
+    data_path = sys.argv[1] if len(sys.argv) > 1 else "data/welfare_2015.csv"
+    failures = compare(data_path)
+    for engine, name, message in failures:
+        print("[{}] {} 불일치\n{}".format(engine, name, message))
+    print("{}개 집계표(+load) 중 {}개 불일치".format(len(sections.TABLES), len(failures)))
+    sys.exit(1 if failures else 0)
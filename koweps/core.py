@@ -0,0 +1,157 @@
+# 로드/필터/섹션 집계 API (Streamlit, 그리기 라이브러리 없이 쓰는 기준 경로)
+# 배치 작업, 벤치마크, 다른 화면이 app.py 없이 같은 표를 만든다.
+#   frame = core.load("data/welfare_2015.csv")
+#   tables = core.section_1(frame, {"sex": "female", "age_range": (30, 49)})
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from koweps import artifacts, distribution, partitions, sections
+from koweps.loader import CODEBOOK_PATH, read_welfare
+
+# 필터: 변수 -> 값. "All"/None이면 적용하지 않는다
+#   sex, religion, marriage: 값 하나 또는 목록
+#   age_group, job, region: 목록
+#   age_range: (최소, 최대) 나이 (양 끝 포함)
+Filters = Mapping[str, Any]
+# 집계표 이름 -> 표
+Tables = Dict[str, pd.DataFrame]
+
+
+def load(
+    path: str, codebook_path: str = CODEBOOK_PATH, regions: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    # 미리 계산한 결과 폴더(koweps.artifacts)면 전처리를 마친 데이터를 그대로 읽는다.
+    # regions: 이 지역의 행만 (지역별로 나눈 데이터(koweps.partitions)면 그 조각 파일만 읽는다)
+    if partitions.is_partitioned(path):
+        return partitions.load(path, regions)
+    if artifacts.is_artifact(path):
+        frame = artifacts.read_data(path)
+    else:
+        frame = read_welfare(path, codebook_path)
+    if regions is not None:
+        # 지역별로 나눈 데이터와 같이 없는 지역 이름은 ValueError
+        partitions.check_regions(path, regions, frame["region"].dropna().unique().tolist())
+        frame = frame[frame["region"].isin(list(regions))].reset_index(drop=True)
+    return frame
+
+
+def _sorted_tuple(value: Any) -> Any:
+    return tuple(sorted(value)) if isinstance(value, (list, tuple)) else value
+
+
+def normalize(filters: Filters) -> Tuple[Tuple[str, Any], ...]:
+    # 필터 dict -> 캐시 키로 쓸 수 있는 정렬된 튜플 (선택 순서가 달라도 같은 키)
+    return tuple(
+        (name, _sorted_tuple(value) if name != "age_range" else value and tuple(value))
+        for name, value in sorted(filters.items())
+    )
+
+
+def _inactive(value: Any) -> bool:
+    if isinstance(value, (list, tuple)):
+        return not value or "All" in value
+    return value is None or value == "All"
+
+
+def canonical(filters: Filters) -> Tuple[Tuple[str, Any], ...]:
+    # normalize에서 적용하지 않는 필터("All", None, 빈 목록, "All"이 든 목록)를 뺀 키
+    # (필터를 하나도 안 고른 상태와 변수마다 "All"을 고른 상태가 같은 키)
+    return normalize({name: value for name, value in dict(filters).items() if not _inactive(value)})
+
+
+def filter_mask(frame: pd.DataFrame, filters: Filters) -> np.ndarray:
+    # 사이드바 필터와 같은 조건
+    filters = dict(filters)
+    ranges = partitions.region_ranges(frame, filters.get("region"))
+    if ranges is None:
+        return _filter_mask(frame, filters)
+    # 지역별로 읽은 데이터: 고른 지역의 행 범위에서만 나머지 조건을 본다
+    rest = {name: value for name, value in filters.items() if name != "region"}
+    mask = np.zeros(len(frame), dtype=bool)
+    for start, stop in ranges:
+        mask[start:stop] = _filter_mask(frame.iloc[start:stop], rest)
+    return mask
+
+
+def _filter_mask(frame: pd.DataFrame, filters: Filters) -> np.ndarray:
+    mask = np.ones(len(frame), dtype=bool)
+    for name, value in filters.items():
+        if value is None or value == "All":
+            continue
+        if name == "age_range":
+            age = frame["age"].to_numpy(dtype="float64", na_value=np.nan)
+            mask &= (age >= value[0]) & (age <= value[1])
+        elif name not in frame.columns:
+            continue
+        elif isinstance(value, (list, tuple)):
+            mask &= frame[name].isin(list(value)).to_numpy()
+        else:
+            mask &= (frame[name] == value).to_numpy()
+    return mask
+
+
+def filter_frame(frame: pd.DataFrame, filters: Optional[Filters] = None) -> pd.DataFrame:
+    if not filters:
+        return frame
+    return frame[filter_mask(frame, filters)]
+
+
+# 섹션 번호 (1~8 집계표, 9 월급 분포)
+SECTIONS = tuple(range(1, 10))
+
+
+def section(n: int, frame: pd.DataFrame, filters: Optional[Filters] = None) -> Tables:
+    # 1~8번 섹션 집계표 (필터를 적용한 행으로), 9번은 section_9 (성별 구분). 없는 번호는 ValueError
+    if n not in SECTIONS:
+        raise ValueError("없는 섹션 번호: {} (1~9)".format(n))
+    if n == 9:
+        return section_9(frame, filters)
+    frame = filter_frame(frame, filters)
+    return {name: getattr(sections, name)(frame) for name in sections.section_tables(n)}
+
+
+def section_1(frame: pd.DataFrame, filters: Optional[Filters] = None) -> Tables:
+    return section(1, frame, filters)
+
+
+def section_2(frame: pd.DataFrame, filters: Optional[Filters] = None) -> Tables:
+    return section(2, frame, filters)
+
+
+def section_3(frame: pd.DataFrame, filters: Optional[Filters] = None) -> Tables:
+    return section(3, frame, filters)
+
+
+def section_4(frame: pd.DataFrame, filters: Optional[Filters] = None) -> Tables:
+    return section(4, frame, filters)
+
+
+def section_5(frame: pd.DataFrame, filters: Optional[Filters] = None) -> Tables:
+    return section(5, frame, filters)
+
+
+def section_6(frame: pd.DataFrame, filters: Optional[Filters] = None) -> Tables:
+    return section(6, frame, filters)
+
+
+def section_7(frame: pd.DataFrame, filters: Optional[Filters] = None) -> Tables:
+    return section(7, frame, filters)
+
+
+def section_8(frame: pd.DataFrame, filters: Optional[Filters] = None) -> Tables:
+    return section(8, frame, filters)
+
+
+def section_9(frame: pd.DataFrame, filters: Optional[Filters] = None, segment: str = "sex") -> Tables:
+    # 월급 분포: 구간 경계는 필터와 무관하게 전체 행 기준
+    incomes = distribution.income_edges(frame["income"])
+    ages = distribution.age_edges(frame["age"])
+    mask = filter_mask(frame, filters) if filters else None
+    return {
+        "income_hist": distribution.income_histogram(frame, segment, incomes, mask),
+        "age_income": distribution.age_income_grid(frame, ages, incomes, mask),
+    }
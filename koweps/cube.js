@@ -0,0 +1,212 @@
+// 집계 큐브 필터/재집계 (koweps/sections.py와 같은 표를 만든다)
+// 큐브의 한 칸 = (sex, job, religion, marriage, region, age) 조합별 행 수 n, 월급 응답 수 income_n, 월급 합계 income_sum
+var KowepsCube = (function () {
+  var AGE_GROUP_ORDER = ["young", "middle", "old"];
+
+  function ageGroup(age) {
+    if (age < 0) return -1;
+    return age >= 60 ? 2 : age >= 30 ? 1 : 0;
+  }
+
+  function create(cube) {
+    var c = cube.columns;
+    var size = c.n.length;
+    var ageGroups = new Int8Array(size);
+    for (var i = 0; i < size; i++) ageGroups[i] = ageGroup(c.age[i]);
+    return { cube: cube, labels: cube.labels, c: c, ageGroups: ageGroups, size: size };
+  }
+
+  function codeSet(labels, selected) {
+    if (!selected || !selected.length) return null;
+    var set = {};
+    selected.forEach(function (label) {
+      var code = labels.indexOf(label);
+      if (code >= 0) set[code] = true;
+    });
+    return set;
+  }
+
+  // filters: {sex, ageRange: [min, max] | null, ageGroup, job, religion, marriage, region}
+  // 문자열 하나 또는 목록, 비어 있으면 전체
+  function mask(model, filters) {
+    var c = model.c;
+    var sets = {};
+    // 데이터에 없는 변수의 필터는 적용하지 않는다 (core.filter_mask와 같게)
+    var missing = model.cube.missing || [];
+    ["sex", "job", "religion", "marriage", "region"].forEach(function (name) {
+      if (missing.indexOf(name) >= 0) return;
+      var value = filters[name];
+      sets[name] = codeSet(model.labels[name], typeof value === "string" ? [value] : value);
+    });
+    var groups = codeSet(AGE_GROUP_ORDER, filters.ageGroup);
+    var range = filters.ageRange;
+    var keep = new Uint8Array(model.size);
+    for (var i = 0; i < model.size; i++) {
+      var ok = true;
+      for (var name in sets) {
+        if (sets[name] && !sets[name][c[name][i]]) ok = false;
+      }
+      if (groups && !groups[model.ageGroups[i]]) ok = false;
+      if (range && (c.age[i] < 0 || c.age[i] < range[0] || c.age[i] > range[1])) ok = false;
+      keep[i] = ok ? 1 : 0;
+    }
+    return keep;
+  }
+
+  function keyOf(model, name, i) {
+    return name === "age_group" ? model.ageGroups[i] : name === "age" ? model.c.age[i] : model.c[name][i];
+  }
+
+  function labelOf(model, name, code) {
+    if (name === "age_group") return AGE_GROUP_ORDER[code];
+    if (name === "age") return code;
+    return model.labels[name][code];
+  }
+
+  // by 변수 조합별 합계 (by 중 결측이 있는 칸은 제외). 결과는 라벨 오름차순 (pandas groupby와 같은 순서)
+  function groupSum(model, keep, by, measures) {
+    var groups = {};
+    for (var i = 0; i < model.size; i++) {
+      if (!keep[i]) continue;
+      var codes = [];
+      var missing = false;
+      for (var j = 0; j < by.length; j++) {
+        var code = keyOf(model, by[j], i);
+        if (code < 0) missing = true;
+        codes.push(code);
+      }
+      if (missing) continue;
+      var key = codes.join(",");
+      var group = groups[key];
+      if (!group) {
+        group = groups[key] = { codes: codes, sums: measures.map(function () { return 0; }) };
+      }
+      for (var m = 0; m < measures.length; m++) group.sums[m] += measures[m](i);
+    }
+    var rows = Object.keys(groups).map(function (key) {
+      var group = groups[key];
+      var row = { sums: group.sums };
+      by.forEach(function (name, j) { row[name] = labelOf(model, name, group.codes[j]); });
+      return row;
+    });
+    rows.sort(function (a, b) {
+      for (var j = 0; j < by.length; j++) {
+        var x = a[by[j]];
+        var y = b[by[j]];
+        if (x < y) return -1;
+        if (x > y) return 1;
+      }
+      return 0;
+    });
+    return rows;
+  }
+
+  function meanIncome(model, keep, by) {
+    var c = model.c;
+    return groupSum(model, keep, by, [
+      function (i) { return c.income_n[i]; },
+      function (i) { return c.income_sum[i]; },
+    ])
+      .filter(function (row) { return row.sums[0] > 0; })
+      .map(function (row) {
+        var out = {};
+        by.forEach(function (name) { out[name] = row[name]; });
+        out.mean_income = row.sums[1] / row.sums[0];
+        return out;
+      });
+  }
+
+  function top(rows, column, count) {
+    // 내림차순 안정 정렬 후 상위 count개
+    return rows
+      .map(function (row, i) { return [row, i]; })
+      .sort(function (a, b) { return b[0][column] - a[0][column] || a[1] - b[1]; })
+      .slice(0, count)
+      .map(function (pair) { return pair[0]; });
+  }
+
+  // pandas/numpy round(2)와 같게: 100을 곱해 가장 가까운 정수, 딱 중간이면 짝수 쪽 (0.625 -> 0.62)
+  function rint(x) {
+    var r = Math.round(x);
+    return r - x === 0.5 && r % 2 !== 0 ? r - 1 : r;
+  }
+
+  function round2(value) {
+    return rint(value * 100) / 100;
+  }
+
+  // by별 이혼 비율(%) (혼인 변수가 있는 행 중 divorce). 이혼이 없는 그룹은 빠진다
+  function divorceRate(model, keep, by) {
+    var c = model.c;
+    var divorce = model.labels.marriage.indexOf("divorce");
+    var sub = new Uint8Array(model.size);
+    for (var i = 0; i < model.size; i++) sub[i] = keep[i] && c.marriage[i] >= 0 && c.religion[i] >= 0 ? 1 : 0;
+    return groupSum(model, sub, by, [
+      function (i) { return c.n[i]; },
+      function (i) { return c.marriage[i] === divorce ? c.n[i] : 0; },
+    ])
+      .filter(function (row) { return row.sums[1] > 0; })
+      .map(function (row) {
+        var out = {};
+        by.forEach(function (name) { out[name] = row[name]; });
+        out.marriage = "divorce";
+        out.proportion = round2((row.sums[1] / row.sums[0]) * 100);
+        return out;
+      });
+  }
+
+  function notYoung(model, keep) {
+    var out = new Uint8Array(model.size);
+    for (var i = 0; i < model.size; i++) out[i] = keep[i] && model.ageGroups[i] !== 0 ? 1 : 0;
+    return out;
+  }
+
+  function jobCount(model, keep, sex) {
+    var c = model.c;
+    var code = model.labels.sex.indexOf(sex);
+    var sub = new Uint8Array(model.size);
+    for (var i = 0; i < model.size; i++) sub[i] = keep[i] && c.sex[i] === code ? 1 : 0;
+    var rows = groupSum(model, sub, ["job"], [function (i) { return c.n[i]; }]).map(function (row) {
+      return { job: row.job, n: row.sums[0] };
+    });
+    return top(rows, "n", 10);
+  }
+
+  function regionAgeGroup(model, keep) {
+    var c = model.c;
+    var rows = groupSum(model, keep, ["region", "age_group"], [function (i) { return c.n[i]; }]);
+    var totals = {};
+    rows.forEach(function (row) { totals[row.region] = (totals[row.region] || 0) + row.sums[0]; });
+    var pivot = {};
+    rows.forEach(function (row) {
+      var entry = pivot[row.region] || (pivot[row.region] = { region: row.region, young: null, middle: null, old: null });
+      entry[row.age_group] = round2((row.sums[0] / totals[row.region]) * 100);
+    });
+    return Object.keys(pivot).sort().map(function (region) { return pivot[region]; });
+  }
+
+  // 집계표 이름 -> 표 (행 객체 목록). 필요한 변수가 없는 집계표(cube.unavailable)는 null
+  function tables(model, filters) {
+    var keep = mask(model, filters || {});
+    var adults = notYoung(model, keep);
+    var result = {
+      sex_income: meanIncome(model, keep, ["sex"]),
+      age_income: meanIncome(model, keep, ["age"]),
+      age_group_income: meanIncome(model, keep, ["age_group"]),
+      age_group_sex_income: meanIncome(model, keep, ["age_group", "sex"]),
+      job_income: top(meanIncome(model, keep, ["job"]), "mean_income", 10),
+      job_male: jobCount(model, keep, "male"),
+      job_female: jobCount(model, keep, "female"),
+      religion_divorce: divorceRate(model, keep, ["religion"]),
+      age_group_divorce: divorceRate(model, adults, ["age_group"]),
+      age_group_religion_divorce: divorceRate(model, adults, ["age_group", "religion"]),
+      region_age_group: regionAgeGroup(model, keep),
+    };
+    Object.keys(model.cube.unavailable || {}).forEach(function (name) { result[name] = null; });
+    return result;
+  }
+
+  return { AGE_GROUP_ORDER: AGE_GROUP_ORDER, create: create, mask: mask, tables: tables, round2: round2 };
+})();
+
+if (typeof module !== "undefined") module.exports = KowepsCube;
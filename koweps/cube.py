@@ -0,0 +1,80 @@
+# 브라우저 필터용 집계 큐브
+# welfare를 필터/집계에 쓰는 변수 조합별로 미리 묶어(행 수, 월급 응답 수, 월급 합계) 브라우저로 한 번만 보낸다.
+# 필터 변경과 섹션별 재집계는 브라우저(cube.js)에서 하므로 필터를 바꿔도 서버는 다시 실행하지 않는다.
+import json
+import os
+
+import numpy as np
+from plotly.offline import get_plotlyjs_version
+
+from koweps import sections
+
+# 문자열 변수는 (코드 배열, 라벨 목록)으로 보낸다. 결측 코드 = -1
+DIMENSIONS = ["sex", "job", "religion", "marriage", "region"]
+# 브라우저에서 plotly.js를 받을 주소 (설치된 plotly 파이썬 패키지와 같은 버전)
+PLOTLYJS_URL = "https://cdn.plot.ly/plotly-{}.min.js".format(get_plotlyjs_version())
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def unavailable(columns):
+    # 필요한 변수가 없어 만들 수 없는 집계표 -> 없는 변수 (연령대는 큐브의 나이로 브라우저에서 나눈다)
+    present = set(columns) | ({"age_group"} if "age" in columns else set())
+    result = {}
+    for name, (_, required) in sections.TABLES.items():
+        absent = [column for column in required if column not in present]
+        if absent:
+            result[name] = absent
+    return result
+
+
+def build(welfare):
+    # 없는 변수는 모두 결측(-1, 라벨 없음)인 칸으로 두고, 만들 수 없는 집계표를 unavailable로 알려 준다
+    missing = [name for name in DIMENSIONS + ["age", "income"] if name not in welfare.columns]
+    frame = welfare[[name for name in DIMENSIONS + ["age", "income"] if name not in missing]].copy()
+    columns = {}
+    labels = {}
+    for name in DIMENSIONS:
+        if name in missing:
+            labels[name] = []
+            frame[name] = np.int32(-1)
+            continue
+        values = frame[name]
+        labels[name] = sorted(values.dropna().unique().tolist())
+        codes = {label: i for i, label in enumerate(labels[name])}
+        frame[name] = values.map(codes).fillna(-1).astype("int32")
+    frame["age"] = frame["age"].fillna(-1).astype("int32") if "age" not in missing else np.int32(-1)
+    if "income" in missing:
+        frame["income"] = 0.0
+    frame["income_n"] = frame["income"].notna().astype("int64") if "income" not in missing else 0
+    cells = (
+        frame.groupby(DIMENSIONS + ["age"], sort=True)
+        .agg(n=("income_n", "size"), income_n=("income_n", "sum"), income_sum=("income", "sum"))
+        .reset_index()
+    )
+    for name in DIMENSIONS + ["age", "n", "income_n"]:
+        columns[name] = cells[name].to_numpy(dtype="int64").tolist()
+    columns["income_sum"] = np.round(cells["income_sum"].to_numpy(), 6).tolist()
+    return {
+        "rows": int(len(welfare)),
+        "labels": labels,
+        "columns": columns,
+        "missing": missing,
+        "unavailable": unavailable(welfare.columns),
+    }
+
+
+def _read(name):
+    with open(os.path.join(_HERE, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def to_html(cube):
+    # 큐브 + 집계 스크립트 + 화면을 한 HTML로 (st.iframe으로 표시)
+    payload = json.dumps(cube, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+    return (
+        _read("cube_view.html")
+        .replace("__PLOTLYJS_URL__", PLOTLYJS_URL)
+        .replace("__CUBE_JS__", _read("cube.js"))
+        .replace("__CUBE__", payload)
+    )
@@ -0,0 +1,84 @@
+# 브라우저 집계(cube.js)와 pandas 집계표(sections) 일치 확인 (node 필요)
+# python -m koweps.cube_compare [data/welfare_2015.csv]
+# 같은 큐브를 node에서 cube.js로 집계하고, 필터 조합마다 pandas로 만든 집계표와 비교한다.
+import json
+import os
+import subprocess
+import sys
+
+import pandas as pd
+
+from koweps import core, cube, sections
+from koweps.compare import _normalize
+
+# 비교할 필터 조합 (core 필터 이름)
+FILTERS = [
+    {},
+    {"sex": "female"},
+    {"age_range": (30, 49)},
+    {"age_group": ["middle", "old"], "region": ["서울", "대구/경북"]},
+    {"religion": "yes", "marriage": "divorce"},
+]
+# core 필터 이름 -> cube.js 필터 이름
+JS_NAMES = {"age_range": "ageRange", "age_group": "ageGroup"}
+# 표준 입력의 {"cube", "filters"}를 받아 필터 조합별 집계표 목록을 출력한다
+NODE_SCRIPT = """
+const cube = require(process.argv[1]);
+let input = "";
+process.stdin.on("data", (chunk) => (input += chunk));
+process.stdin.on("end", () => {
+  const request = JSON.parse(input);
+  const model = cube.create(request.cube);
+  process.stdout.write(JSON.stringify(request.filters.map((filters) => cube.tables(model, filters))));
+});
+"""
+
+
+def js_tables(cube_data, filters_list):
+    # 필터 조합별 cube.js 집계표 (집계표 이름 -> 행 객체 목록)
+    js_filters = [{JS_NAMES.get(name, name): value for name, value in filters.items()} for filters in filters_list]
+    request = {"cube": cube_data, "filters": js_filters}
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cube.js")
+    result = subprocess.run(
+        ["node", "-e", NODE_SCRIPT, script],
+        input=json.dumps(request, ensure_ascii=False),
+        capture_output=True,
+        check=True,
+        encoding="utf-8",
+    )
+    return json.loads(result.stdout)
+
+
+def _frame(rows, expected):
+    # cube.js 행 목록 -> pandas 집계표와 같은 모양
+    if expected.index.name is not None:
+        frame = pd.DataFrame(rows, columns=[expected.index.name] + list(expected.columns))
+        return frame.set_index(expected.index.name).astype(float)
+    return pd.DataFrame(rows, columns=list(expected.columns))
+
+
+def compare(frame, filters_list=FILTERS):
+    # [(필터, 집계표, 메시지)] 불일치 목록
+    failures = []
+    results = js_tables(cube.build(frame), filters_list)
+    for filters, tables in zip(filters_list, results):
+        filtered = core.filter_frame(frame, filters)
+        for name, (_, required) in sections.TABLES.items():
+            if not set(required).issubset(frame.columns):
+                continue
+            expected = getattr(sections, name)(filtered)
+            try:
+                actual = _normalize(_frame(tables[name], expected))
+                pd.testing.assert_frame_equal(_normalize(expected), actual, check_dtype=False, rtol=1e-9)
+            except AssertionError as e:
+                failures.append((filters, name, str(e)))
+    return failures
+
+
+if __name__ == "__main__":
+    data_path = sys.argv[1] if len(sys.argv) > 1 else "data/welfare_2015.csv"
+    failures = compare(core.load(data_path))
+    for filters, name, message in failures:
+        print("{} {} 불일치\n{}".format(json.dumps(filters, ensure_ascii=False), name, message))
+    print("필터 {}개 x 집계표 {}개 중 {}개 불일치".format(len(FILTERS), len(sections.TABLES), len(failures)))
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,76 @@
+# 월급 분포 (구간별 빈도)
+# 원자료 점을 그리지 않고 서버에서 1차원(구분별 월급)/2차원(나이 x 월급) 구간 빈도만 계산한다.
+# 구간 경계는 전체 데이터 기준으로 한 번 정하므로 결과 표 크기는 행 수나 필터와 무관하다.
+import numpy as np
+import pandas as pd
+
+INCOME_BINS = 40
+# 이 분위수보다 큰 월급은 마지막 구간에 모은다 (소수의 고소득 때문에 구간이 넓어지지 않도록)
+INCOME_QUANTILE = 0.995
+AGE_BIN_WIDTH = 5
+
+# 히스토그램 구분 변수 -> 화면 이름
+SEGMENTS = {"sex": "성별", "age_group": "연령대", "religion": "종교", "region": "지역"}
+
+
+def income_edges(income, bins=INCOME_BINS):
+    income = income.dropna()
+    upper = float(np.quantile(income, INCOME_QUANTILE)) if len(income) else 1.0
+    # 읽기 쉬운 경계가 되도록 10만원 단위로 올림
+    upper = max(np.ceil(upper / 10) * 10, 10)
+    return np.linspace(0, upper, bins + 1)
+
+
+def age_edges(age, width=AGE_BIN_WIDTH):
+    age = age.dropna()
+    if not len(age):
+        return np.arange(0, width + 1, width)
+    low = int(age.min()) // width * width
+    high = int(age.max()) // width * width + width
+    return np.arange(low, high + 1, width)
+
+
+def _bin_index(values, edges):
+    # 구간 번호 (범위 밖은 처음/마지막 구간, 결측은 -1)
+    # 경계가 등간격이라 searchsorted 대신 나눗셈으로 계산한다 (수백만 행에서 몇 배 빠름)
+    index = np.floor((values - edges[0]) / (edges[1] - edges[0]))
+    np.clip(index, 0, len(edges) - 2, out=index)
+    return np.where(np.isnan(values), -1, index).astype(np.int64)
+
+
+def income_histogram(welfare, segment, edges, mask=None):
+    # 구분 x 월급 구간별 빈도 (segment, income_from, income_to, n)
+    income = welfare["income"].to_numpy(dtype="float64", na_value=np.nan)
+    codes, labels = pd.factorize(welfare[segment], sort=True)
+    bins = _bin_index(income, edges)
+    keep = (codes >= 0) & (bins >= 0)
+    if mask is not None:
+        keep &= mask
+    n_bins = len(edges) - 1
+    counts = np.bincount(codes[keep] * n_bins + bins[keep], minlength=len(labels) * n_bins)
+    return pd.DataFrame(
+        {
+            segment: np.repeat(np.asarray(labels, dtype=object), n_bins),
+            "income_from": np.tile(edges[:-1], len(labels)),
+            "income_to": np.tile(edges[1:], len(labels)),
+            "n": counts,
+        }
+    )
+
+
+def age_income_grid(welfare, ages, incomes, mask=None):
+    # 월급 구간(행) x 나이 구간(열) 빈도
+    age = welfare["age"].to_numpy(dtype="float64", na_value=np.nan)
+    income = welfare["income"].to_numpy(dtype="float64", na_value=np.nan)
+    age_bins = _bin_index(age, ages)
+    income_bins = _bin_index(income, incomes)
+    keep = (age_bins >= 0) & (income_bins >= 0)
+    if mask is not None:
+        keep &= mask
+    n_age, n_income = len(ages) - 1, len(incomes) - 1
+    counts = np.bincount(income_bins[keep] * n_age + age_bins[keep], minlength=n_income * n_age)
+    return pd.DataFrame(
+        counts.reshape(n_income, n_age),
+        index=pd.Index(incomes[:-1], name="income_from"),
+        columns=pd.Index(ages[:-1].astype(int), name="age_from"),
+    )
@@ -0,0 +1,107 @@
+# 한글 폰트 찾기 (OS별 호환성 처리)
+# 찾은 결과는 matplotlib 폰트 목록 캐시 옆 파일에 남겨 다음 프로세스(재시작, 다른 워커)는 다시 찾지 않는다.
+# matplotlib은 그래프를 처음 그릴 때만 가져온다.
+import json
+import os
+import platform
+import threading
+
+NANUM_PATH = "/usr/share/fonts/truetype/nanum/NanumGothic.ttf"
+# 한글 폰트를 못 찾았을 때 이름만 지정
+FALLBACK_FAMILY = "NanumGothic"
+
+_lock = threading.Lock()
+_applied = None
+
+
+def cache_path():
+    # KOWEPS_FONT_CACHE가 빈 문자열이면 파일에 남기지 않는다
+    path = os.environ.get("KOWEPS_FONT_CACHE")
+    if path is not None:
+        return path
+    import matplotlib
+
+    return os.path.join(matplotlib.get_cachedir(), "koweps_font.json")
+
+
+def _cache_key():
+    import matplotlib
+
+    return {"platform": platform.system(), "matplotlib": matplotlib.__version__}
+
+
+def discover():
+    # {"family": 폰트 이름, "path": 폰트 파일 (없으면 None), "register": matplotlib에 직접 등록할지,
+    #  "found": 한글 폰트를 찾았는지}
+    if platform.system() == "Windows":
+        return {"family": "Malgun Gothic", "path": None, "register": False, "found": True}
+    # Streamlit Cloud (Linux) 환경
+    # 폰트 경로를 직접 확인하거나 시스템 폰트에서 Nanum을 찾습니다.
+    if os.path.exists(NANUM_PATH):
+        return {"family": "NanumGothic", "path": NANUM_PATH, "register": True, "found": True}
+    import matplotlib.font_manager as fm
+
+    for font in fm.fontManager.ttflist:
+        if "Nanum" in font.name:
+            return {"family": font.name, "path": font.fname, "register": False, "found": True}
+    return {"family": FALLBACK_FAMILY, "path": None, "register": False, "found": False}
+
+
+def _read_cache(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get("key") != _cache_key():
+        return None
+    font = cached.get("font") or {}
+    if font.get("path") and not os.path.exists(font["path"]):
+        return None
+    return font
+
+
+def _write_cache(path, font):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = "{}.{}.tmp".format(path, os.getpid())
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"key": _cache_key(), "font": font}, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def resolve():
+    # (폰트, 캐시 파일에서 읽었는지)
+    path = cache_path()
+    font = _read_cache(path) if path else None
+    if font:
+        return font, True
+    font = discover()
+    # 못 찾은 결과는 남기지 않는다 (나중에 폰트를 설치하면 다음 프로세스가 찾도록)
+    if path and font["found"]:
+        try:
+            _write_cache(path, font)
+        except OSError:
+            pass
+    return font, False
+
+
+def apply():
+    # 프로세스마다 한 번만 찾고 matplotlib 설정에 반영한다. 반영한 폰트를 돌려준다
+    global _applied
+    with _lock:
+        if _applied is not None:
+            return _applied
+        import matplotlib.pyplot as plt
+
+        font, _ = resolve()
+        if font.get("register"):
+            import matplotlib.font_manager as fm
+
+            fm.fontManager.addfont(font["path"])
+        plt.rc("font", family=font["family"])
+        # 마이너스 기호 깨짐 방지
+        plt.rcParams["axes.unicode_minus"] = False
+        _applied = font
+        return font
@@ -0,0 +1,138 @@
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+from koweps import sources, timing
+
+CODEBOOK_PATH = "data/welfare_2015_codebook.xlsx"
+SURVEY_YEAR = 2015
+
+# 원자료 변수명 -> 분석용 변수명
+RENAME_COLUMNS = {
+    "h10_g3": "sex",  #  성별
+    "h10_g4": "birth_year",  #  태어난 연도
+    "h10_g10": "marital_status",  #  혼인 상태
+    "h10_g11": "religion",  #  종교
+    "h10_eco9": "job_code",  #  직업 코드
+    "p1002_8aq1": "income",  #  월급
+    "h10_reg7": "region_code",  #  지역 코드
+}
+
+# 숫자 코드 -> 분석용 값
+SEX_LABELS = {1: "male", 2: "female"}
+RELIGION_LABELS = {1: "yes", 2: "no"}
+MARRIAGE_LABELS = {1: "marriage", 3: "divorce"}
+
+REGION_NAMES = {
+    1: "서울",
+    2: "수도권(인천/경기)",
+    3: "부산/경남/울산",
+    4: "대구/경북",
+    5: "대전/충남",
+    6: "강원/충북",
+    7: "광주/전남/전북/제주도",
+}
+
+
+def age_group(age):
+    if pd.isnull(age):
+        return np.nan
+    elif age >= 60:
+        return "old"
+    elif age >= 30:
+        return "middle"
+    else:
+        return "young"
+
+
+def divorce_yn(marital_status):
+    return MARRIAGE_LABELS.get(marital_status, np.nan)
+
+
+def read_job_list(codebook_path=CODEBOOK_PATH):
+    # 코드북이 없으면 None (경로 또는 묶음에서 꺼낸 파일 객체)
+    if isinstance(codebook_path, io.BytesIO):
+        codebook_path.seek(0)
+    elif not os.path.exists(codebook_path):
+        return None
+    return pd.read_excel(codebook_path, sheet_name="직종코드")
+
+
+def read_raw(sav_path):
+    # 압축(.gz/.zst)이나 묶음(.zip)이면 풀면서 읽는다 (koweps.sources)
+    name = sources.data_name(sav_path) if sources.is_packed(sav_path) else str(sav_path)
+    if name.endswith(".sav"):
+        if sources.is_packed(sav_path):
+            raise ValueError("{}: SPSS 원자료는 압축하지 않은 파일만 읽을 수 있습니다".format(sav_path))
+        # SPSS 원자료 (pyreadstat 필요)
+        return pd.read_spss(sav_path, convert_categoricals=False)
+    if not sources.is_packed(sav_path):
+        return pd.read_parquet(sav_path) if name.endswith(".parquet") else pd.read_csv(sav_path)
+    with sources.open_data(sav_path) as f:
+        if name.endswith(".parquet"):
+            # Parquet은 파일 끝의 메타데이터부터 읽어야 해서 메모리에 푼 뒤 읽는다
+            return pd.read_parquet(io.BytesIO(f.read()))
+        return pd.read_csv(f)
+
+
+def read_welfare(sav_path, codebook_path=CODEBOOK_PATH):
+    with timing.stage("load parse"):
+        raw_welfare = read_raw(sav_path)
+    return preprocess(raw_welfare, sources.codebook(sav_path, codebook_path))
+
+
+def preprocess(raw_welfare, codebook_path=CODEBOOK_PATH):
+    # 구간: load derive(변수명/무응답/파생 변수), load codebook(직종 코드북 읽기+결합)
+    timing.start("load derive")
+    welfare = raw_welfare.copy()
+    welfare = welfare.rename(columns=RENAME_COLUMNS)
+
+    # 전처리
+    if "sex" in welfare.columns:
+        # sex가 숫자(1,2)이면 문자열로 변환, 이미 문자열이면 그대로 사용
+        if pd.api.types.is_numeric_dtype(welfare["sex"]):
+            welfare["sex"] = welfare["sex"].replace(9, np.nan)
+            welfare["sex"] = welfare["sex"].map(SEX_LABELS)
+
+    if "income" in welfare.columns:
+        # income이 이미 정리된 경우를 대비해 0과 9999만 처리
+        welfare["income"] = welfare["income"].replace(9999, np.nan)
+        welfare["income"] = np.where(welfare["income"] == 0, np.nan, welfare["income"])
+
+    if "birth_year" in welfare.columns:
+        welfare["birth_year"] = welfare["birth_year"].replace(9999, np.nan)
+        welfare["age"] = SURVEY_YEAR - welfare["birth_year"] + 1
+        welfare["age_group"] = welfare["age"].apply(age_group)
+
+    if "job_code" in welfare.columns:
+        welfare["job_code"] = np.where(
+            welfare["job_code"] == 9999, np.nan, welfare["job_code"]
+        )
+        timing.stop("load derive")
+        timing.start("load codebook")
+        job_list = read_job_list(codebook_path)
+        if job_list is not None:
+            welfare = welfare.merge(job_list, how="left", on="job_code")
+        else:
+            # 코드북 파일이 없으면 job 컬럼을 job_code 문자열로 대체
+            welfare["job"] = welfare["job_code"].astype("Int64").astype("str").replace("<NA>", np.nan)
+        timing.stop("load codebook")
+        timing.start("load derive")
+
+    if "religion" in welfare.columns:
+        welfare["religion"] = np.where(welfare["religion"] == 9, np.nan, welfare["religion"])
+        welfare["religion"] = welfare["religion"].map(RELIGION_LABELS)
+
+    if "marital_status" in welfare.columns:
+        welfare["marriage"] = welfare["marital_status"].apply(divorce_yn)
+
+    if "region_code" in welfare.columns:
+        region_list = pd.DataFrame(
+            {"region_code": list(REGION_NAMES), "region": list(REGION_NAMES.values())}
+        )
+        welfare = welfare.merge(region_list, how="left", on="region_code")
+
+    timing.stop("load derive")
+    return welfare
@@ -0,0 +1,83 @@
+# 메모리 사용량 집계
+# 데이터프레임 컬럼별 실제 사용량과, 값이 바뀌지 않는(무손실) 자료형 최적화 시 예상 사용량을 계산한다.
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# 고유값 비율이 이보다 낮은 문자열 컬럼은 category로 바꾼다
+CATEGORY_RATIO = 0.5
+
+
+def optimized_dtype(series):
+    if pd.api.types.is_bool_dtype(series) or isinstance(series.dtype, pd.CategoricalDtype):
+        return series.dtype
+    if pd.api.types.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast="integer").dtype
+    if pd.api.types.is_float_dtype(series):
+        values = series.dropna()
+        # 정수값만 있는 실수 컬럼(결측 때문에 float인 연도/코드 등) -> nullable 정수
+        if len(values) and (values == np.floor(values)).all():
+            for dtype in ("Int8", "Int16", "Int32", "Int64"):
+                info = np.iinfo(dtype.lower())
+                if info.min <= values.min() and values.max() <= info.max:
+                    return pd.api.types.pandas_dtype(dtype)
+        return series.dtype
+    if pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+        if len(series) and series.nunique(dropna=True) <= len(series) * CATEGORY_RATIO:
+            return pd.CategoricalDtype()
+    return series.dtype
+
+
+def optimize_dtypes(frame):
+    return frame.astype({column: optimized_dtype(frame[column]) for column in frame.columns})
+
+
+def column_usage(frame):
+    # 컬럼별 현재/최적화 후 바이트 (인덱스 제외)
+    rows = []
+    for column in frame.columns:
+        series = frame[column]
+        dtype = optimized_dtype(series)
+        current = int(series.memory_usage(deep=True, index=False))
+        optimized = current
+        if dtype != series.dtype:
+            optimized = int(series.astype(dtype).memory_usage(deep=True, index=False))
+        rows.append(
+            {
+                "column": column,
+                "dtype": str(series.dtype),
+                "bytes": current,
+                "optimized_dtype": str(dtype),
+                "optimized_bytes": optimized,
+                "saved_bytes": current - optimized,
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def process_rss():
+    # 현재 프로세스 상주 메모리(바이트). 알 수 없으면 None
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+
+        # 최대 상주 메모리 (리눅스 KB, macOS 바이트)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        return None
+
+
+def format_bytes(nbytes):
+    if nbytes is None:
+        return "-"
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(nbytes) < 1024 or unit == "GB":
+            return "{:.1f} {}".format(nbytes, unit) if unit != "B" else "{} B".format(int(nbytes))
+        nbytes /= 1024
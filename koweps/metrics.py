@@ -0,0 +1,264 @@
+# 프로세스 단위 성능 지표 (Prometheus 텍스트 형식)
+# 실행(rerun) 기록을 받아 누적하고, 로컬 HTTP 엔드포인트나 파일로 내보낸다.
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# 이 시간(초) 안에 실행이 있었던 세션을 활성 세션으로 센다
+ACTIVE_SESSION_WINDOW = 300
+
+# "load_welfare", "table sex_income", "figure fig1", "distribution income_hist", "slice rows" (+ " (miss)")
+_CACHE_STAGE = re.compile(r"^(load_welfare|table|figure|distribution|slice)(?: ([^\s(]\S*))?( \(miss\))?$")
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join('{}="{}"'.format(k, str(v).replace('"', '\\"')) for k, v in labels) + "}"
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._help = {}
+        self._types = {}
+        # 지표 이름 -> {라벨 튜플: 값}
+        self._values = {}
+
+    def _series(self, name, kind, help_text, labels):
+        self._types.setdefault(name, kind)
+        self._help.setdefault(name, help_text)
+        return self._values.setdefault(name, {}), tuple(sorted(labels.items()))
+
+    def inc(self, name, help_text="", value=1, **labels):
+        with self._lock:
+            series, key = self._series(name, "counter", help_text, labels)
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name, value, help_text="", **labels):
+        with self._lock:
+            series, key = self._series(name, "gauge", help_text, labels)
+            series[key] = value
+
+    def observe(self, name, value, help_text="", buckets=DEFAULT_BUCKETS, **labels):
+        with self._lock:
+            series, key = self._series(name, "histogram", help_text, labels)
+            histogram = series.setdefault(
+                key, {"buckets": buckets, "counts": [0] * len(buckets), "sum": 0.0, "count": 0}
+            )
+            for i, bucket in enumerate(histogram["buckets"]):
+                if value <= bucket:
+                    histogram["counts"][i] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    def get(self, name, **labels):
+        with self._lock:
+            return self._values.get(name, {}).get(tuple(sorted(labels.items())), 0)
+
+    def render(self):
+        lines = []
+        with self._lock:
+            for name, series in self._values.items():
+                lines.append("# HELP {} {}".format(name, self._help[name]))
+                lines.append("# TYPE {} {}".format(name, self._types[name]))
+                for key, value in series.items():
+                    if self._types[name] != "histogram":
+                        lines.append("{}{} {}".format(name, _labels(key), value))
+                        continue
+                    for bucket, count in zip(value["buckets"], value["counts"]):
+                        lines.append("{}_bucket{} {}".format(name, _labels(key + (("le", bucket),)), count))
+                    lines.append("{}_bucket{} {}".format(name, _labels(key + (("le", "+Inf"),)), value["count"]))
+                    lines.append("{}_sum{} {}".format(name, _labels(key), value["sum"]))
+                    lines.append("{}_count{} {}".format(name, _labels(key), value["count"]))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+_state_lock = threading.Lock()
+_last_seen = {}
+_cached_bytes = {}
+# 항목 수 제한이 있는 캐시(max_entries)의 키 순서: 묶음 이름 -> {키: 캐시 이름} (오래된 것부터)
+_bounded_keys = {}
+
+
+def cache_stored(cache, key, nbytes, max_entries=None, group=None):
+    # 캐시 미스로 새 값을 저장할 때 호출. 이미 저장했던 키가 다시 미스면 축출된 것으로 본다.
+    # max_entries: st.cache_data(max_entries=...)처럼 항목 수가 제한된 캐시. Streamlit은 축출을 알려 주지 않으므로
+    # 같은 group(기본: 캐시 이름)의 키를 저장 순서대로 max_entries개만 남겨 버린 항목의 바이트를 뺀다
+    # (적중 때는 호출되지 않아 Streamlit의 LRU 대신 저장 순서로 버리는 근사치)
+    dropped = []
+    with _state_lock:
+        entries = _cached_bytes.setdefault(cache, {})
+        evicted = key in entries
+        entries[key] = int(nbytes)
+        if max_entries is not None:
+            keys = _bounded_keys.setdefault(group or cache, {})
+            keys.pop(key, None)
+            keys[key] = cache
+            while len(keys) > max_entries:
+                old_key = next(iter(keys))
+                old_cache = keys.pop(old_key)
+                _cached_bytes.get(old_cache, {}).pop(old_key, None)
+                dropped.append(old_cache)
+        totals = {name: sum(_cached_bytes.get(name, {}).values()) for name in {cache, *dropped}}
+    if evicted:
+        REGISTRY.inc("koweps_cache_evictions_total", "Cache entries recomputed after eviction", cache=cache)
+    for name in dropped:
+        REGISTRY.inc("koweps_cache_evictions_total", "Cache entries recomputed after eviction", cache=name)
+    for name, total in totals.items():
+        REGISTRY.set("koweps_cache_bytes", total, "Approximate bytes held by the cache", cache=name)
+
+
+def cache_removed(cache, key):
+    # 캐시가 예산을 넘어 항목을 스스로 버렸을 때 (koweps.slices)
+    with _state_lock:
+        entries = _cached_bytes.setdefault(cache, {})
+        entries.pop(key, None)
+        total = sum(entries.values())
+    REGISTRY.inc("koweps_cache_evictions_total", "Cache entries recomputed after eviction", cache=cache)
+    REGISTRY.set("koweps_cache_bytes", total, "Approximate bytes held by the cache", cache=cache)
+
+
+def cached_entries():
+    # 캐시 이름 -> {키: 바이트} (cache_stored로 기록된 항목)
+    with _state_lock:
+        return {cache: dict(entries) for cache, entries in _cached_bytes.items()}
+
+
+def cache_counts(record):
+    # 실행 기록 1건의 캐시별 {"hit": n, "miss": n}
+    lookups = {}
+    misses = {}
+    for stage in record["stages"]:
+        match = _CACHE_STAGE.match(stage["name"])
+        if match:
+            cache, _, miss = match.groups()
+            counter = misses if miss else lookups
+            counter[cache] = counter.get(cache, 0) + 1
+    return {
+        # 캐시 안에서 다른 캐시를 부르면 바깥 조회 없이 미스만 남을 수 있다
+        cache: {"hit": max(lookups.get(cache, 0) - misses.get(cache, 0), 0), "miss": misses.get(cache, 0)}
+        for cache in set(lookups) | set(misses)
+    }
+
+
+def observe_rerun(record, section_of):
+    # timing.RerunTimer.record() 결과 1건을 누적
+    REGISTRY.inc("koweps_reruns_total", "Script reruns")
+    REGISTRY.observe(
+        "koweps_rerun_duration_seconds", record["total_ms"] / 1000, "Script rerun wall time"
+    )
+
+    section_seconds = {}
+    for stage in record["stages"]:
+        if stage["name"].endswith(" (miss)"):
+            continue
+        section = section_of(stage["name"])
+        if section is not None:
+            section_seconds[section] = section_seconds.get(section, 0.0) + stage["ms"] / 1000
+
+    for section, seconds in section_seconds.items():
+        REGISTRY.observe(
+            "koweps_section_duration_seconds", seconds, "Per-section time within a rerun", section=section
+        )
+    for cache, counts in cache_counts(record).items():
+        for result in ("hit", "miss"):
+            REGISTRY.inc(
+                "koweps_cache_requests_total", "Cache lookups", counts[result], cache=cache, result=result
+            )
+        hit_total = REGISTRY.get("koweps_cache_requests_total", cache=cache, result="hit")
+        miss_total = REGISTRY.get("koweps_cache_requests_total", cache=cache, result="miss")
+        if hit_total + miss_total:
+            REGISTRY.set(
+                "koweps_cache_hit_ratio",
+                hit_total / (hit_total + miss_total),
+                "Cache hit ratio since process start",
+                cache=cache,
+            )
+
+    now = time.time()
+    with _state_lock:
+        if record.get("session_id"):
+            _last_seen[record["session_id"]] = now
+        for session_id, seen in list(_last_seen.items()):
+            if now - seen > ACTIVE_SESSION_WINDOW:
+                del _last_seen[session_id]
+        active = len(_last_seen)
+    REGISTRY.set(
+        "koweps_active_sessions", active, "Sessions with a rerun in the last {}s".format(ACTIVE_SESSION_WINDOW)
+    )
+
+
+def write_textfile(path, registry=REGISTRY):
+    # node_exporter textfile collector 형식. 읽는 쪽이 반쯤 쓴 파일을 보지 않도록 교체 방식으로 쓴다.
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = "{}.{}.tmp".format(path, threading.get_ident())
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(registry.render())
+    os.replace(tmp_path, path)
+
+
+_ready = threading.Event()
+_ready.set()
+
+
+def set_ready(ready):
+    # 미리 데우는 동안 False (serve.py). 그냥 streamlit run으로 띄우면 처음부터 준비 상태
+    if ready:
+        _ready.set()
+    else:
+        _ready.clear()
+    REGISTRY.set("koweps_ready", int(ready), "1 once the worker has warmed its caches and takes traffic")
+
+
+def is_ready():
+    return _ready.is_set()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path == "/metrics":
+            self._send(200, self.registry.render(), "text/plain; version=0.0.4; charset=utf-8")
+        elif path == "/ready":
+            # 로드 밸런서 준비 확인: 데우는 중에는 503
+            if is_ready():
+                self._send(200, "ready\n", "text/plain; charset=utf-8")
+            else:
+                self._send(503, "warming up\n", "text/plain; charset=utf-8")
+        else:
+            self.send_error(404)
+
+    def _send(self, status, text, content_type):
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def serve(port, host="127.0.0.1"):
+    # 프로세스당 한 번만 띄운다 (이미 떠 있으면 그대로 반환)
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, name="koweps-metrics", daemon=True).start()
+        return _server
@@ -0,0 +1,158 @@
+# 지역(region_code)별로 나눠 저장한 데이터 (선택적으로 조사 연도도)
+# 만들기: python -m koweps.precompute data/welfare_2015.csv --by-region --out welfare_by_region [--year 2015]
+# <out>/[year=<연도>/]region_code=<코드>/part-0.parquet (전처리를 마친 행), <out>/partitions.json (조각 목록)
+# 읽을 때는 고른 지역의 조각 파일만 읽고, 읽은 frame에는 지역별 행 범위를 남겨 지역 필터가 그 범위만 보게 한다.
+#   frame = partitions.load("bench_data/welfare_by_region", regions=["서울"])
+import json
+import os
+
+import pandas as pd
+
+from koweps.loader import REGION_NAMES
+
+FORMAT_VERSION = 1
+MANIFEST = "partitions.json"
+# 지역 코드가 없는 행
+NULL_PARTITION = "none"
+# frame.attrs에 남기는 지역별 행 범위 {"rows": 전체 행 수, "region": {지역: [[시작, 끝], ...]}}
+ATTRS_KEY = "partitions"
+
+
+def is_partitioned(path):
+    return os.path.isfile(os.path.join(str(path), MANIFEST))
+
+
+def read_manifest(path):
+    with open(os.path.join(str(path), MANIFEST), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _as_list(value):
+    if value is None:
+        return None
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def write(frame, out_dir, year=None, fingerprint=None):
+    # 지역 코드별(연도를 주면 연도/지역 코드별) 조각으로 저장하고 조각 목록을 돌려준다
+    if "region_code" not in frame.columns:
+        raise ValueError("region_code 변수가 없어 지역별로 나눌 수 없습니다")
+    os.makedirs(out_dir, exist_ok=True)
+    codes = frame["region_code"]
+    parts = []
+    for code in sorted(codes.dropna().unique().tolist()) + [None]:
+        rows = frame[codes.isna()] if code is None else frame[codes == code]
+        if not len(rows):
+            continue
+        directory = "region_code={}".format(NULL_PARTITION if code is None else int(code))
+        if year is not None:
+            directory = "year={}/{}".format(year, directory)
+        os.makedirs(os.path.join(out_dir, directory), exist_ok=True)
+        path = "{}/part-0.parquet".format(directory)
+        rows.to_parquet(os.path.join(out_dir, path), index=False)
+        parts.append({
+            "path": path,
+            "year": year,
+            "region_code": None if code is None else int(code),
+            "region": None if code is None else REGION_NAMES.get(int(code)),
+            "rows": len(rows),
+        })
+    # 같은 폴더에 다른 연도를 더할 수 있게 기존 목록과 합친다
+    if is_partitioned(out_dir):
+        previous = read_manifest(out_dir)
+        parts = [part for part in previous["parts"] if part["year"] != year] + parts
+        fingerprints = dict(previous.get("fingerprints", {}), **{str(year): fingerprint})
+    else:
+        fingerprints = {str(year): fingerprint}
+    manifest = {
+        "format": FORMAT_VERSION,
+        "by": (["year"] if any(part["year"] is not None for part in parts) else []) + ["region_code"],
+        "fingerprints": fingerprints,
+        "fingerprint": "{}:{}".format(FORMAT_VERSION, json.dumps(fingerprints, sort_keys=True)),
+        "columns": list(frame.columns),
+        "parts": sorted(parts, key=lambda part: (part["year"] or 0, part["path"])),
+    }
+    tmp_path = os.path.join(out_dir, "{}.{}.tmp".format(MANIFEST, os.getpid()))
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, os.path.join(out_dir, MANIFEST))
+    return manifest["parts"]
+
+
+def check_regions(path, regions, known):
+    # 데이터에 없는 지역 이름은 조용히 0행이 되지 않도록 ValueError (나눠 저장한 데이터와 한 파일 데이터 공통)
+    known = sorted({region for region in known if isinstance(region, str)})
+    unknown = [region for region in regions if region not in known]
+    if unknown:
+        raise ValueError("{}: 없는 지역 {} (있는 지역: {})".format(path, unknown, ", ".join(known)))
+
+
+def select(path, regions=None, years=None):
+    # 읽어야 할 조각 (지역/연도를 주지 않으면 전부). 지역을 주면 지역 코드가 없는 조각은 뺀다
+    # 목록에 없는 지역 이름은 조용히 빠지지 않도록 ValueError
+    regions = _as_list(regions)
+    years = _as_list(years)
+    parts = read_manifest(path)["parts"]
+    if regions is not None:
+        check_regions(path, regions, [part["region"] for part in parts])
+    return [
+        part
+        for part in parts
+        if (regions is None or part["region"] in regions) and (years is None or part["year"] in years)
+    ]
+
+
+def load(path, regions=None, years=None):
+    # 고른 조각만 읽어서 이어 붙인다. 연도로 나눴으면 year 컬럼을 더한다
+    manifest = read_manifest(path)
+    parts = select(path, regions, years)
+    frames = []
+    for part in parts:
+        frame = pd.read_parquet(os.path.join(str(path), part["path"]))
+        if "year" in manifest["by"]:
+            frame["year"] = part["year"]
+        frames.append(frame)
+    if not frames:
+        welfare = pd.DataFrame(columns=manifest["columns"])
+    else:
+        welfare = pd.concat(frames, ignore_index=True)
+    # 조각을 이어 붙인 순서대로 지역별 행 범위를 남긴다 (행 순서는 0부터 이어지는 RangeIndex로 확인한다)
+    ranges = {}
+    start = 0
+    for part in parts:
+        ranges.setdefault(part["region"], []).append([start, start + part["rows"]])
+        start += part["rows"]
+    welfare.attrs[ATTRS_KEY] = {"rows": len(welfare), "region": ranges}
+    return welfare
+
+
+def region_ranges(frame, region):
+    # 지역 필터에 해당하는 행 범위 [(시작, 끝)]. 지역별로 읽은 frame 그대로가 아니거나 지역 필터가 없으면 None
+    info = frame.attrs.get(ATTRS_KEY)
+    selected = _as_list(region)
+    if not info or selected is None or "All" in selected or not _written_order(frame, info):
+        return None
+    return [tuple(span) for name in selected for span in info["region"].get(name, [])]
+
+
+def _written_order(frame, info):
+    # 필터/정렬/reindex/sample한 frame에도 attrs가 따라가므로, 읽은 순서 그대로일 때만 범위를 믿는다:
+    # 행 수와 0부터 이어지는 RangeIndex가 같고, 범위마다 양 끝 행의 지역이 맞아야 한다
+    # (정렬 뒤 reset_index로 RangeIndex가 돌아와도 경계 행의 지역이 어긋나면 잡힌다)
+    if info["rows"] != len(frame) or not frame.index.equals(pd.RangeIndex(len(frame))):
+        return False
+    if "region" not in frame.columns:
+        return False
+    column = frame["region"]
+    for name, spans in info["region"].items():
+        for start, stop in spans:
+            if stop <= start:
+                continue
+            ends = column.iloc[[start, stop - 1]]
+            if name is None:
+                if ends.notna().any():
+                    return False
+            elif not (ends == name).all():
+                return False
+    return True
+
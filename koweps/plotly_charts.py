@@ -0,0 +1,178 @@
+# 섹션별 그래프 (plotly)
+# charts.py와 같은 그래프를 plotly 명세로 만든다. 서버는 작은 집계표와 명세만 보내고 그리기는 브라우저가 한다.
+import plotly.graph_objects as go
+
+from koweps.sections import AGE_GROUP_ORDER
+
+
+def _figure(traces, title, xlabel, ylabel, **layout):
+    fig = go.Figure(traces)
+    fig.update_layout(title=title, xaxis_title=xlabel, yaxis_title=ylabel, **layout)
+    return fig
+
+
+def _age_group_axis(xlabel):
+    return {"title": xlabel, "categoryorder": "array", "categoryarray": AGE_GROUP_ORDER}
+
+
+def sex_income_bar(sex_income):
+    values = sex_income["mean_income"].tolist()
+    return _figure(
+        go.Bar(
+            x=sex_income["sex"].tolist(),
+            y=values,
+            text=[round(value) for value in values],
+            textposition="outside",
+        ),
+        "성별에 따른 평균 월급 막대 그래프",
+        "성별",
+        "평균 월급",
+    )
+
+
+def age_income_line(age_income):
+    return _figure(
+        go.Scatter(x=age_income["age"].tolist(), y=age_income["mean_income"].tolist(), mode="lines"),
+        "나이에 따른 평균 월급 선 그래프",
+        "나이",
+        "평균 월급",
+    )
+
+
+def age_group_income_bar(age_group_income):
+    return _figure(
+        go.Bar(x=age_group_income["age_group"].tolist(), y=age_group_income["mean_income"].tolist()),
+        "연령대에 따른 평균 월급 막대 그래프",
+        "연령대",
+        "평균 월급",
+        xaxis=_age_group_axis("연령대"),
+    )
+
+
+def _grouped_bars(table, x, hue, y):
+    return [
+        go.Bar(name=value, x=part[x].tolist(), y=part[y].tolist())
+        for value, part in table.groupby(hue, sort=True)
+    ]
+
+
+def age_group_sex_income_bar(age_group_sex_income):
+    return _figure(
+        _grouped_bars(age_group_sex_income, "age_group", "sex", "mean_income"),
+        "연령대 및 성별에 따른 평균 월급 막대 그래프",
+        "연령대 및 성별",
+        "평균 월급",
+        barmode="group",
+        xaxis=_age_group_axis("연령대 및 성별"),
+    )
+
+
+def _barh(table, y, x, title, xlabel, ylabel):
+    # 첫 행이 맨 위에 오도록 (seaborn 가로 막대와 같은 순서)
+    return _figure(
+        go.Bar(y=table[y].tolist(), x=table[x].tolist(), orientation="h"),
+        title,
+        xlabel,
+        ylabel,
+        yaxis={"title": ylabel, "autorange": "reversed", "automargin": True},
+    )
+
+
+def job_income_bar(top10):
+    return _barh(top10, "job", "mean_income", "직업에 따른 상위 10개 평균 월급 막대 그래프", "평균 월급", "직업")
+
+
+def job_count_bar(job_count, title):
+    return _barh(job_count, "job", "n", title, "빈도", "직업")
+
+
+def divorce_bar(divorce, x, title, xlabel, hue=None):
+    if hue is None:
+        traces = go.Bar(x=divorce[x].tolist(), y=divorce["proportion"].tolist())
+    else:
+        traces = _grouped_bars(divorce, x, hue, "proportion")
+    layout = {"barmode": "group"}
+    if x == "age_group":
+        layout["xaxis"] = _age_group_axis(xlabel)
+    return _figure(traces, title, xlabel, "이혼율", **layout)
+
+
+def region_age_group_barh(pivot_region_age_group):
+    pivot = pivot_region_age_group.sort_values("old")
+    regions = pivot.index.tolist()
+    return _figure(
+        [go.Bar(name=group, y=regions, x=pivot[group].tolist(), orientation="h") for group in AGE_GROUP_ORDER],
+        "지역별 연령대 비율 그래프",
+        "연령대 비율",
+        "지역",
+        barmode="stack",
+        yaxis={"title": "지역", "automargin": True},
+    )
+
+
+def income_histogram_step(histogram, segment, segment_label):
+    traces = [
+        go.Bar(
+            name=label,
+            x=((part["income_from"] + part["income_to"]) / 2).tolist(),
+            y=part["n"].tolist(),
+            width=(part["income_to"] - part["income_from"]).tolist(),
+            opacity=0.6,
+        )
+        for label, part in histogram.groupby(segment, sort=True)
+    ]
+    return _figure(
+        traces, "{}별 월급 분포".format(segment_label), "월급 (마지막 구간은 그 이상 포함)", "빈도", barmode="overlay"
+    )
+
+
+def age_income_heatmap(grid):
+    return _figure(
+        go.Heatmap(
+            z=grid.to_numpy().tolist(),
+            x=grid.columns.tolist(),
+            y=grid.index.tolist(),
+            colorscale="Viridis",
+            colorbar={"title": "빈도"},
+        ),
+        "나이와 월급의 분포",
+        "나이",
+        "월급",
+    )
+
+
+# 그래프 이름 -> (그리는 함수, 필요한 집계표) (charts.FIGURES와 같은 이름)
+FIGURES = {
+    "fig1": (sex_income_bar, "sex_income"),
+    "fig2": (age_income_line, "age_income"),
+    "fig3": (age_group_income_bar, "age_group_income"),
+    "fig4": (age_group_sex_income_bar, "age_group_sex_income"),
+    "fig5": (job_income_bar, "job_income"),
+    "fig61": (lambda t: job_count_bar(t, "남성 직업 빈도 막대 그래프"), "job_male"),
+    "fig62": (lambda t: job_count_bar(t, "여성 직업 빈도 막대 그래프"), "job_female"),
+    "fig71": (
+        lambda t: divorce_bar(t, "religion", "종교에 따른 이혼율 막대 그래프", "종교"),
+        "religion_divorce",
+    ),
+    "fig72": (
+        lambda t: divorce_bar(t, "age_group", "연령대에 따른 이혼율 막대 그래프", "연령대"),
+        "age_group_divorce",
+    ),
+    "fig73": (
+        lambda t: divorce_bar(
+            t, "age_group", "연령대 및 종교 유무에 따른 이혼율 막대 그래프", "연령대 및 종교 유무", hue="religion"
+        ),
+        "age_group_religion_divorce",
+    ),
+    "fig8": (region_age_group_barh, "region_age_group"),
+}
+
+
+def build(name, table):
+    draw, _ = FIGURES[name]
+    return draw(table)
+
+
+def to_json(fig):
+    # st.plotly_chart가 브라우저로 보내는 명세와 같은 JSON
+    return fig.to_json(validate=False)
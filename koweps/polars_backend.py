@@ -0,0 +1,169 @@
+# polars 연산 엔진
+# CSV/Parquet을 lazy 스캔하고, 전처리와 집계를 하나의 최적화된 실행 계획으로 평가한다.
+# 병렬 처리는 polars 스레드 풀이 알아서 한다.
+import polars as pl
+
+from koweps import sections
+from koweps.backends import Backend
+from koweps.loader import (
+    CODEBOOK_PATH,
+    RENAME_COLUMNS,
+    REGION_NAMES,
+    SURVEY_YEAR,
+    read_job_list,
+)
+
+
+def scan(path):
+    if str(path).endswith(".parquet"):
+        return pl.scan_parquet(path)
+    return pl.scan_csv(path, infer_schema_length=10000)
+
+
+def _nullif(name, *codes):
+    # 무응답 코드를 null로 (결과는 Float64, pandas의 NaN 처리와 같음)
+    value = pl.col(name).cast(pl.Float64)
+    return pl.when(value.is_in([float(code) for code in codes])).then(None).otherwise(value).alias(name)
+
+
+def _recode(name, mapping):
+    return pl.col(name).replace_strict(mapping, default=None, return_dtype=pl.String)
+
+
+def plan_welfare(path, codebook_path=CODEBOOK_PATH):
+    # loader.preprocess와 같은 전처리를 polars 표현식으로 작성
+    welfare = scan(path)
+    schema = welfare.collect_schema()
+    welfare = welfare.rename({raw: name for raw, name in RENAME_COLUMNS.items() if raw in schema})
+    schema = welfare.collect_schema()
+
+    if "sex" in schema and schema["sex"].is_numeric():
+        welfare = welfare.with_columns(_recode("sex", {1: "male", 2: "female"}))
+
+    if "income" in schema:
+        welfare = welfare.with_columns(_nullif("income", 0, 9999))
+
+    if "birth_year" in schema:
+        welfare = welfare.with_columns(_nullif("birth_year", 9999))
+        age = SURVEY_YEAR - pl.col("birth_year") + 1
+        welfare = welfare.with_columns(
+            age.alias("age"),
+            pl.when(age >= 60)
+            .then(pl.lit("old"))
+            .when(age >= 30)
+            .then(pl.lit("middle"))
+            .when(age.is_not_null())
+            .then(pl.lit("young"))
+            .alias("age_group"),
+        )
+
+    if "job_code" in schema:
+        welfare = welfare.with_columns(_nullif("job_code", 9999))
+        job_list = read_job_list(codebook_path)
+        if job_list is not None:
+            job_list = pl.from_pandas(job_list).with_columns(pl.col("job_code").cast(pl.Float64))
+            welfare = welfare.join(job_list.lazy(), on="job_code", how="left", maintain_order="left")
+        else:
+            welfare = welfare.with_columns(
+                pl.col("job_code").cast(pl.Int64).cast(pl.String).alias("job")
+            )
+
+    if "religion" in schema:
+        welfare = welfare.with_columns(_recode("religion", {1: "yes", 2: "no"}))
+
+    if "marital_status" in schema:
+        welfare = welfare.with_columns(
+            _recode("marital_status", {1: "marriage", 3: "divorce"}).alias("marriage")
+        )
+
+    if "region_code" in schema:
+        welfare = welfare.with_columns(_recode("region_code", REGION_NAMES).alias("region"))
+
+    return welfare
+
+
+class PolarsBackend(Backend):
+    name = "polars"
+
+    def __init__(self, path, codebook_path=CODEBOOK_PATH):
+        self.path = path
+        self.welfare = plan_welfare(path, codebook_path)
+        self.columns = self.welfare.collect_schema().names()
+
+    def load(self):
+        return self.welfare.collect().to_pandas()
+
+    def _mean_income(self, by):
+        return (
+            self.welfare.drop_nulls(by + ["income"])
+            .group_by(by)
+            .agg(pl.col("income").mean().alias("mean_income"))
+            .sort(by)
+        )
+
+    def _share(self, by, value, welfare=None):
+        # by 그룹 안에서 value의 비율 (value_counts(normalize=True)와 같음)
+        welfare = self.welfare if welfare is None else welfare
+        return (
+            welfare.drop_nulls(by + [value])
+            .group_by(by + [value])
+            .agg(pl.len().alias("count"))
+            .with_columns((pl.col("count") / pl.col("count").sum().over(by)).alias("proportion"))
+            .sort(by + ["proportion"], descending=[False] * len(by) + [True])
+            .select(by + [value, "proportion"])
+        )
+
+    def _job_count(self, sex, top=10):
+        return (
+            self.welfare.filter(pl.col("sex") == sex)
+            .drop_nulls(["job"])
+            .group_by("job")
+            .agg(pl.col("job").count().alias("n"))
+            .sort(["n", "job"], descending=[True, False])
+            .head(top)
+        )
+
+    def queries(self):
+        # 집계표 이름 -> (lazy 실행 계획, 결과 후처리)
+        no_young = self.welfare.filter(pl.col("age_group") != "young")
+        return {
+            "sex_income": (self._mean_income(["sex"]), None),
+            "age_income": (self._mean_income(["age"]), None),
+            "age_group_income": (self._mean_income(["age_group"]), None),
+            "age_group_sex_income": (self._mean_income(["age_group", "sex"]), None),
+            "job_income": (
+                self._mean_income(["job"])
+                .sort(["mean_income", "job"], descending=[True, False])
+                .head(10),
+                None,
+            ),
+            "job_male": (self._job_count("male"), None),
+            "job_female": (self._job_count("female"), None),
+            "religion_divorce": (self._share(["religion"], "marriage"), sections.divorce_rate),
+            "age_group_divorce": (
+                self._share(["age_group"], "marriage", self.welfare.drop_nulls(["religion"])),
+                lambda counts: sections.divorce_rate(counts[counts["age_group"] != "young"]),
+            ),
+            "age_group_religion_divorce": (
+                self._share(["age_group", "religion"], "marriage", no_young),
+                sections.divorce_rate,
+            ),
+            "region_age_group": (self._share(["region"], "age_group"), sections.age_group_share),
+        }
+
+    def _finish(self, result, finish):
+        table = result.to_pandas()
+        return finish(table) if finish else table
+
+    def table(self, name):
+        plan, finish = self.queries()[name]
+        return self._finish(plan.collect(), finish)
+
+    def section(self, n):
+        # 섹션의 여러 집계표를 한 번에 실행 (공통 부분 계획은 한 번만 평가)
+        names = sections.section_tables(n)
+        queries = self.queries()
+        results = pl.collect_all([queries[name][0] for name in names])
+        return {
+            name: self._finish(result, queries[name][1]) for name, result in zip(names, results)
+        }
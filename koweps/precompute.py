@@ -0,0 +1,35 @@
+# 결과 폴더 만들기 (koweps.artifacts)
+# python -m koweps.precompute data/welfare_2015.csv --codebook data/welfare_2015_codebook.xlsx --out artifacts
+# 원본/코드북/형식이 같은 폴더가 이미 있으면 다시 만들지 않는다 (--force로 강제)
+# --by-region이면 대신 지역별로 나눈 데이터를 만든다 (koweps.partitions, --year로 연도 단위로도)
+import argparse
+
+from koweps import artifacts, core, partitions
+from koweps.loader import CODEBOOK_PATH, SURVEY_YEAR
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대시보드용 결과 폴더 만들기 (전처리 데이터, 섹션 집계표, 코드 사전)")
+    parser.add_argument("source", help="복지패널 원자료 (.csv, .parquet, .sav)")
+    parser.add_argument("--codebook", default=CODEBOOK_PATH)
+    parser.add_argument("--out", default="artifacts")
+    parser.add_argument("--force", action="store_true", help="같은 버전 폴더가 있어도 다시 만든다")
+    parser.add_argument("--by-region", action="store_true", help="지역 코드별 조각 파일로 나눠 저장")
+    parser.add_argument("--year", type=int, help="--by-region일 때 연도 단위로도 나눈다 (예: {})".format(SURVEY_YEAR))
+    args = parser.parse_args()
+
+    if args.by_region:
+        frame = core.load(args.source, args.codebook)
+        fingerprint = artifacts.source_fingerprint(args.source, args.codebook)
+        parts = partitions.write(frame, args.out, args.year, fingerprint)
+        rows = sum(part["rows"] for part in parts)
+        print("saved", args.out, "({} partitions, {} rows)".format(len(parts), rows))
+        return
+
+    path = artifacts.build(args.source, args.out, args.codebook, args.force)
+    manifest = artifacts.read_manifest(path)
+    print("saved", path, "({} rows, {} tables)".format(manifest["rows"], len(manifest["tables"])))
+
+
+if __name__ == "__main__":
+    main()
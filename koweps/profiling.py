@@ -0,0 +1,121 @@
+# 스크립트 실행 1회 프로파일링 (샘플링 방식)
+# 시작한 스레드(= 이 세션의 스크립트 실행 스레드)의 호출 스택만 주기적으로 읽으므로
+# 같은 프로세스의 다른 세션에는 영향이 거의 없다.
+# 결과: 호출 트리(.txt), flamegraph.pl/speedscope용 접힌 스택(.folded), 메타데이터(.json)
+import collections
+import datetime
+import json
+import os
+import re
+import sys
+import threading
+import time
+
+DEFAULT_INTERVAL = 0.005
+# 프로파일을 멈추지 못하고 실행이 끝난 경우(st.stop 등) 대비 최대 샘플링 시간
+MAX_SECONDS = 120
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    label = "{} ({}:{})".format(code.co_name, os.path.basename(code.co_filename), code.co_firstlineno)
+    return label.replace(";", ",")
+
+
+class StackSampler:
+    def __init__(self, interval=DEFAULT_INTERVAL, root_filename=None):
+        self.interval = interval
+        # 이 파일의 프레임부터 위쪽(스트림릿 내부 등)은 잘라낸다
+        self.root_filename = root_filename
+        self.thread_id = threading.get_ident()
+        self.samples = collections.Counter()
+        self.started = None
+        self.elapsed = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="koweps-profiler", daemon=True)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def _run(self):
+        deadline = time.perf_counter() + MAX_SECONDS
+        while not self._stop.wait(self.interval) and time.perf_counter() < deadline:
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                break
+            stack = []
+            while frame is not None:
+                stack.append(frame)
+                frame = frame.f_back
+            stack.reverse()
+            if self.root_filename:
+                for i, f in enumerate(stack):
+                    if f.f_code.co_filename == self.root_filename:
+                        stack = stack[i:]
+                        break
+            self.samples[tuple(_frame_label(f) for f in stack)] += 1
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.elapsed = time.perf_counter() - self.started
+        return self
+
+    def folded(self):
+        return "".join("{} {}\n".format(";".join(stack), count) for stack, count in self.samples.most_common())
+
+    def call_tree(self, min_percent=0.5):
+        # 누적 샘플 비율로 그린 호출 트리
+        total = sum(self.samples.values())
+        tree = {}
+        for stack, count in self.samples.items():
+            node = tree
+            for label in stack:
+                entry = node.setdefault(label, [0, {}])
+                entry[0] += count
+                node = entry[1]
+
+        lines = [
+            "samples: {}  interval: {:.1f} ms  wall: {:.1f} ms".format(
+                total, self.interval * 1000, (self.elapsed or 0) * 1000
+            )
+        ]
+
+        def walk(node, depth):
+            for label, (count, children) in sorted(node.items(), key=lambda item: -item[1][0]):
+                percent = 100 * count / total
+                if percent < min_percent:
+                    continue
+                lines.append("{:6.1f}%  {}{}".format(percent, "  " * depth, label))
+                walk(children, depth + 1)
+
+        if total:
+            walk(tree, 0)
+        return "\n".join(lines) + "\n"
+
+    def save(self, directory, metadata=None):
+        os.makedirs(directory, exist_ok=True)
+        metadata = dict(metadata or {})
+        stamp = datetime.datetime.now().strftime("%Y%m%dT%H%M%S")
+        session = re.sub(r"\W", "", str(metadata.get("session_id") or "nosession"))[:8]
+        base = os.path.join(directory, "{}_{}".format(stamp, session))
+        with open(base + ".folded", "w", encoding="utf-8") as f:
+            f.write(self.folded())
+        with open(base + ".txt", "w", encoding="utf-8") as f:
+            if metadata.get("filters"):
+                f.write("filters: {}\n".format(json.dumps(metadata["filters"], ensure_ascii=False)))
+            f.write(self.call_tree())
+        metadata.update(
+            samples=sum(self.samples.values()),
+            interval_ms=self.interval * 1000,
+            wall_ms=round((self.elapsed or 0) * 1000, 3),
+        )
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump(metadata, f, ensure_ascii=False, indent=2, default=str)
+        return base
+
+
+def start(interval=DEFAULT_INTERVAL, root_filename=None):
+    return StackSampler(interval, root_filename).start()
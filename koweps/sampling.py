@@ -0,0 +1,165 @@
+# 표본 근사 집계 (층화 표본으로 먼저 답하고 표본을 늘려 가며 정확한 값까지 다시 계산)
+# 표본은 성별 x 연령대 x 지역 층별 비율을 지킨다. 데이터가 크면 표본 크기의 몇 배인 무작위 예비 표본에서 층을 나눠
+# (이중 추출) 첫 표본이 전체 행 수와 관계없이 빨리 나온다.
+# 표본 집계표는 정확한 집계표와 같은 모양이고, 같은 모양의 95% 신뢰구간 반폭(±) 표를 함께 돌려준다.
+#   평균 월급: 그룹별 표준편차 / sqrt(그룹 표본 수), 비율(%): sqrt(p(1-p) / 그룹 표본 수),
+#   직업 빈도: 전체 행 수 x 표본 비율로 키우고 같은 배수로 구간을 키운다 (모두 유한 모집단 보정 포함)
+#   progress = sampling.Progressive(frame, ["sex_income", "region_age_group"]).start()
+#   result = progress.latest("sex_income")  # {"table", "ci", "rows", "total", "exact"}
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from koweps import sections
+
+STRATA = ("sex", "age_group", "region")
+# 정확한 값 전에 거치는 표본 크기 (행 수가 이보다 작으면 건너뛴다)
+SAMPLE_ROWS = tuple(
+    int(rows) for rows in os.environ.get("KOWEPS_SAMPLE_ROWS", "10000,100000,1000000").split(",") if rows
+)
+# 층별 비율을 정하는 예비 표본 크기 (표본 크기의 배수)
+POOL_FACTOR = 20
+# 95% 신뢰구간
+Z = 1.959964
+
+# 집계표 이름 -> (종류, 그룹 변수, 값 변수, 분모에서 더 빼는 결측 변수)
+ESTIMATES = {
+    "sex_income": ("mean", ["sex"], "income", []),
+    "age_income": ("mean", ["age"], "income", []),
+    "age_group_income": ("mean", ["age_group"], "income", []),
+    "age_group_sex_income": ("mean", ["age_group", "sex"], "income", []),
+    "job_income": ("mean", ["job"], "income", []),
+    "job_male": ("count", ["sex"], "job", []),
+    "job_female": ("count", ["sex"], "job", []),
+    "religion_divorce": ("share", ["religion"], "marriage", []),
+    "age_group_divorce": ("share", ["age_group"], "marriage", ["religion"]),
+    "age_group_religion_divorce": ("share", ["age_group", "religion"], "marriage", []),
+    "region_age_group": ("share", ["region"], "age_group", []),
+}
+
+
+def stratified_keys(frame, strata=STRATA, rng=None):
+    # 행마다 [0, 1) 값. keys < rows / len(frame)인 행이 층별 비율을 지키는 rows행 표본이다 (층 안에서는 무작위)
+    rng = rng if rng is not None else np.random.default_rng()
+    strata = [name for name in strata if name in frame.columns]
+    if strata:
+        codes = frame.groupby(strata, dropna=False, sort=False).ngroup().to_numpy()
+    else:
+        codes = np.zeros(len(frame), dtype=np.int64)
+    # 층 안의 무작위 순위 r, 층 크기 n이면 (r + u) / n: 정렬 없이 한 번 비교로 고른다
+    shuffled = rng.permutation(len(frame))
+    ranks = np.empty(len(frame), dtype=np.int64)
+    ranks[shuffled] = pd.Series(codes[shuffled]).groupby(codes[shuffled]).cumcount().to_numpy()
+    return (ranks + rng.random(len(frame))) / np.bincount(codes)[codes]
+
+
+def stratified_sample(frame, rows, strata=STRATA, rng=None):
+    # 층별 비율을 지키는 약 rows행 표본.
+    # 큰 데이터는 무작위 예비 표본(rows x POOL_FACTOR행)에서 층을 나눠 전체 행 수와 관계없이 빨리 고른다
+    rng = rng if rng is not None else np.random.default_rng()
+    if rows * POOL_FACTOR < len(frame):
+        frame = frame.take(np.sort(rng.choice(len(frame), rows * POOL_FACTOR, replace=False)))
+    return frame[stratified_keys(frame, strata, rng) < rows / len(frame)]
+
+
+def _fpc(rows, total):
+    # 유한 모집단 보정 (전체를 다 쓰면 0)
+    return np.sqrt(max(0.0, 1 - rows / total)) if total else 0.0
+
+
+def estimate(sample, name, total):
+    # 표본으로 만든 집계표와 같은 모양의 95% 신뢰구간 반폭 표. total: 전체 행 수
+    kind, by, value, extra = ESTIMATES[name]
+    table = getattr(sections, name)(sample)
+    fpc = _fpc(len(sample), total)
+    if kind == "mean":
+        stats = (
+            sample.dropna(subset=by + [value])
+            .groupby(by, as_index=False)[value]
+            .agg(sd="std", n="count")
+        )
+        # 응답이 하나뿐인 그룹은 표준편차를 모르므로 NaN으로 둔다 (±0이 아니다)
+        stats["half"] = Z * stats["sd"] / np.sqrt(stats["n"]) * fpc
+        ci = table[by].merge(stats[by + ["half"]], on=by, how="left")
+        return table, ci.rename(columns={"half": "mean_income"}).set_axis(table.index)
+    if kind == "count":
+        # 표본 빈도 -> 전체 행 수 기준 빈도
+        share = table["n"] / len(sample) if len(sample) else table["n"] * 0.0
+        scaled = table.assign(n=(share * total).round().astype(int))
+        ci = table[["job"]].assign(n=total * Z * np.sqrt(share * (1 - share) / max(len(sample), 1)) * fpc)
+        return scaled, ci
+    # 비율(%): 그룹 안의 (값이 있는) 행 수가 분모
+    sizes = sample.dropna(subset=by + [value] + extra).groupby(by).size().rename("n").reset_index()
+    if name == "region_age_group":
+        n = sizes.set_index("region")["n"].reindex(table.index)
+        p = table / 100
+        ci = (Z * np.sqrt(p * (1 - p)).div(np.sqrt(n), axis=0) * fpc * 100).round(2)
+        return table, ci
+    n = table[by].merge(sizes, on=by, how="left")["n"].to_numpy()
+    p = table["proportion"].to_numpy() / 100
+    ci = table[by + ["marriage"]].assign(proportion=(Z * np.sqrt(p * (1 - p) / n) * fpc * 100).round(2))
+    return table, ci
+
+
+def levels(total, sample_rows=SAMPLE_ROWS):
+    # 다시 계산할 표본 크기 (마지막은 전체)
+    return sorted(rows for rows in set(sample_rows) if 0 < rows < total) + [total]
+
+
+class Progressive:
+    # 표본 크기를 늘려 가며 집계표를 다시 계산한다 (데이터마다 백그라운드 스레드 하나)
+    def __init__(self, frame, names, sample_rows=SAMPLE_ROWS, strata=STRATA, seed=0):
+        self.frame = frame
+        self.names = [name for name in names if name in ESTIMATES]
+        self.levels = levels(len(frame), sample_rows)
+        self.strata = strata
+        self.seed = seed
+        self.error = None
+        self._lock = threading.Lock()
+        self._first = threading.Event()
+        # 집계표 이름 -> {표본 행 수: 결과}
+        self._results = {name: {} for name in self.names}
+        self._thread = threading.Thread(target=self._run, name="koweps-progressive", daemon=True)
+
+    def start(self):
+        if not self._thread.is_alive() and not self._first.is_set():
+            self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            total = len(self.frame)
+            rng = np.random.default_rng(self.seed)
+            for rows in self.levels:
+                exact = rows == total
+                sample = self.frame if exact else stratified_sample(self.frame, rows, self.strata, rng)
+                for name in self.names:
+                    if exact:
+                        table, ci = getattr(sections, name)(self.frame), None
+                    else:
+                        table, ci = estimate(sample, name, total)
+                    with self._lock:
+                        self._results[name][rows] = {
+                            "table": table, "ci": ci, "rows": rows, "total": total, "exact": exact
+                        }
+                self._first.set()
+        except Exception as e:
+            # 첫 결과를 기다리는 쪽이 멈추지 않게 한다 (이미 낸 결과는 그대로 쓴다)
+            self.error = e
+            self._first.set()
+
+    def latest(self, name, timeout=None):
+        # 지금까지 가장 큰 표본으로 만든 결과 (첫 표본 결과가 나올 때까지 기다린다)
+        self._first.wait(timeout)
+        with self._lock:
+            results = self._results.get(name)
+            return results[max(results)] if results else None
+
+    def result(self, name, rows):
+        with self._lock:
+            return self._results[name].get(rows)
+
+    def done(self):
+        return all(self.levels[-1] in results for results in self._results.values()) or self.error is not None
@@ -0,0 +1,142 @@
+# 섹션별 집계 (pandas 기준 구현)
+# 다른 연산 엔진은 이 함수들과 같은 표를 돌려줘야 한다.
+
+AGE_GROUP_ORDER = ["young", "middle", "old"]
+
+# 집계표 이름 -> (섹션 번호, 필요한 변수)
+TABLES = {
+    "sex_income": (1, ("sex", "income")),
+    "age_income": (2, ("age", "income")),
+    "age_group_income": (3, ("age_group", "income")),
+    "age_group_sex_income": (4, ("age_group", "sex", "income")),
+    "job_income": (5, ("job", "income")),
+    "job_male": (6, ("sex", "job")),
+    "job_female": (6, ("sex", "job")),
+    "religion_divorce": (7, ("religion", "marriage")),
+    "age_group_divorce": (7, ("age_group", "religion", "marriage")),
+    "age_group_religion_divorce": (7, ("age_group", "religion", "marriage")),
+    "region_age_group": (8, ("region", "age_group")),
+}
+
+# 그래프 이름 -> 집계표 (charts/plotly_charts.FIGURES와 같은 이름, 그리기 라이브러리 없이 쓰는 용도)
+FIGURES = {
+    "fig1": "sex_income",
+    "fig2": "age_income",
+    "fig3": "age_group_income",
+    "fig4": "age_group_sex_income",
+    "fig5": "job_income",
+    "fig61": "job_male",
+    "fig62": "job_female",
+    "fig71": "religion_divorce",
+    "fig72": "age_group_divorce",
+    "fig73": "age_group_religion_divorce",
+    "fig8": "region_age_group",
+}
+
+
+def section_tables(n):
+    return [name for name, (section, _) in TABLES.items() if section == n]
+
+
+def mean_income(welfare, by):
+    return (
+        welfare.dropna(subset=by + ["income"])
+        .groupby(by, as_index=False)
+        .agg(mean_income=("income", "mean"))
+    )
+
+
+def divorce_rate(counts):
+    # value_counts(normalize=True) 결과에서 이혼 비율(%)만 남긴다
+    counts = counts[counts["marriage"] == "divorce"]
+    return counts.assign(proportion=counts["proportion"] * 100).round(2)
+
+
+def age_group_share(counts):
+    # 지역 x 연령대 비율(%) 피벗
+    counts = counts.assign(proportion=counts["proportion"] * 100).round(2)
+    return counts[["region", "age_group", "proportion"]].pivot(
+        index="region", columns="age_group", values="proportion"
+    )
+
+
+# 1. 성별에 따른 월급 차이
+def sex_income(welfare):
+    return mean_income(welfare, ["sex"])
+
+
+# 2. 나이와 월급의 관계
+def age_income(welfare):
+    return mean_income(welfare, ["age"])
+
+
+# 3. 연령대에 따른 월급 차이
+def age_group_income(welfare):
+    return mean_income(welfare, ["age_group"])
+
+
+# 4. 연령대 및 성별 월급 차이
+def age_group_sex_income(welfare):
+    return mean_income(welfare, ["age_group", "sex"])
+
+
+# 5. 직업별 월급 차이 (상위 10개)
+def job_income(welfare, top=10):
+    job_income = mean_income(welfare, ["job"])
+    return job_income.sort_values("mean_income", ascending=False, kind="stable").head(top)
+
+
+# 6. 성별 직업 빈도
+def job_count(welfare, sex, top=10):
+    return (
+        welfare[welfare["sex"] == sex]
+        .dropna(subset=["job"])
+        .groupby("job", as_index=False)
+        .agg(n=("job", "count"))
+        .sort_values("n", ascending=False, kind="stable")
+        .head(top)
+    )
+
+
+def job_male(welfare):
+    return job_count(welfare, "male")
+
+
+def job_female(welfare):
+    return job_count(welfare, "female")
+
+
+# 7. 종교 유무에 따른 이혼율
+def religion_divorce(welfare):
+    return divorce_rate(
+        welfare.dropna(subset=["religion", "marriage"])
+        .groupby("religion", as_index=False)["marriage"]
+        .value_counts(normalize=True)
+    )
+
+
+def age_group_divorce(welfare):
+    age_group_div = (
+        welfare.dropna(subset=["age_group", "religion"])
+        .groupby("age_group", as_index=False)["marriage"]
+        .value_counts(normalize=True)
+    )
+    return divorce_rate(age_group_div[age_group_div["age_group"] != "young"])
+
+
+def age_group_religion_divorce(welfare):
+    return divorce_rate(
+        welfare[welfare["age_group"] != "young"]
+        .dropna(subset=["age_group", "religion", "marriage"])
+        .groupby(["age_group", "religion"], as_index=False)["marriage"]
+        .value_counts(normalize=True)
+    )
+
+
+# 8. 지역별 연령대 비율
+def region_age_group(welfare):
+    return age_group_share(
+        welfare.dropna(subset=["age_group"])
+        .groupby("region", as_index=False)["age_group"]
+        .value_counts(normalize=True)
+    )
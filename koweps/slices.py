@@ -0,0 +1,105 @@
+# 세션 간 공유하는 필터 결과 메모 (프로세스 단위 LRU, 메모리 예산 안에서)
+# 여러 사용자가 같은 조합(예: 서울 + middle)을 보면 필터 조건 계산과 집계를 한 번만 한다.
+# 키: (데이터 키, 정규화한 필터). 데이터 키는 데이터 지문처럼 frame 하나를 가리키는 값 (행 번호가 그 frame 기준).
+#   필터별로 고른 행: 행 번호(int32)와 비트 마스크 중 작은 쪽으로 저장
+#   필터별 집계표: 그 행으로 만든 표 (여러 세션이 같은 객체를 받으므로 고치지 말고 읽기만 한다)
+#   mask = slices.mask(frame, dataset, {"region": ["서울"], "age_group": ["middle"]})
+#   table = slices.table(frame, dataset, filters, "sex_income")
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from koweps import core, metrics, sections, timing
+
+# 메모 전체 메모리 예산 (MB)
+BUDGET_BYTES = int(float(os.environ.get("KOWEPS_SLICE_CACHE_MB", "256")) * 2**20)
+
+
+class SliceCache:
+    def __init__(self, budget_bytes=BUDGET_BYTES, name="slices"):
+        self.budget_bytes = budget_bytes
+        self.name = name
+        self.nbytes = 0
+        self._lock = threading.Lock()
+        # 키 -> (값, 바이트). 앞쪽이 오래 안 쓴 항목
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, nbytes):
+        # 예산보다 큰 항목은 저장하지 않는다
+        nbytes = int(nbytes)
+        if nbytes > self.budget_bytes:
+            return
+        evicted = []
+        with self._lock:
+            if key in self._entries:
+                self.nbytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.budget_bytes:
+                old_key, (_, old_nbytes) = self._entries.popitem(last=False)
+                self.nbytes -= old_nbytes
+                evicted.append(old_key)
+        metrics.cache_stored(self.name, key, nbytes)
+        for old_key in evicted:
+            metrics.cache_removed(self.name, old_key)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+CACHE = SliceCache()
+
+
+def _pack(mask):
+    positions = np.flatnonzero(mask)
+    if mask.size < 2**31 and positions.size * 4 < (mask.size + 7) // 8:
+        return "rows", positions.astype(np.int32), mask.size
+    return "bits", np.packbits(mask), mask.size
+
+
+def _unpack(packed):
+    kind, data, size = packed
+    if kind == "rows":
+        mask = np.zeros(size, dtype=bool)
+        mask[data] = True
+        return mask
+    return np.unpackbits(data, count=size).view(bool)
+
+
+def mask(frame, dataset, filters, cache=CACHE):
+    # 필터로 고른 행의 bool 마스크 (적용할 필터가 없으면 None)
+    key = core.canonical(filters)
+    if not key:
+        return None
+    with timing.stage("slice rows"):
+        packed = cache.get((dataset, "rows", key))
+        if packed is None:
+            with timing.stage("slice rows (miss)"):
+                selected = core.filter_mask(frame, dict(key))
+                packed = _pack(selected)
+            cache.put((dataset, "rows", key), packed, packed[1].nbytes)
+            return selected
+        return _unpack(packed)
+
+
+def table(frame, dataset, filters, name, compute=None, cache=CACHE):
+    # 필터를 적용한 집계표. compute: 필터를 적용한 frame -> 표 (기본 sections.<name>), name은 키에도 쓴다
+    key = (dataset, "table", name, core.canonical(filters))
+    with timing.stage("slice " + name):
+        result = cache.get(key)
+        if result is None:
+            selected = mask(frame, dataset, filters, cache)
+            with timing.stage("slice {} (miss)".format(name)):
+                result = (compute or getattr(sections, name))(frame if selected is None else frame[selected])
+            cache.put(key, result, result.memory_usage(deep=True).sum())
+    return result
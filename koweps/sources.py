@@ -0,0 +1,91 @@
+# 압축/묶음 원자료 (welfare_2015.csv.gz, welfare_2015.csv.zst, 원자료와 코드북을 담은 .zip)
+# 임시 파일로 풀지 않고, 압축을 풀면서 읽는 파일 객체를 CSV 파서에 바로 넘긴다.
+#   with sources.open_data("extract.zip") as f: raw = pd.read_csv(f)
+# 묶음 안에 코드북(.xlsx)이 있으면 지정한 코드북 대신 그것을 쓴다 (sources.codebook).
+import contextlib
+import gzip
+import io
+import os
+import zipfile
+
+# 압축 확장자 -> 형식
+COMPRESSIONS = {".gz": "gzip", ".zst": "zstd"}
+ARCHIVES = (".zip",)
+DATA_EXTENSIONS = (".csv", ".parquet", ".sav")
+CODEBOOK_EXTENSION = ".xlsx"
+
+
+def compression(path):
+    return COMPRESSIONS.get(os.path.splitext(str(path))[1].lower())
+
+
+def is_archive(path):
+    return str(path).lower().endswith(ARCHIVES)
+
+
+def is_packed(path):
+    return compression(path) is not None or is_archive(path)
+
+
+def _members(path):
+    # 묶음 안의 (원자료, 코드북 또는 None). 폴더 안에 있어도 되고 macOS 메타데이터는 뺀다
+    with zipfile.ZipFile(path) as archive:
+        names = [
+            name
+            for name in archive.namelist()
+            if not name.endswith("/") and not name.startswith("__MACOSX/")
+        ]
+    data = [name for name in names if name.lower().endswith(DATA_EXTENSIONS)]
+    books = [name for name in names if name.lower().endswith(CODEBOOK_EXTENSION)]
+    if len(data) != 1:
+        raise ValueError("{}: 묶음 안에 원자료(.csv/.parquet/.sav)가 하나여야 합니다 ({})".format(path, data))
+    if len(books) > 1:
+        raise ValueError("{}: 묶음 안에 코드북(.xlsx)이 여러 개입니다 ({})".format(path, books))
+    return data[0], books[0] if books else None
+
+
+def data_name(path):
+    # 압축/묶음을 푼 원자료 파일 이름 (형식 판단과 결과 폴더 이름에 쓴다)
+    if is_archive(path):
+        return os.path.basename(_members(path)[0])
+    name = os.path.basename(str(path))
+    return os.path.splitext(name)[0] if compression(path) else name
+
+
+@contextlib.contextmanager
+def open_data(path):
+    # 압축을 풀면서 읽는 바이너리 파일 객체
+    kind = compression(path)
+    if is_archive(path):
+        member = _members(path)[0]
+        with zipfile.ZipFile(path) as archive, archive.open(member) as f:
+            yield f
+    elif kind == "gzip":
+        with gzip.open(path, "rb") as f:
+            yield f
+    elif kind == "zstd":
+        # 표준 라이브러리에 zstd가 없어 pyarrow 스트림을 쓴다
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("{}: zstd 압축 원자료에는 pyarrow가 필요합니다".format(path))
+        with pa.CompressedInputStream(pa.OSFile(str(path)), "zstd") as f:
+            yield f
+    else:
+        with open(path, "rb") as f:
+            yield f
+
+
+def bundled_codebook(path):
+    # 묶음 안 코드북 이름 (묶음이 아니거나 코드북이 없으면 None)
+    return _members(path)[1] if is_archive(path) else None
+
+
+def codebook(path, codebook_path):
+    # 묶음 안에 코드북이 있으면 그 내용(파일 객체), 없으면 지정한 코드북 경로
+    member = bundled_codebook(path)
+    if member is None:
+        return codebook_path
+    with zipfile.ZipFile(path) as archive:
+        # read_excel은 앞뒤로 이동하며 읽으므로 (작은) 코드북만 메모리에 푼다
+        return io.BytesIO(archive.read(member))
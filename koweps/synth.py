@@ -0,0 +1,199 @@
+# 규모 테스트용 합성 복지패널 데이터
+# 실제 파일(data/welfare_2015.csv)의 행을 복원 추출해 변수 간 결합 분포를 유지하고,
+#   - 월급은 로그 정규 잡음으로 흔들고 (0.01~9998만원)
+#   - 직업이 있는 행 일부는 코드북(직종코드 시트)의 직종 코드로 바꾸고
+#   - 무응답 코드(성별/종교/혼인 9, 연도/직종/월급 9999, 월급 0)를 sentinel_rate 비율로 섞는다.
+# 청크 단위로 만들어 바로 파일에 이어 쓰므로 메모리 사용량은 전체 행 수가 아니라 청크 크기에 비례한다.
+#
+# python -m koweps.synth --rows 100000000 --out bench_data/synth_100m.parquet
+# python -m koweps.synth --rows 1000000 --raw --out bench_data/raw_1m.csv  (h10_ 원자료 변수명 + 추가 컬럼)
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from koweps.loader import CODEBOOK_PATH, RENAME_COLUMNS, read_job_list
+
+SOURCE_PATH = "data/welfare_2015.csv"
+CHUNK_ROWS = 1_000_000
+SENTINEL_RATE = 0.001
+JOB_MIX = 0.05
+INCOME_NOISE = 0.1
+# 원자료처럼 넓은 파일을 만들 때 붙이는 분석에 쓰지 않는 컬럼 수
+RAW_EXTRA_COLUMNS = 100
+
+# 분석용 변수명 -> 무응답 코드
+SENTINELS = {
+    "sex": 9,
+    "birth_year": 9999,
+    "marital_status": 9,
+    "religion": 9,
+    "job_code": 9999,
+    "income": 9999,
+}
+# data/welfare_2015.csv와 같은 컬럼 순서
+COLUMNS = ["sex", "birth_year", "marital_status", "religion", "job_code", "income", "region_code"]
+
+
+def read_template(src=SOURCE_PATH):
+    # 원본을 원자료 코드 형태(숫자, 성별 결측 -> 9)의 float 배열로
+    welfare = pd.read_csv(src)
+    if not pd.api.types.is_numeric_dtype(welfare["sex"]):
+        welfare["sex"] = welfare["sex"].map({"male": 1, "female": 2}).fillna(SENTINELS["sex"])
+    return {column: welfare[column].to_numpy(dtype="float64") for column in COLUMNS}
+
+
+def job_codes(codebook_path=CODEBOOK_PATH, template=None):
+    job_list = read_job_list(codebook_path)
+    if job_list is not None:
+        return job_list["job_code"].dropna().to_numpy(dtype="float64")
+    # 코드북이 없으면 원본에 나온 직종 코드만 사용
+    codes = template["job_code"]
+    return np.unique(codes[~np.isnan(codes) & (codes != SENTINELS["job_code"])])
+
+
+def _inject(rng, values, code, rate, where=None):
+    hit = rng.random(len(values)) < rate
+    if where is not None:
+        hit &= where
+    values[hit] = code
+
+
+def chunk(rng, template, codes, rows, sentinel_rate=SENTINEL_RATE, job_mix=JOB_MIX):
+    # 원자료 코드 형태의 청크 1개 (컬럼 -> float 배열, NaN은 비해당)
+    picks = rng.integers(0, len(template["sex"]), size=rows)
+    values = {column: template[column][picks] for column in COLUMNS}
+
+    income = values["income"]
+    paid = ~np.isnan(income) & (income != SENTINELS["income"]) & (income != 0)
+    # 평균이 1인 로그 정규 잡음 (평균 월급 유지)
+    noise = rng.lognormal(-(INCOME_NOISE**2) / 2, INCOME_NOISE, size=rows)
+    income[paid] = np.clip(np.round(income[paid] * noise[paid], 2), 0.01, 9998)
+
+    job = values["job_code"]
+    working = ~np.isnan(job) & (job != SENTINELS["job_code"])
+    swap = working & (rng.random(rows) < job_mix)
+    job[swap] = codes[rng.integers(0, len(codes), size=int(swap.sum()))]
+
+    for column in ("sex", "birth_year", "marital_status", "religion"):
+        _inject(rng, values[column], SENTINELS[column], sentinel_rate)
+    # 직종/월급 무응답은 일하는 사람에게만
+    _inject(rng, job, SENTINELS["job_code"], sentinel_rate, working)
+    _inject(rng, income, SENTINELS["income"], sentinel_rate, paid)
+    _inject(rng, income, 0, sentinel_rate, paid)
+    return values
+
+
+def to_frame(values, raw=False, extra_columns=0, rng=None):
+    # 정수 코드는 "1936.0"이 아니라 "1936"으로, 비해당(NaN)은 빈 칸으로 쓰이도록 nullable 정수
+    frame = pd.DataFrame(
+        {
+            column: values[column]
+            if column == "income"
+            else pd.array(values[column], dtype="Float64").astype("Int64")
+            for column in COLUMNS
+        }
+    )
+    if not raw:
+        # 정리된 CSV와 같은 형태: 성별은 문자열, 무응답(9)은 결측
+        frame["sex"] = frame["sex"].map({1: "male", 2: "female"}).astype(object)
+        return frame
+    frame = frame.rename(columns={v: k for k, v in RENAME_COLUMNS.items()})
+    if extra_columns:
+        filler = rng.integers(0, 10, size=(len(frame), extra_columns), dtype="int8")
+        names = ["h10_x{:03d}".format(i + 1) for i in range(extra_columns)]
+        frame = pd.concat([frame, pd.DataFrame(filler, columns=names)], axis=1)
+    return frame
+
+
+def generate(
+    rows,
+    chunk_rows=CHUNK_ROWS,
+    seed=0,
+    raw=False,
+    extra_columns=0,
+    src=SOURCE_PATH,
+    codebook_path=CODEBOOK_PATH,
+    sentinel_rate=SENTINEL_RATE,
+    job_mix=JOB_MIX,
+):
+    # 데이터프레임 청크를 차례로 돌려준다
+    rng = np.random.default_rng(seed)
+    template = read_template(src)
+    codes = job_codes(codebook_path, template)
+    for start in range(0, rows, chunk_rows):
+        values = chunk(rng, template, codes, min(chunk_rows, rows - start), sentinel_rate, job_mix)
+        yield to_frame(values, raw, extra_columns, rng)
+
+
+def write(path, rows, file_format=None, **options):
+    # 쓰다가 중단되면 다음 실행에서 다시 만들도록 임시 파일에 쓴 뒤 이름 변경
+    file_format = file_format or ("parquet" if str(path).endswith(".parquet") else "csv")
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    if file_format == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for frame in generate(rows, **options):
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                if writer is None:
+                    schema = table.schema.remove_metadata()
+                    writer = pq.ParquetWriter(tmp_path, schema)
+                writer.write_table(table.cast(schema))
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            for i, frame in enumerate(generate(rows, **options)):
+                frame.to_csv(f, header=i == 0, index=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 복지패널 데이터 생성")
+    parser.add_argument("--rows", type=int, required=True)
+    parser.add_argument("--out", required=True, help=".csv 또는 .parquet")
+    parser.add_argument("--format", choices=["csv", "parquet"], help="기본: 확장자로 판단")
+    parser.add_argument("--raw", action="store_true", help="원자료 변수명(h10_...)과 숫자 코드로 저장")
+    parser.add_argument(
+        "--extra-columns",
+        type=int,
+        help="--raw일 때 덧붙일 컬럼 수 (기본 {})".format(RAW_EXTRA_COLUMNS),
+    )
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sentinel-rate", type=float, default=SENTINEL_RATE, help="변수별 무응답 코드 비율")
+    parser.add_argument("--job-mix", type=float, default=JOB_MIX, help="코드북 직종 코드로 바꿀 비율")
+    parser.add_argument("--src", default=SOURCE_PATH)
+    parser.add_argument("--codebook", default=CODEBOOK_PATH)
+    args = parser.parse_args()
+
+    extra_columns = args.extra_columns
+    if extra_columns is None:
+        extra_columns = RAW_EXTRA_COLUMNS if args.raw else 0
+    path = write(
+        args.out,
+        args.rows,
+        args.format,
+        chunk_rows=args.chunk_rows,
+        seed=args.seed,
+        raw=args.raw,
+        extra_columns=extra_columns,
+        src=args.src,
+        codebook_path=args.codebook,
+        sentinel_rate=args.sentinel_rate,
+        job_mix=args.job_mix,
+    )
+    print("saved", path, "({} rows)".format(args.rows))
+
+
+if __name__ == "__main__":
+    main()
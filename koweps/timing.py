@@ -0,0 +1,86 @@
+# 스크립트 실행(rerun) 단위 구간 타이머
+# begin()으로 이번 실행의 타이머를 만들고, stage()/start()/stop()으로 구간을 잰다.
+# 타이머가 없으면(배치 작업 등) 아무 일도 하지 않는다.
+import contextvars
+import datetime
+import json
+import os
+import time
+from contextlib import contextmanager, nullcontext
+
+_current = contextvars.ContextVar("koweps_rerun_timer", default=None)
+
+
+class RerunTimer:
+    def __init__(self):
+        self.started_at = datetime.datetime.now(datetime.timezone.utc)
+        self._origin = time.perf_counter()
+        self._open = {}
+        # (구간 이름, 시작 시점(초), 걸린 시간(초))
+        self.stages = []
+
+    def start(self, name):
+        self._open[name] = time.perf_counter()
+
+    def stop(self, name):
+        started = self._open.pop(name, None)
+        if started is not None:
+            self.stages.append((name, started - self._origin, time.perf_counter() - started))
+
+    @contextmanager
+    def stage(self, name):
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop(name)
+
+    def elapsed(self):
+        return time.perf_counter() - self._origin
+
+    def record(self, **fields):
+        return {
+            "started_at": self.started_at.isoformat(),
+            "total_ms": round(self.elapsed() * 1000, 3),
+            **fields,
+            "stages": [
+                {"name": name, "start_ms": round(start * 1000, 3), "ms": round(seconds * 1000, 3)}
+                for name, start, seconds in self.stages
+            ],
+        }
+
+
+def begin():
+    timer = RerunTimer()
+    _current.set(timer)
+    return timer
+
+
+def current():
+    return _current.get()
+
+
+def stage(name):
+    timer = _current.get()
+    return timer.stage(name) if timer is not None else nullcontext()
+
+
+def start(name):
+    timer = _current.get()
+    if timer is not None:
+        timer.start(name)
+
+
+def stop(name):
+    timer = _current.get()
+    if timer is not None:
+        timer.stop(name)
+
+
+def write_record(record, path):
+    # 실행 1회 = JSON 한 줄
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
@@ -0,0 +1,31 @@
+# 세션별 위젯 조작 기록 (record-and-replay)
+# 실행(rerun)마다 위젯 상태(종류, 라벨, 값)와 걸린 시간, 캐시 적중 수를 JSON 한 줄로 남긴다.
+# benchmarks/replay.py가 이 기록을 세션별로 읽어 AppTest로 같은 순서의 조작을 재생한다.
+import json
+
+from koweps.metrics import cache_counts
+
+
+def step(record, widgets):
+    # record: timing.RerunTimer.record() 결과, widgets: [(종류, 라벨, 값)]
+    return {
+        "session_id": record.get("session_id"),
+        "started_at": record["started_at"],
+        "total_ms": record["total_ms"],
+        "page": record.get("page"),
+        "widgets": [{"kind": kind, "label": label, "value": value} for kind, label, value in widgets],
+        "cache": cache_counts(record),
+    }
+
+
+def read_sessions(path):
+    # 세션 ID -> 시작 시각 순서의 기록 목록
+    sessions = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                sessions.setdefault(entry["session_id"], []).append(entry)
+    for steps in sessions.values():
+        steps.sort(key=lambda entry: entry["started_at"])
+    return sessions
@@ -0,0 +1,228 @@
+# 필터 조합별 정적 보고서 (화면 없이 모든 섹션의 그래프 PNG와 집계표 HTML)
+#   python reports.py --each region age_group sex --out reports
+#   python reports.py --combos combos.json --workers 8
+#   (combos.json: [{"sex": "female", "region": ["서울"]}, {"age_range": [30, 49]}, ...])
+# 데이터는 한 번만 읽고 조합별 집계도 여기서 한 뒤, 그리기(가장 오래 걸림)만 프로세스 풀에 나눈다.
+# 조합마다 report.json에 원본 지문/필터/형식 버전 키를 남겨 같은 키의 보고서는 다시 만들지 않는다.
+import argparse
+import concurrent.futures
+import hashlib
+import html
+import json
+import os
+import re
+import time
+
+from koweps import artifacts, core, distribution, sections
+from koweps.loader import CODEBOOK_PATH
+from views import PAGES
+
+# 보고서 구성이나 그리기 방식이 바뀌면 올린다
+REPORT_VERSION = 1
+REPORT_FILE = "report.json"
+# 섹션 번호 -> 제목 (대시보드 페이지 제목)
+SECTION_TITLES = {n: title for n, (_, title) in enumerate(PAGES, start=1)}
+SEGMENT = "sex"
+
+
+def each_value(frame, names):
+    # 변수마다 값 하나씩 고른 조합 (--each region sex -> 지역별 + 성별)
+    return [
+        {name: value}
+        for name in names
+        if name in frame.columns
+        for value in sorted(frame[name].dropna().unique().tolist())
+    ]
+
+
+def slug(filters):
+    # 보고서 폴더 이름: 읽을 수 있는 필터 값 + 겹치지 않게 짧은 해시
+    if not filters:
+        return "all"
+    text = "_".join(
+        "{}-{}".format(name, "+".join(map(str, value)) if isinstance(value, (list, tuple)) else value)
+        for name, value in core.normalize(filters)
+    )
+    digest = hashlib.sha256(repr(core.normalize(filters)).encode("utf-8")).hexdigest()[:8]
+    return "{}-{}".format(re.sub(r"[^\w.+-]+", "-", text).strip("-"), digest)
+
+
+def report_key(fingerprint, filters):
+    key = {"version": REPORT_VERSION, "source": fingerprint, "segment": SEGMENT}
+    key = json.dumps(dict(key, filters=core.normalize(filters)), ensure_ascii=False)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def up_to_date(path, key):
+    try:
+        with open(os.path.join(path, REPORT_FILE), encoding="utf-8") as f:
+            report = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return report.get("key") == key and all(
+        os.path.exists(os.path.join(path, name)) for name in report.get("files", [])
+    )
+
+
+def aggregate(frame, filters):
+    # 섹션 번호 -> {집계표 이름: 표} (필요한 변수가 없는 집계표는 뺀다)
+    filtered = core.filter_frame(frame, filters)
+    tables = {}
+    for name, (n, required) in sections.TABLES.items():
+        if set(required).issubset(frame.columns):
+            tables.setdefault(n, {})[name] = getattr(sections, name)(filtered)
+    if {"income", "age", SEGMENT}.issubset(frame.columns):
+        tables[len(SECTION_TITLES)] = core.section_9(frame, filters, SEGMENT)
+    return tables
+
+
+def _init_worker():
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from koweps import fonts
+
+    fonts.apply()
+
+
+def _figures(n, tables):
+    # 섹션 번호, 집계표 -> [(그래프 이름, Figure를 만드는 함수)]
+    from koweps import charts
+
+    if n == len(SECTION_TITLES):
+        label = distribution.SEGMENTS[SEGMENT]
+        return [
+            ("income_hist", lambda: charts.income_histogram_step(tables["income_hist"], SEGMENT, label)),
+            ("age_income", lambda: charts.age_income_heatmap(tables["age_income"])),
+        ]
+    return [
+        (figure, lambda figure=figure, name=name: charts.build(figure, tables[name]))
+        for figure, name in sections.FIGURES.items()
+        if name in tables
+    ]
+
+
+def render(path, key, filters, tables):
+    # 조합 하나의 보고서 (프로세스 풀 작업). 그리지 못한 그래프는 이유를 남긴다
+    from koweps import charts
+
+    os.makedirs(path, exist_ok=True)
+    files = []
+    errors = {}
+    for n, section_tables in sorted(tables.items()):
+        parts = ["<h2>{}</h2>".format(html.escape(SECTION_TITLES[n]))]
+        for figure, draw in _figures(n, section_tables):
+            try:
+                png = charts.to_png(draw())
+            except Exception as e:
+                # 필터로 남은 행이 없거나 한 그룹만 남으면 그릴 수 없는 그래프가 있다
+                errors[figure] = "{}: {}".format(type(e).__name__, e)
+                parts.append("<p>{}: 그래프 없음 ({})</p>".format(figure, html.escape(errors[figure])))
+                continue
+            with open(os.path.join(path, figure + ".png"), "wb") as f:
+                f.write(png)
+            files.append(figure + ".png")
+            parts.append('<img src="{}.png" width="640">'.format(figure))
+        for name, table in section_tables.items():
+            parts.append("<h3>{}</h3>{}".format(name, table.to_html()))
+        files.append("section_{}.html".format(n))
+        with open(os.path.join(path, files[-1]), "w", encoding="utf-8") as f:
+            f.write(_page(SECTION_TITLES[n], filters, "\n".join(parts)))
+    links = "\n".join(
+        '<li><a href="section_{}.html">{}</a></li>'.format(n, html.escape(SECTION_TITLES[n]))
+        for n in sorted(tables)
+    )
+    with open(os.path.join(path, "index.html"), "w", encoding="utf-8") as f:
+        f.write(_page("보고서", filters, "<ul>{}</ul>".format(links)))
+    files.append("index.html")
+    # 다 쓴 뒤 마지막에 남겨서, 중간에 멈춘 보고서는 다음 실행에서 다시 만든다
+    with open(os.path.join(path, REPORT_FILE), "w", encoding="utf-8") as f:
+        report = {"key": key, "filters": filters, "files": files, "errors": errors}
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def _page(title, filters, body):
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>{0}</title></head>'
+        "<body><h1>{0}</h1><p>필터: {1}</p>{2}</body></html>".format(
+            html.escape(title), html.escape(json.dumps(filters, ensure_ascii=False)), body
+        )
+    )
+
+
+def generate(frame, fingerprint, combos, out_dir, workers=None, force=False):
+    # 한 번 읽은 frame으로 조합별 보고서. {"rendered": [경로], "skipped": [경로]}
+    jobs = []
+    skipped = []
+    seen = set()
+    for filters in combos:
+        path = os.path.join(out_dir, slug(filters))
+        key = report_key(fingerprint, filters)
+        # 같은 조합이 두 번 있으면 한 번만 (두 작업이 같은 폴더에 쓰지 않게)
+        if path in seen:
+            continue
+        seen.add(path)
+        if not force and up_to_date(path, key):
+            skipped.append(path)
+        else:
+            jobs.append((path, key, filters, aggregate(frame, filters)))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        rendered = list(pool.map(render, *zip(*jobs))) if jobs else []
+    _write_index(out_dir)
+    return {"rendered": rendered, "skipped": skipped}
+
+
+def _write_index(out_dir):
+    # 만들어 둔 모든 조합의 목록
+    rows = []
+    for name in sorted(os.listdir(out_dir)):
+        try:
+            with open(os.path.join(out_dir, name, REPORT_FILE), encoding="utf-8") as f:
+                filters = json.load(f)["filters"]
+        except (OSError, ValueError):
+            continue
+        rows.append(
+            '<li><a href="{0}/index.html">{0}</a> {1}</li>'.format(
+                html.escape(name), html.escape(json.dumps(filters, ensure_ascii=False))
+            )
+        )
+    with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(_page("필터 조합별 보고서", {}, "<ul>{}</ul>".format("\n".join(rows))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="필터 조합별 정적 보고서")
+    parser.add_argument("--data", default="data/welfare_2015.csv", help="원자료 또는 결과 폴더")
+    parser.add_argument("--codebook", default=CODEBOOK_PATH)
+    parser.add_argument("--combos", help="필터 조합 목록 JSON 파일")
+    parser.add_argument("--each", nargs="*", default=[], help="변수마다 값 하나씩 (예: region age_group sex)")
+    parser.add_argument("--all", action="store_true", help="필터 없는 보고서도 만든다")
+    parser.add_argument("--out", default="reports")
+    parser.add_argument("--workers", type=int, help="기본: CPU 수")
+    parser.add_argument("--force", action="store_true", help="최신 보고서도 다시 만든다")
+    args = parser.parse_args()
+
+    if not (args.all or args.combos or args.each):
+        parser.error("--combos, --each, --all 중 하나 이상 필요합니다")
+
+    start = time.perf_counter()
+    frame = core.load(args.data, args.codebook)
+    combos = [{}] if args.all else []
+    if args.combos:
+        with open(args.combos, encoding="utf-8") as f:
+            combos += json.load(f)
+    combos += each_value(frame, args.each)
+    os.makedirs(args.out, exist_ok=True)
+    fingerprint = artifacts.source_fingerprint(args.data, args.codebook)
+    result = generate(frame, fingerprint, combos, args.out, args.workers, args.force)
+    print(
+        "{} rendered, {} up to date ({:.1f} s) -> {}".format(
+            len(result["rendered"]), len(result["skipped"]), time.perf_counter() - start,
+            os.path.join(args.out, "index.html"),
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# 캐시를 미리 데운 뒤 트래픽 받기 (streamlit run app.py 대신)
+#   python serve.py [streamlit 옵션, 예: --server.port 8501 --server.headless true]
+# 서버 시작과 함께 백그라운드 스레드가 기본 데이터 로드, 모든 집계표, 기본 그래프를 캐시에 채운다.
+# 로드 밸런서는 http://<KOWEPS_METRICS_HOST>:<KOWEPS_METRICS_PORT>/ready 가 200일 때만 트래픽을 보낸다 (데우는 중 503).
+#   KOWEPS_WARM_DATA: 데울 데이터 (기본 data/welfare_2015.csv, 앱의 기본 경로와 같게. 빈 값이면 데우지 않음)
+#   KOWEPS_WARM_ENGINE: 연산 엔진 (기본 pandas)
+#   KOWEPS_WARM_CHARTS: 데울 그래프 방식 (쉼표로 구분, 기본 image)
+import logging
+import os
+import sys
+import threading
+import time
+
+from streamlit import runtime
+from streamlit.web import cli
+
+from koweps import PandasBackend, metrics
+
+METRICS_HOST = os.environ.get("KOWEPS_METRICS_HOST", "127.0.0.1")
+# app.py도 같은 포트로 metrics.serve를 부르면 이미 떠 있는 서버를 그대로 쓴다
+METRICS_PORT = os.environ.setdefault("KOWEPS_METRICS_PORT", "9464")
+WARM_DATA = os.environ.get("KOWEPS_WARM_DATA", "data/welfare_2015.csv")
+WARM_ENGINE = os.environ.get("KOWEPS_WARM_ENGINE", PandasBackend.name)
+WARM_CHARTS = tuple(mode for mode in os.environ.get("KOWEPS_WARM_CHARTS", "image").split(",") if mode)
+WARM_THREAD = "koweps-warm-up"
+
+
+def warm_up():
+    # Streamlit 런타임이 만들어진 뒤에 채워야 세션들이 쓰는 캐시 저장소에 들어간다
+    # (dashboard도 그 뒤에 가져와야 캐시 선언이 런타임 없이 만들어졌다는 경고가 없다)
+    while not runtime.exists():
+        time.sleep(0.05)
+    # 세션 없이 캐시 함수를 부를 때마다 나오는 경고는 이 스레드에서만 끈다
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(
+        lambda record: threading.current_thread().name != WARM_THREAD
+    )
+    try:
+        import dashboard
+
+        record = dashboard.warm_up(WARM_DATA, WARM_ENGINE, WARM_CHARTS)
+    except Exception as e:
+        # 기본 데이터가 없어도 서비스는 한다 (사용자가 다른 경로를 넣을 수 있다)
+        print("koweps warm-up failed: {}".format(e), file=sys.stderr)
+    else:
+        metrics.REGISTRY.set(
+            "koweps_warm_up_seconds", record["total_ms"] / 1000, "Time spent warming caches at server start"
+        )
+        print("koweps warm-up done: {:.0f} ms".format(record["total_ms"]), file=sys.stderr)
+    finally:
+        metrics.set_ready(True)
+
+
+def main():
+    metrics.serve(int(METRICS_PORT), METRICS_HOST)
+    if WARM_DATA:
+        metrics.set_ready(False)
+        threading.Thread(target=warm_up, name=WARM_THREAD, daemon=True).start()
+    app_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+    sys.argv = ["streamlit", "run", app_path] + sys.argv[1:]
+    sys.exit(cli.main())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+# 연산 엔진별 집계표가 기준(pandas) 엔진과 같은지 확인 (koweps.compare)
+# python -m pytest tests
+import os
+
+import pytest
+
+from koweps import compare
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "welfare_2015.csv")
+CODEBOOK_PATH = os.path.join(os.path.dirname(DATA_PATH), "welfare_2015_codebook.xlsx")
+
+
+@pytest.mark.parametrize("engine", ["duckdb", "polars"])
+def test_backend_matches_pandas(engine):
+    pytest.importorskip(engine)
+    failures = compare.compare(DATA_PATH, CODEBOOK_PATH, engines=[engine])
+    # 불일치한 집계표 이름과 assert_frame_equal 메시지를 함께 보여 준다
+    assert not failures, "\n".join("{} {}: {}".format(*failure) for failure in failures)
+
@@ -0,0 +1,13 @@
+# 섹션 페이지 (app.py가 st.navigation에 등록하고, 벤치마크가 페이지 이동에 쓴다)
+# (앱 기준 경로, 제목). 첫 페이지가 기본
+PAGES = [
+    ("views/sex_income.py", "1. 성별 월급"),
+    ("views/age_income.py", "2. 나이와 월급"),
+    ("views/age_group_income.py", "3. 연령대 월급"),
+    ("views/age_group_sex_income.py", "4. 연령대 및 성별 월급"),
+    ("views/job_income.py", "5. 직업별 월급"),
+    ("views/job_sex.py", "6. 성별 직업 빈도"),
+    ("views/religion_divorce.py", "7. 종교와 이혼율"),
+    ("views/region_age_group.py", "8. 지역별 연령대"),
+    ("views/income_distribution.py", "9. 월급 분포"),
+]
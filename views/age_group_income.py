@@ -0,0 +1,10 @@
+# 3. 연령대에 따른 월급 차이
+import streamlit as st
+
+import dashboard
+
+st.subheader("3. 연령대에 따른 월급 차이 - 어떤 연령대의 월급이 가장 많을까?")
+
+dashboard.filter_preview("age_group")
+
+dashboard.figure_section("fig3")
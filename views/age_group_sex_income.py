@@ -0,0 +1,10 @@
+# 4. 연령대 및 성별 월급 차이
+import streamlit as st
+
+import dashboard
+
+st.subheader("4. 연령대 및 성별 월급 차이 - 성별 월급 차이는 연령대별로 다를까?")
+
+dashboard.filter_preview("sex", "age_group")
+
+dashboard.figure_section("fig4")
@@ -0,0 +1,10 @@
+# 2. 나이와 월급의 관계
+import streamlit as st
+
+import dashboard
+
+st.subheader("2. 나이와 월급의 관계 - '몇 살 때 월급을 가장 많이 받을까?'")
+
+dashboard.filter_preview("age_range")
+
+dashboard.figure_section("fig2")
@@ -0,0 +1,26 @@
+# 9. 월급 분포
+import streamlit as st
+
+import dashboard
+from koweps import core, distribution
+
+context = dashboard.current()
+welfare = context["welfare"]
+
+st.subheader("9. 월급 분포 - 필터로 고른 사람들의 월급은 어떻게 퍼져 있을까?")
+st.caption("사이드바 필터를 모두 적용한 구간별 빈도 (원자료 점 대신 구간 집계만 그린다)")
+
+segment_list = [name for name in distribution.SEGMENTS if name in welfare.columns]
+select_segment = st.selectbox("월급 분포 구분", segment_list, format_func=distribution.SEGMENTS.get)
+context["filters"]["segment"] = select_segment
+context["widgets"].append(("selectbox", "월급 분포 구분", select_segment))
+
+if dashboard.has_columns("income", "age") and select_segment:
+    filter_key = core.normalize(context["filter_state"])
+    col1, col2 = st.columns(2)
+    with col1:
+        dashboard.show_distribution(filter_key, select_segment)
+    with col2:
+        dashboard.show_distribution(filter_key, None)
+else:
+    st.info("월급/나이 변수가 없어 해당 그래프를 표시할 수 없습니다.")
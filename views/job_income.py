@@ -0,0 +1,10 @@
+# 5. 직업별 월급 차이
+import streamlit as st
+
+import dashboard
+
+st.subheader("5. 직업별 월급 차이 - 어떤 직업이 월급을 가장 많이 받을까?")
+
+dashboard.filter_preview("job")
+
+dashboard.figure_section("fig5")
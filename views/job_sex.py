@@ -0,0 +1,11 @@
+# 6. 성별 직업 빈도
+import streamlit as st
+
+import dashboard
+
+st.subheader("6. 성별 직업 빈도 - 성별로 어떤 직업이 가장 많을까?")
+
+dashboard.filter_preview("sex", "job")
+
+dashboard.figure_section("fig61")
+dashboard.figure_section("fig62")
@@ -0,0 +1,12 @@
+# 8. 지역별 연령대 비율
+import streamlit as st
+
+import dashboard
+
+st.subheader("8. 지역별 연령대 비율 - 어느 지역에 노년층이 많을까?")
+
+dashboard.filter_preview("region", "age_group")
+
+dashboard.figure_section(
+    "fig8", view=lambda pivot: pivot.sort_values("old", ascending=False)[["young", "middle", "old"]]
+)
@@ -0,0 +1,13 @@
+# 7. 종교 유무에 따른 이혼율
+import streamlit as st
+
+import dashboard
+
+st.subheader("7. 종교 유무에 따른 이혼율 - 종교가 있으면 이혼을 덜 할까?")
+
+dashboard.filter_preview("religion", "marriage")
+
+dashboard.figure_section("fig71")
+# 비율 계산
+dashboard.figure_section("fig72")
+dashboard.figure_section("fig73")
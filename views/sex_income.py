@@ -0,0 +1,10 @@
+# 1. 성별에 따른 월급 차이
+import streamlit as st
+
+import dashboard
+
+st.subheader("1. 성별에 따른 월급 차이 - '성별에 따라 월급이 다를까?'")
+
+dashboard.filter_preview("sex")
+
+dashboard.figure_section("fig1")